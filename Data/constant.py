@@ -2,3 +2,53 @@ HOME_PAGE_URL = {"PROD": "https://www.pelago.com/en/",
                  "QA": "https://qa.pelago.com/en/"}
 
 CART_PAGE_URL = {"PROD": "https://www.pelago.com/en/cart/", "QA": "https://qa.pelago.com/en/cart/"}
+
+TRACKER_DOMAINS = ["googletagmanager.com", "google-analytics.com", "doubleclick.net", "facebook.net", "hotjar.com",
+                   "clarity.ms", "analytics.tiktok.com"]
+
+# Named browser profiles, selected per test class with @pytest.mark.browser_profile("<name>")
+BROWSER_PROFILES = {
+    "full": {"block_images": False, "block_media": False, "block_fonts": False, "blocked_domains": []},
+    "dom-only": {"block_images": True, "block_media": True, "block_fonts": True, "blocked_domains": TRACKER_DOMAINS},
+    # Loads images, so their responses can be captured, but blocks media, fonts and trackers like dom-only
+    "dom-and-images": {"block_images": False, "block_media": True, "block_fonts": True,
+                       "blocked_domains": TRACKER_DOMAINS},
+}
+
+DEFAULT_BROWSER_PROFILE = "full"
+
+DEFAULT_BROWSER = "chrome"
+
+# browserName capabilities of sessions that accept Chrome DevTools Protocol commands (local or on a Selenium Grid)
+CHROMIUM_BROWSER_NAMES = ("chrome", "chrome-headless-shell", "MicrosoftEdge", "msedge")
+
+# Maximum pytest-xdist workers running a browser at the same time (safaridriver allows one session per machine)
+BROWSER_MAX_PARALLEL = {"safari": 1}
+
+# Connections kept alive per host by the api_services HTTP client, keyed by scheme://host
+HTTP_HOST_POOL_SIZES = {"https://www.pelago.com": 20, "https://qa.pelago.com": 20}
+
+# URL result cache: seconds a result stays fresh per status class (0 = never served from cache) and LRU size cap.
+# The cache is on by default, so a 2xx result is only trusted for a few hours before the URL is checked again
+URL_CACHE_TTL_SECONDS = {2: 3 * 60 * 60, 3: 60 * 60, 4: 60 * 60, 5: 0}
+URL_CACHE_MAX_ENTRIES = 50000
+# Runs whose hit/miss counters are kept in the cache database
+URL_CACHE_STATS_MAX_RUNS = 100
+
+# api_services resilience: per-host (requests per second, burst), retry schedule and circuit breaker
+HTTP_HOST_RATE_LIMITS = {"default": (20, 40)}
+HTTP_RETRY_MAX_ATTEMPTS = 3
+HTTP_RETRY_BASE_DELAY = 0.5
+HTTP_RETRY_MAX_DELAY = 8
+HTTP_CIRCUIT_FAILURE_THRESHOLD = 5
+HTTP_CIRCUIT_RESET_TIMEOUT = 60
+
+# State checkpoints: seconds a captured browser state can be restored and the same-origin page loaded to inject it
+STATE_CHECKPOINT_MAX_AGE_SECONDS = 30 * 60
+STATE_CHECKPOINT_BOOTSTRAP_PATH = "/robots.txt"
+
+# Seconds to wait for the /status endpoint of a Selenium Grid given with --grid-url
+GRID_STATUS_TIMEOUT = 10
+
+# Failed tests listed in the notification email; the rest are summarized as a count
+EMAIL_MAX_FAILED_TESTS = 100
@@ -1,23 +1,31 @@
-from Utility import api_services
+from Utility import api_services, url_cache
 from pytest_check import check
-from Helpers import custom_logger
-from typing import List, Optional
+from Helpers import custom_logger, driver_helpers
+from selenium.webdriver.remote.webdriver import WebDriver
+from typing import Iterable, List, Optional
 
 log = custom_logger.get_logger()
 
 
-def check_status_code_of_urls(urls: List[str], expected_status_code: int = 200, timeout: Optional[int] = None) -> None:
+def check_status_code_of_urls(urls: List[str], expected_status_code: int = 200, timeout: Optional[int] = None,
+                              max_workers: int = 16, per_host_limit: int = 8, deadline: Optional[float] = None,
+                              status_only: bool = True, section: Optional[str] = None) -> None:
     """
     Validates HTTP status codes for a list of URLs using soft assertions.
     
-    This function performs HTTP GET requests to each URL in the provided list and validates
+    This function requests the URLs concurrently (HEAD first, see api_services.fetch_url_status) and validates
     that each URL returns the expected status code. Uses pytest-check for soft assertions,
-    allowing all URLs to be tested even if some fail.
+    allowing all URLs to be tested even if some fail. Results are asserted in input order.
     
     Args:
         urls (List[str]): List of URLs to validate. Each URL should be a valid HTTP/HTTPS URL.
         expected_status_code (int, optional): Expected HTTP status code. Defaults to 200.
         timeout (Optional[int], optional): Request timeout in seconds. If None, uses default timeout.
+        max_workers (int, optional): Maximum requests in flight overall. Defaults to 16.
+        per_host_limit (int, optional): Maximum requests in flight per host. Defaults to 8.
+        deadline (Optional[float], optional): Overall time budget in seconds; URLs not checked in time fail. Defaults to None.
+        status_only (bool, optional): Skip downloading response bodies. Pass False to send full GET requests. Defaults to True.
+        section (Optional[str], optional): Page section the requests are reported under in the HTTP timing metrics.
     
     Returns:
         None
@@ -28,29 +36,143 @@ def check_status_code_of_urls(urls: List[str], expected_status_code: int = 200,
     
     log.info(f"Starting status code validation for {len(urls)} URLs (expected: {expected_status_code})")
     
-    failed_urls = []
+    results = api_services.validate_urls(
+        urls,
+        method_name="get",
+        timeout=timeout if timeout is not None else 30,
+        max_workers=max_workers,
+        per_host_limit=per_host_limit,
+        deadline=deadline,
+        status_only=status_only,
+        cache=url_cache.get_url_cache(),
+        section=section
+    )
     
-    for i, url in enumerate(urls, 1):            
-        try:
-            log.info(f"Checking URL {i}/{len(urls)}: {url}")
-            status_code = api_services.return_status_code_of_url(
-                api_url=url, 
-                method_name="get",
-                timeout=timeout if timeout is not None else 30
-            )
-            
-            if status_code == expected_status_code:
-                log.info(f"✓ URL validation passed: {url} returned {status_code}")
-            else:
-                log.error(f"✗ URL validation failed: {url} returned {status_code}, expected {expected_status_code}")
-                failed_urls.append({"url": url, "actual": status_code, "expected": expected_status_code})
-            
-            check.equal(
-                status_code, 
-                expected_status_code, 
-                msg=f"URL: {url} | Expected: {expected_status_code} | Actual: {status_code}"
-            )
-            
-        except Exception as e:
-            log.error(f"Exception occurred while checking {url}: {str(e)}")
-            check.fail(f"Failed to check URL {url}: {str(e)}")
\ No newline at end of file
+    fast_failed_urls = [result.url for result in results if result.fast_failed]
+    for i, result in enumerate(results, 1):
+        log.info(f"Checked URL {i}/{len(urls)}: {result.url}")
+        _check_url_result(result, expected_status_code)
+
+    if fast_failed_urls:
+        log.error(f"{len(fast_failed_urls)}/{len(urls)} URLs were fast-failed by an open circuit breaker and not checked")
+
+
+def _check_url_result(result: api_services.UrlCheckResult, expected_status_code: int) -> None:
+    """
+    Soft-asserts one URL check result.
+
+    Args:
+        result (api_services.UrlCheckResult): Result returned by the URL validation.
+        expected_status_code (int): Expected HTTP status code.
+
+    Returns:
+        None
+    """
+    url, status_code = result.url, result.status_code
+    if result.fast_failed:
+        log.error(f"⚡ URL not checked, circuit open: {url}")
+        check.fail(f"URL not checked (circuit breaker open): {url} | {result.error}")
+        return
+    if result.error is not None:
+        log.error(f"Exception occurred while checking {url}: {result.error}")
+        check.fail(f"Failed to check URL {url}: {result.error}")
+        return
+
+    if status_code == expected_status_code:
+        log.info(f"✓ URL validation passed: {url} returned {status_code}")
+    else:
+        log.error(f"✗ URL validation failed: {url} returned {status_code}, expected {expected_status_code}")
+
+    check.equal(
+        status_code,
+        expected_status_code,
+        msg=f"URL: {url} | Expected: {expected_status_code} | Actual: {status_code}"
+    )
+
+
+def check_status_code_of_url_stream(urls: Iterable[str], expected_status_code: int = 200, timeout: Optional[int] = None,
+                                    max_workers: int = 16, per_host_limit: int = 8, deadline: Optional[float] = None,
+                                    status_only: bool = True, section: Optional[str] = None) -> int:
+    """
+    Validates HTTP status codes of URLs while they are still being harvested, using soft assertions.
+
+    Pass a generator such as Homepage.stream_famous_destination_tile_links: each URL is requested in a background
+    worker as soon as it is yielded, so the browser keeps harvesting while earlier URLs are checked.
+
+    Args:
+        urls (Iterable[str]): URLs to validate, consumed on the calling thread.
+        expected_status_code (int, optional): Expected HTTP status code. Defaults to 200.
+        timeout (Optional[int], optional): Request timeout in seconds. If None, uses default timeout.
+        max_workers (int, optional): Maximum requests in flight overall. Defaults to 16.
+        per_host_limit (int, optional): Maximum requests in flight per host. Defaults to 8.
+        deadline (Optional[float], optional): Overall time budget in seconds; URLs not checked in time fail. Defaults to None.
+        status_only (bool, optional): Skip downloading response bodies. Defaults to True.
+        section (Optional[str], optional): Page section the requests are reported under in the HTTP timing metrics.
+
+    Returns:
+        int: Number of URLs checked.
+    """
+    checked = 0
+    fast_failed = 0
+    for result in api_services.validate_url_stream(
+            urls,
+            method_name="get",
+            timeout=timeout if timeout is not None else 30,
+            max_workers=max_workers,
+            per_host_limit=per_host_limit,
+            deadline=deadline,
+            status_only=status_only,
+            cache=url_cache.get_url_cache(),
+            section=section):
+        checked += 1
+        fast_failed += result.fast_failed
+        log.info(f"Checked streamed URL {checked}: {result.url}")
+        _check_url_result(result, expected_status_code)
+
+    if checked == 0:
+        log.info("URL stream was empty, nothing checked over HTTP")
+    if fast_failed:
+        log.error(f"{fast_failed}/{checked} URLs were fast-failed by an open circuit breaker and not checked")
+    return checked
+
+
+def check_status_code_of_loaded_resources(driver: WebDriver, urls: Iterable[str], expected_status_code: int = 200,
+                                          timeout: Optional[int] = None, section: Optional[str] = None) -> None:
+    """
+    Validates HTTP status codes of resources from the responses the browser already received, using soft assertions.
+
+    `urls` may be a generator: it is consumed first, so the browser has loaded the resources of every harvested
+    URL, then the captured responses are read in a single round trip. URLs the browser never loaded (e.g.,
+    blocked by the browser profile or not rendered) are checked over HTTP with check_status_code_of_url_stream.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance with network capture running.
+        urls (Iterable[str]): Resource URLs to validate.
+        expected_status_code (int, optional): Expected HTTP status code. Defaults to 200.
+        timeout (Optional[int], optional): Request timeout in seconds for URLs checked over HTTP.
+        section (Optional[str], optional): Page section the HTTP fallback requests are reported under in the timing metrics.
+
+    Returns:
+        None
+    """
+    urls = list(urls)
+    if not urls:
+        log.warning("Empty URL list provided to check_status_code_of_loaded_resources")
+        return
+    responses = driver_helpers.get_captured_responses(driver, urls)
+    not_loaded_urls = []
+    for url in urls:
+        response = responses[url]
+        if response is None:
+            not_loaded_urls.append(url)
+            continue
+        log.info(f"Captured {url} → {response.status} ({response.size} bytes, {round(response.duration, 2)}s)")
+        check.equal(
+            response.status,
+            expected_status_code,
+            msg=f"URL: {url} | Expected: {expected_status_code} | Actual: {response.status}"
+        )
+
+    log.info(f"{len(urls) - len(not_loaded_urls)}/{len(urls)} URLs validated from captured responses")
+    if not_loaded_urls:
+        check_status_code_of_url_stream(not_loaded_urls, expected_status_code, timeout, section=section)
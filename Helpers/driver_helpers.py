@@ -1,36 +1,50 @@
-from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common import TimeoutException, ElementClickInterceptedException, WebDriverException, ElementNotInteractableException
 from selenium.webdriver.common.action_chains import ActionChains
 from typing import Union
 from selenium import webdriver
 from Helpers import custom_logger
+from Helpers.locator_registry import Locator, registry
+from Helpers import overlay_suppression
+from Helpers.step_timing import timed_step
+from Helpers.network_capture import get_network_capture
+from Helpers.wait_engine import JS_FIND_ALL, script_timeout, wait_for_condition
 
 import locators
+from Data import constant
 
 log = custom_logger.get_logger()
 
 
-def get_locator_type(locator: str) -> str:
+def get_locator_type(locator: Union[str, Locator]) -> str:
     """
     Determines the Selenium locator type based on the locator string.
 
     Args:
-        locator (str): The locator string to analyze.
+        locator (Union[str, Locator]): The locator string or pre-resolved Locator to analyze.
 
     Returns:
         str: The Selenium By strategy (e.g., By.CSS_SELECTOR, By.XPATH, By.ID).
     """
-    for name, val in vars(locators).items():
-        if val is locator:
-            locator_mapping = {"css": By.CSS_SELECTOR, "xpath": By.XPATH, "id": By.ID}
-            locator_type = locator_mapping[name.split("_")[-1]]
-            return locator_type
+    return registry.resolve(locator).by
 
 
+def get_locator_tuple(locator: Union[str, Locator]) -> tuple:
+    """
+    Resolves a locator to the (By, value) tuple expected by Selenium.
+
+    Args:
+        locator (Union[str, Locator]): The locator string or pre-resolved Locator.
+
+    Returns:
+        tuple: (by, value) pair.
+    """
+    return registry.resolve(locator).as_tuple()
+
+
+@timed_step("read.attribute")
 def get_element_attribute_value(driver: WebDriver, locator: str = None, element: WebElement = None, attribute_name: str = None, timeout: int = 10) -> str:
     """
     Retrieves the value of the specified attribute from a web element, waiting until it is not None or empty.
@@ -62,6 +76,136 @@ def get_element_attribute_value(driver: WebDriver, locator: str = None, element:
     return attribute_value
 
 
+# Reads a property (falling back to the attribute) or the rendered text for every match, like WebElement.get_attribute
+_JS_READ_VALUES = JS_FIND_ALL + """
+function readValue(node, name, mode) {
+    if (name === 'text') { return (node.innerText || node.textContent || '').trim(); }
+    if (mode === 'attribute') { return node.getAttribute(name); }
+    var value = node[name];
+    if (mode !== 'property' && (value === undefined || value === null || typeof value === 'object')) { value = node.getAttribute(name); }
+    return value === null || value === undefined ? null : String(value);
+}
+function readAll(by, value, name, mode) {
+    return findAll(by, value).map(function (node) { return readValue(node, name, mode); });
+}
+"""
+
+_JS_BULK_READ = _JS_READ_VALUES + "return readAll(arguments[0], arguments[1], arguments[2], arguments[3]);"
+
+_JS_BULK_READ_WAIT_NON_EMPTY = _JS_READ_VALUES + """
+var by = arguments[0], value = arguments[1], name = arguments[2], mode = arguments[3];
+var deadline = Date.now() + arguments[4], matchDeadline = Date.now() + arguments[5];
+var done = arguments[arguments.length - 1];
+(function poll() {
+    var values = readAll(by, value, name, mode);
+    var ready = values.length > 0 && values.every(function (v) { return v !== null && v !== ''; });
+    // Give up early when nothing matches, like the short presence wait of get_all_elements
+    if (ready || Date.now() >= deadline || (!values.length && Date.now() >= matchDeadline)) {
+        done({ready: ready, values: values}); return;
+    }
+    setTimeout(poll, 50);
+})();
+"""
+
+
+@timed_step("read.attributes")
+def get_all_elements_attribute_values(driver: WebDriver, locator: Union[str, Locator], attribute_name: str, mode: str = "auto",
+                                      wait_till_non_empty: bool = False, timeout: int = 10, match_timeout: int = 3) -> list:
+    """
+    Retrieves an attribute, property or text value from every element matching the locator in one in-browser script call.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+        locator (Union[str, Locator]): The locator string to find the elements.
+        attribute_name (str): Name to read (e.g., 'href', 'src', 'data-id'). Use 'text' for the rendered text.
+        mode (str, optional): 'auto' reads the property and falls back to the attribute (same as WebElement.get_attribute),
+            'property' or 'attribute' force one of them. Defaults to 'auto'.
+        wait_till_non_empty (bool, optional): Wait in the browser until at least one element matches and every value
+            is non-empty. Defaults to False.
+        timeout (int, optional): Maximum time to wait for non-empty values in seconds. Defaults to 10.
+        match_timeout (int, optional): Maximum time to wait for a first match in seconds. Defaults to 3.
+
+    Returns:
+        list: Values in document order (None for missing values), or an empty list if nothing matched.
+    """
+    by, value = get_locator_tuple(locator)
+    try:
+        if not wait_till_non_empty:
+            wait_till_element_is_present(driver, locator, timeout=match_timeout)
+            values = driver.execute_script(_JS_BULK_READ, by, value, attribute_name, mode)
+        else:
+            with script_timeout(driver, timeout + 5):
+                result = driver.execute_async_script(_JS_BULK_READ_WAIT_NON_EMPTY, by, value, attribute_name, mode,
+                                                     timeout * 1000, match_timeout * 1000)
+            values = result["values"]
+            if not result["ready"]:
+                log.error(f"Timeout: '{attribute_name}' values for '{locator}' did not become non-empty within {timeout} seconds.")
+    except WebDriverException as e:
+        log.error(f"WebDriverException occurred while reading '{attribute_name}' for '{locator}': {e}")
+        return []
+    log.info(f"{len(values)} '{attribute_name}' values read for {locator}")
+    return values
+
+
+_JS_BULK_READ_FIELDS = _JS_READ_VALUES + """
+var groups = arguments[0], fields = arguments[1], deadline = Date.now() + arguments[2];
+var done = arguments[arguments.length - 1];
+function readGroups() {
+    var result = {}, ready = true;
+    Object.keys(groups).forEach(function (name) {
+        var group = groups[name];
+        result[name] = findAll(group.by, group.value).map(function (node) {
+            var record = {};
+            fields.forEach(function (field) { record[field] = readValue(node, field, 'auto'); });
+            return record;
+        });
+        ready = ready && result[name].length > 0 && result[name].every(function (record) {
+            return !group.required || (record[group.required] !== null && record[group.required] !== '');
+        });
+    });
+    return {ready: ready, groups: result};
+}
+(function poll() {
+    var state = readGroups();
+    if (state.ready || Date.now() >= deadline) { done(state); return; }
+    setTimeout(poll, 50);
+})();
+"""
+
+
+@timed_step("read.fields", locator_argument=None)
+def get_elements_fields(driver: WebDriver, groups: dict, fields: list, timeout: int = 10) -> dict:
+    """
+    Reads several fields from the elements of several locators in one in-browser script call.
+
+    The call waits until every locator matches at least one element whose required field is non-empty.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+        groups (dict): Group name -> (locator, required field or None), e.g. {'links': (link_xpath, 'href')}.
+        fields (list): Names read from every element (e.g., ['href', 'src', 'alt', 'title']), as in
+            get_all_elements_attribute_values with mode 'auto'.
+        timeout (int, optional): Maximum time to wait in seconds. Defaults to 10.
+
+    Returns:
+        dict: Group name -> list of {field: value} records in document order; empty lists if the read failed.
+    """
+    script_groups = {}
+    for name, (locator, required_field) in groups.items():
+        by, value = get_locator_tuple(locator)
+        script_groups[name] = {"by": by, "value": value, "required": required_field}
+    try:
+        with script_timeout(driver, timeout + 5):
+            result = driver.execute_async_script(_JS_BULK_READ_FIELDS, script_groups, list(fields), timeout * 1000)
+    except WebDriverException as e:
+        log.error(f"WebDriverException occurred while reading {list(fields)} for {list(groups)}: {e}")
+        return {name: [] for name in groups}
+    if not result["ready"]:
+        log.error(f"Timeout: {list(groups)} did not all have non-empty values within {timeout} seconds.")
+    return result["groups"]
+
+
+@timed_step("wait.present")
 def wait_till_element_is_present(driver: WebDriver, locator: str, timeout: int = 30) -> Union[WebElement, bool]:
     """
     Waits until the element is present in the DOM (not necessarily visible) within the specified timeout.
@@ -79,7 +223,7 @@ def wait_till_element_is_present(driver: WebDriver, locator: str, timeout: int =
         None: Handles TimeoutException internally and returns False instead.
     """
     try:
-        element = WebDriverWait(driver, timeout).until(EC.presence_of_element_located((get_locator_type(locator), locator)))
+        element = wait_for_condition(driver, "present", locator=locator, timeout=timeout)
         log.info(f"{locator} is present")
         return element
     except TimeoutException as e:
@@ -87,6 +231,7 @@ def wait_till_element_is_present(driver: WebDriver, locator: str, timeout: int =
         return False
 
 
+@timed_step("wait.visible")
 def wait_till_element_is_visible(driver: WebDriver, locator: str, timeout: int = 30) -> Union[WebElement, bool]:
     """
     Waits until the element is visible (present in the DOM and displayed) within the specified timeout.
@@ -104,7 +249,7 @@ def wait_till_element_is_visible(driver: WebDriver, locator: str, timeout: int =
         None: Handles TimeoutException internally and returns False instead.
     """
     try:
-        element = WebDriverWait(driver, timeout).until(EC.visibility_of_element_located((get_locator_type(locator), locator)))
+        element = wait_for_condition(driver, "visible", locator=locator, timeout=timeout)
         log.info(f"{locator} is visible")
         return element
     except TimeoutException as e:
@@ -112,6 +257,7 @@ def wait_till_element_is_visible(driver: WebDriver, locator: str, timeout: int =
         return False
 
 
+@timed_step("find.all")
 def get_all_elements(driver: WebDriver, locator: str) -> list[WebElement]:
     """
     Finds all elements matching the given locator.
@@ -124,10 +270,11 @@ def get_all_elements(driver: WebDriver, locator: str) -> list[WebElement]:
         list[WebElement]: A list of WebElements matching the locator, or an empty list if none are found.
     """
     wait_till_element_is_present(driver, locator, timeout=3)
-    all_elements = driver.find_elements(get_locator_type(locator), locator)
+    all_elements = driver.find_elements(*get_locator_tuple(locator))
     return all_elements
 
 
+@timed_step("wait.clickable")
 def wait_till_element_is_clickable(driver: WebDriver, locator: str = None, element: WebElement = None, timeout: int = 30) -> WebElement:
     """
     Waits until the element is clickable within the specified timeout.
@@ -145,14 +292,15 @@ def wait_till_element_is_clickable(driver: WebDriver, locator: str = None, eleme
         TimeoutException: If the element is not clickable within the timeout.
     """
     if locator:
-        element = WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((get_locator_type(locator), locator)))
+        element = wait_for_condition(driver, "clickable", locator=locator, timeout=timeout)
         log.info(f"{locator} is clickable")
     elif element:
-        WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(element))
+        wait_for_condition(driver, "clickable", element=element, timeout=timeout)
         log.info("element clickable")
     return element
 
 
+@timed_step("click")
 def click_element(driver: WebDriver, locator: str = None, element: WebElement = None, timeout: int = 30) -> None:
     """
     Clicks on the specified element, handling potential popup interceptions.
@@ -167,13 +315,15 @@ def click_element(driver: WebDriver, locator: str = None, element: WebElement =
         None
 
     Note:
-        If the initial click fails due to an intercepted exception, it will attempt to close any popup and retry the click.
+        Known overlays are normally hidden up front by overlay_suppression. If the click is still intercepted,
+        it will attempt to close any popup and retry the click.
     """
     try:
         element.click() if element else wait_till_element_is_clickable(driver, locator=locator, timeout=timeout).click()
         log.info("Element clicked successfully")
     except (ElementClickInterceptedException, ElementNotInteractableException, TimeoutException):
         log.warning("ElementClickInterceptedException occurred, checking for popup...")
+        overlay_suppression.record_unprevented_interception()
         popup = wait_till_element_is_clickable(driver, locator=locators.campaign_pop_up_xpath, timeout=5)
         if popup:
             popup.click()
@@ -190,64 +340,199 @@ def click_element(driver: WebDriver, locator: str = None, element: WebElement =
         log.error(f"WebDriverException occurred during click: {e}")
 
 
-def initialize_chrome_driver(headless=False) -> WebDriver:
+# URL patterns blocked through CDP for each resource class of a browser profile
+_BLOCKED_URL_PATTERNS = {
+    "block_images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "block_media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg"],
+    "block_fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+}
+
+
+def get_browser_profile(profile: str) -> dict:
     """
-    Initializes and configures a Chrome WebDriver instance with optimized settings for UI automation.
-    
+    Looks up a named browser profile.
+
+    Args:
+        profile (str): Profile name from constant.BROWSER_PROFILES (e.g., 'full', 'dom-only').
+
+    Returns:
+        dict: The profile settings.
+
+    Raises:
+        ValueError: If the profile is unknown.
+    """
+    if profile not in constant.BROWSER_PROFILES:
+        raise ValueError(f"Invalid browser profile: {profile}. Valid profiles: {list(constant.BROWSER_PROFILES)}")
+    return constant.BROWSER_PROFILES[profile]
+
+
+def build_chrome_options(headless=False, profile: str = constant.DEFAULT_BROWSER_PROFILE) -> webdriver.ChromeOptions:
+    """
+    Builds the Chrome options used for local and remote (Selenium Grid) Chrome sessions.
+
     Args:
         headless (bool, optional): Whether to run Chrome in headless mode. Defaults to False.
-    
+        profile (str, optional): Browser profile deciding which resources are blocked. Defaults to 'full'.
+
     Returns:
-        WebDriver: Configured Chrome WebDriver instance ready for automation.
+        webdriver.ChromeOptions: The options.
     """
     options = webdriver.ChromeOptions()
     options.add_argument("--start-maximized")
     options.add_argument("--disable-notifications")
     options.add_argument("--ignore-certificate-errors")
     options.page_load_strategy = 'eager'  # 'normal', 'eager', or 'none'
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})  # CDP Network events for network_capture
     if headless:
         options.add_argument("--headless")
-    driver = webdriver.Chrome(options=options)
+    if get_browser_profile(profile)["block_images"]:
+        # Applies to every tab, unlike the CDP block list which is bound to the first tab
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return options
+
+
+def _block_chrome_urls(driver: WebDriver, profile: str) -> None:
+    """
+    Blocks the URL patterns of a browser profile through CDP on a started Chrome session.
+
+    Args:
+        driver (WebDriver): Local or remote Chrome WebDriver instance.
+        profile (str): Browser profile name.
+
+    Returns:
+        None
+    """
+    profile_settings = get_browser_profile(profile)
+    blocked_urls = [pattern for key, patterns in _BLOCKED_URL_PATTERNS.items() if profile_settings[key] for pattern in patterns]
+    blocked_urls += [f"*{domain}*" for domain in profile_settings["blocked_domains"]]
+    if blocked_urls:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls})
+        log.info(f"Chrome profile '{profile}': {len(blocked_urls)} URL patterns blocked")
+
+
+def build_safari_options(headless=False, profile: str = constant.DEFAULT_BROWSER_PROFILE) -> webdriver.SafariOptions:
+    """
+    Builds the Safari options used for local and remote (Selenium Grid) Safari sessions.
+
+    Args:
+        headless (bool, optional): Whether to run Safari in headless mode. Defaults to False.
+        profile (str, optional): Browser profile. Safari cannot block resources, so only 'full' behaviour is available.
+
+    Returns:
+        webdriver.SafariOptions: The options.
+    """
+    if profile != constant.DEFAULT_BROWSER_PROFILE:
+        log.warning(f"Safari does not support resource blocking, ignoring browser profile '{profile}'")
+    options = webdriver.SafariOptions()
+    if headless:
+        options.add_argument("--headless")
+    return options
+
+
+def build_firefox_options(headless=False, profile: str = constant.DEFAULT_BROWSER_PROFILE) -> webdriver.FirefoxOptions:
+    """
+    Builds the Firefox options used for local and remote (Selenium Grid) Firefox sessions.
+
+    Args:
+        headless (bool, optional): Whether to run Firefox in headless mode. Defaults to False.
+        profile (str, optional): Browser profile deciding which resources are blocked. Firefox preferences cannot
+            block individual domains, so blocked_domains is not applied. Defaults to 'full'.
+
+    Returns:
+        webdriver.FirefoxOptions: The options.
+    """
+    options = webdriver.FirefoxOptions()
+    if headless:
+        options.add_argument('--headless')
+    options.set_preference('dom.webnotifications.enabled', False)  # Disable notifications
+    options.enable_bidi = True  # BiDi network events for network_capture
+    profile_settings = get_browser_profile(profile)
+    if profile_settings["block_images"]:
+        options.set_preference('permissions.default.image', 2)
+    if profile_settings["block_media"]:
+        options.set_preference('media.autoplay.default', 5)  # Block audio and video autoplay
+    if profile_settings["block_fonts"]:
+        options.set_preference('gfx.downloadable_fonts.enabled', False)
+    return options
+
+
+BROWSER_OPTIONS = {"chrome": build_chrome_options, "firefox": build_firefox_options, "safari": build_safari_options}
+
+
+def initialize_chrome_driver(headless=False, profile: str = constant.DEFAULT_BROWSER_PROFILE) -> WebDriver:
+    """
+    Initializes and configures a Chrome WebDriver instance with optimized settings for UI automation.
+    
+    Args:
+        headless (bool, optional): Whether to run Chrome in headless mode. Defaults to False.
+        profile (str, optional): Browser profile deciding which resources are blocked. Defaults to 'full'.
+    
+    Returns:
+        WebDriver: Configured Chrome WebDriver instance ready for automation.
+    """
+    driver = webdriver.Chrome(options=build_chrome_options(headless, profile))
+    _block_chrome_urls(driver, profile)
     return driver
 
 
-def initialize_safari_driver(headless=False) -> WebDriver:
+def initialize_safari_driver(headless=False, profile: str = constant.DEFAULT_BROWSER_PROFILE) -> WebDriver:
     """
     Initializes and configures a Safari WebDriver instance for UI automation testing.
     
     Args:
         headless (bool, optional): Whether to run Safari in headless mode. Defaults to False.
+        profile (str, optional): Browser profile. Safari cannot block resources, so only 'full' behaviour is available.
     
     Returns:
         WebDriver: Configured Safari WebDriver instance ready for automation.
     """
-    options = webdriver.SafariOptions()
-    driver = webdriver.Safari(options=options)
+    driver = webdriver.Safari(options=build_safari_options(headless, profile))
     driver.maximize_window()
-    if headless:
-        options.add_argument("--headless")
     return driver
 
 
-def initialize_firefox_driver(headless=False) -> WebDriver:
+def initialize_firefox_driver(headless=False, profile: str = constant.DEFAULT_BROWSER_PROFILE) -> WebDriver:
     """
     Initializes and configures a Firefox WebDriver instance with optimized settings for UI automation.
     
     Args:
         headless (bool, optional): Whether to run Firefox in headless mode. Defaults to False.
+        profile (str, optional): Browser profile deciding which resources are blocked. Firefox preferences cannot
+            block individual domains, so blocked_domains is not applied. Defaults to 'full'.
     
     Returns:
         WebDriver: Configured Firefox WebDriver instance ready for automation.
     """
-    options = webdriver.FirefoxOptions()
-    if headless:
-        options.add_argument('--headless')
-    options.set_preference('dom.webnotifications.enabled', False)  # Disable notifications
-    driver = webdriver.Firefox(options=options)
+    driver = webdriver.Firefox(options=build_firefox_options(headless, profile))
     driver.maximize_window()  # Maximize the browser window
     return driver
 
 
+def initialize_remote_driver(browser: str, grid_url: str, headless=False,
+                             profile: str = constant.DEFAULT_BROWSER_PROFILE) -> WebDriver:
+    """
+    Starts a session on a Selenium Grid (or standalone Selenium server) with the same options as the local drivers.
+
+    Args:
+        browser (str): Browser name: chrome, firefox or safari.
+        grid_url (str): Grid URL, e.g. http://localhost:4444.
+        headless (bool, optional): Whether to run the browser in headless mode. Defaults to False.
+        profile (str, optional): Browser profile deciding which resources are blocked. Defaults to 'full'.
+
+    Returns:
+        WebDriver: Remote WebDriver instance ready for automation.
+    """
+    driver = webdriver.Remote(command_executor=grid_url, options=BROWSER_OPTIONS[browser](headless, profile))
+    if browser == "chrome":
+        _block_chrome_urls(driver, profile)
+    else:
+        driver.maximize_window()
+    log.info(f"Remote {browser} session {driver.session_id} started on {grid_url}")
+    return driver
+
+
+@timed_step("read.text")
 def get_text_from_element(driver: WebDriver, locator: str) -> str:
     """
     Retrieves the visible text content from a web element after ensuring it's visible.
@@ -260,4 +545,63 @@ def get_text_from_element(driver: WebDriver, locator: str) -> str:
         str: The visible text content of the element.
     """
     element = wait_till_element_is_visible(driver, locator)
-    return element.text
\ No newline at end of file
+    return element.text
+
+
+def get_transferred_bytes(driver: WebDriver) -> tuple:
+    """
+    Sums the bytes transferred by the current document and its resources using the Resource Timing API.
+
+    Cross-origin resources without a Timing-Allow-Origin header report 0 bytes, so the value is a lower bound.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+
+    Returns:
+        tuple: (document time origin identifying the page load, transferred bytes), or (None, 0) if unavailable.
+    """
+    try:
+        return tuple(driver.execute_script("""
+            var entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+            var total = entries.reduce(function (sum, entry) { return sum + (entry.transferSize || 0); }, 0);
+            return [performance.timeOrigin, total];
+        """))
+    except WebDriverException:
+        return None, 0
+
+
+def get_page_load_id(driver: WebDriver) -> tuple:
+    """
+    Identifies the document currently loaded in the driver.
+
+    The time origin changes on every navigation or reload, so the id changes even when the URL stays the same.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+
+    Returns:
+        tuple: (current URL, document time origin), or (None, None) if the page cannot be read.
+    """
+    try:
+        return tuple(driver.execute_script("return [window.location.href, performance.timeOrigin];"))
+    except WebDriverException:
+        return None, None
+
+
+def get_captured_responses(driver: WebDriver, urls: list) -> dict:
+    """
+    Returns the responses the browser itself received for the URLs during the current page session.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+        urls (list): Requested or final URLs of the resources.
+
+    Returns:
+        dict: URL -> CapturedResponse (URL, status, size and timing), or None for URLs the browser did not load.
+            Every value is None if network capture is not running on this driver.
+    """
+    capture = get_network_capture(driver)
+    if capture is None:
+        return {url: None for url in urls}
+    capture.refresh()
+    return {url: capture.get(url) for url in urls}
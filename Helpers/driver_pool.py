@@ -0,0 +1,248 @@
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.common.bidi.storage import CookieFilter
+from selenium.common import WebDriverException
+from Helpers import custom_logger, overlay_suppression, network_capture
+from Data import constant
+
+log = custom_logger.get_logger()
+
+_JS_CLEAR_STORAGE = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+return window.location.origin;
+"""
+
+
+class DriverPool:
+    """
+    Pool of pre-launched WebDriver instances reused across test classes within one process (one pytest-xdist worker).
+
+    Drivers are reset between checkouts and quit after `max_uses` checkouts or as soon as a reset fails.
+    """
+
+    def __init__(self, factory: Callable[[], WebDriver], size: int = 1, max_uses: int = 20):
+        """
+        Initializes the pool without launching any browser.
+
+        Args:
+            factory (Callable[[], WebDriver]): Callable that launches a new configured driver.
+            size (int, optional): Number of drivers launched by prewarm. Defaults to 1.
+            max_uses (int, optional): Checkouts after which a driver is quit and replaced. Defaults to 20.
+        """
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self._idle: List[WebDriver] = []
+        self._uses: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.stats = {"launched": 0, "reused": 0, "recycled": 0, "launch_time": 0.0, "reset_time": 0.0}
+
+    def _launch(self) -> WebDriver:
+        """
+        Launches a new driver and prepares it for use.
+
+        Returns:
+            WebDriver: The launched driver.
+        """
+        start_time = time.perf_counter()
+        driver = self.factory()
+        overlay_suppression.install_overlay_suppression(driver)
+        network_capture.start_network_capture(driver)
+        elapsed_time = time.perf_counter() - start_time
+        with self._lock:
+            self._uses[id(driver)] = 0
+            self.stats["launched"] += 1
+            self.stats["launch_time"] += elapsed_time
+        log.info(f"Driver launched for pool in {round(elapsed_time, 2)}s")
+        return driver
+
+    def prewarm(self) -> None:
+        """
+        Launches drivers until `size` idle drivers are available.
+
+        Returns:
+            None
+        """
+        while len(self._idle) < self.size:
+            driver = self._launch()
+            with self._lock:
+                self._idle.append(driver)
+
+    def checkout(self) -> WebDriver:
+        """
+        Takes an idle driver from the pool, launching a new one if none is idle.
+
+        Returns:
+            WebDriver: A driver in a clean state.
+        """
+        with self._lock:
+            driver = self._idle.pop() if self._idle else None
+        if driver is None:
+            driver = self._launch()
+        else:
+            with self._lock:
+                self.stats["reused"] += 1
+        with self._lock:
+            self._uses[id(driver)] += 1
+        return driver
+
+    def release(self, driver: WebDriver, healthy: bool = True) -> None:
+        """
+        Returns a driver to the pool after resetting it, or quits it if it is worn out or broken.
+
+        Args:
+            driver (WebDriver): The driver previously returned by checkout.
+            healthy (bool, optional): Pass False to force the driver to be recycled. Defaults to True.
+
+        Returns:
+            None
+        """
+        overlay_suppression.collect_suppressed_overlays(driver)
+        if healthy and self._uses.get(id(driver), 0) < self.max_uses and self.reset(driver):
+            with self._lock:
+                self._idle.append(driver)
+            return
+        self._quit(driver)
+        with self._lock:
+            self.stats["recycled"] += 1
+
+    def reset(self, driver: WebDriver) -> bool:
+        """
+        Brings a driver back to a clean state: extra tabs closed, cookies and storage cleared, about:blank loaded
+        and captured network responses, page snapshots and DOM snapshots dropped.
+
+        Storage is cleared for every origin the driver loaded a document from, as seen by its network capture, and
+        cookies for every domain: browser-wide through CDP (Chromium) or BiDi (Firefox), otherwise origin by origin.
+        Drivers without network capture cannot tell which origins they visited and are recycled instead.
+
+        Args:
+            driver (WebDriver): The driver to reset.
+
+        Returns:
+            bool: True if the reset succeeded, False if the driver should be recycled.
+        """
+        start_time = time.perf_counter()
+        capture = network_capture.get_network_capture(driver)
+        if capture is None:
+            log.info("Driver has no network capture, its visited origins are unknown: recycling driver")
+            return False
+        try:
+            chromium = driver.capabilities.get("browserName") in constant.CHROMIUM_BROWSER_NAMES
+            bidi = not chromium and bool(driver.capabilities.get("webSocketUrl"))
+            handles = driver.window_handles
+            cleared_origins = set()
+            for handle in handles[1:] + handles[:1]:
+                driver.switch_to.window(handle)
+                cleared_origins.add(driver.execute_script(_JS_CLEAR_STORAGE))
+                if not chromium and not bidi:
+                    driver.delete_all_cookies()
+                if handle != handles[0]:
+                    driver.close()
+            if chromium:
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            elif bidi:
+                driver.storage.delete_cookies(CookieFilter())
+            for origin in sorted(capture.visited_origins() - cleared_origins):
+                if chromium:
+                    driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+                    continue
+                # Storage (and cookies without BiDi) can only be cleared from a page of the origin
+                driver.get(f"{origin}{constant.STATE_CHECKPOINT_BOOTSTRAP_PATH}")
+                driver.execute_script(_JS_CLEAR_STORAGE)
+                if not bidi:
+                    driver.delete_all_cookies()
+            driver.get("about:blank")
+            driver.page_snapshots = {}
+            capture.clear()
+        except WebDriverException as e:
+            log.warning(f"Driver reset failed, recycling driver: {e.msg}")
+            return False
+        with self._lock:
+            self.stats["reset_time"] += time.perf_counter() - start_time
+        return True
+
+    def _quit(self, driver: WebDriver) -> None:
+        """
+        Quits a driver and forgets its use count.
+
+        Args:
+            driver (WebDriver): The driver to quit.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except WebDriverException as e:
+            log.warning(f"Driver quit failed: {e.msg}")
+
+    def shutdown(self) -> None:
+        """
+        Quits every idle driver and logs pool statistics.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._quit(driver)
+        log.info(f"Driver pool: {self.stats['launched']} launched ({round(self.stats['launch_time'], 2)}s), "
+                 f"{self.stats['reused']} reused, {self.stats['recycled']} recycled, "
+                 f"{round(self.stats['reset_time'], 2)}s spent in resets")
+
+
+class ProfiledDriverPools:
+    """
+    One DriverPool per (browser, browser profile), created on first use.
+    """
+
+    def __init__(self, factory: Callable[[str, str], WebDriver], size: int = 1, max_uses: int = 20):
+        """
+        Initializes the pools without launching any browser.
+
+        Args:
+            factory (Callable[[str, str], WebDriver]): Callable that launches a new driver for a browser and profile name.
+            size (int, optional): Number of drivers launched when a profile pool is created. Defaults to 1.
+            max_uses (int, optional): Checkouts after which a driver is quit and replaced. Defaults to 20.
+        """
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self._pools: Dict[Tuple[str, str], DriverPool] = {}
+        self._lock = threading.Lock()
+
+    def get(self, profile: str = constant.DEFAULT_BROWSER_PROFILE, browser: str = constant.DEFAULT_BROWSER) -> DriverPool:
+        """
+        Returns the pool for a browser and profile, creating and prewarming it on first use.
+
+        Args:
+            profile (str, optional): Browser profile name. Defaults to 'full'.
+            browser (str, optional): Browser name. Defaults to 'chrome'.
+
+        Returns:
+            DriverPool: The pool serving drivers of that browser launched with that profile.
+        """
+        with self._lock:
+            pool = self._pools.get((browser, profile))
+            if pool is None:
+                pool = DriverPool(factory=lambda: self.factory(browser, profile), size=self.size, max_uses=self.max_uses)
+                self._pools[(browser, profile)] = pool
+                pool.prewarm()
+        return pool
+
+    def shutdown(self) -> None:
+        """
+        Shuts down every browser and profile pool.
+
+        Returns:
+            None
+        """
+        for (browser, profile), pool in self._pools.items():
+            log.info(f"Shutting down {browser} driver pool for profile '{profile}'")
+            pool.shutdown()
@@ -0,0 +1,446 @@
+import heapq
+import json
+import os
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Sequence
+import pytest
+from xdist.remote import Producer
+from xdist.report import report_collection_diff
+from xdist.workermanage import parse_tx_spec_config
+from Helpers import custom_logger
+from Data import constant
+
+log = custom_logger.get_logger()
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.abspath(__file__ + "/../../"), ".cache", "test_durations.json")
+
+# Weight of the latest run in the moving average of a duration
+HISTORY_SMOOTHING = 0.5
+
+# Seconds assumed for a test class that has never run and has no per-test history
+DEFAULT_CLASS_DURATION = 30.0
+
+
+def split_scope(nodeid: str) -> str:
+    """
+    Returns the scheduling unit of a test: its class, or its module for module-level tests (as in xdist loadscope).
+
+    Parametrized tests get one unit per parameter id, so a class run on several browsers (-B chrome,firefox)
+    can run on several workers at once.
+
+    Args:
+        nodeid (str): Pytest node id, e.g. 'tests/test_homepage.py::TestOngoingDealsSection::test_ongoing_deals_tile_count[firefox]'.
+
+    Returns:
+        str: The scope, e.g. 'tests/test_homepage.py::TestOngoingDealsSection[firefox]'.
+    """
+    path, bracket, parameters = nodeid.partition("[")
+    return path.rsplit("::", 1)[0] + bracket + parameters
+
+
+def scope_browser(scope: str) -> Optional[str]:
+    """
+    Returns the browser a work unit is parametrized with, if it is one with a parallelism limit.
+
+    Args:
+        scope (str): Scope returned by split_scope.
+
+    Returns:
+        Optional[str]: Browser name from constant.BROWSER_MAX_PARALLEL, or None.
+    """
+    parameters = scope.partition("[")[2].rstrip("]").split("-")
+    return next((parameter for parameter in parameters if parameter in constant.BROWSER_MAX_PARALLEL), None)
+
+
+def predict_makespan(durations: List[float], workers: int) -> float:
+    """
+    Simulates longest-first assignment of work units to the least loaded worker.
+
+    Args:
+        durations (List[float]): Predicted duration of every work unit in seconds.
+        workers (int): Number of workers.
+
+    Returns:
+        float: Predicted time until the last worker finishes, in seconds.
+    """
+    loads = [0.0] * max(workers, 1)
+    for duration in sorted(durations, reverse=True):
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
+
+
+class DurationHistory:
+    """
+    Moving averages of test and test-class durations, persisted between runs in a JSON file.
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH):
+        """
+        Loads the history file if it exists.
+
+        Args:
+            path (str, optional): Path of the JSON history file. Defaults to .cache/test_durations.json in the project root.
+        """
+        self.path = path
+        self.tests: Dict[str, float] = {}
+        self.classes: Dict[str, float] = {}
+        try:
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+            self.tests, self.classes = data.get("tests", {}), data.get("classes", {})
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            log.warning(f"Ignoring unreadable test duration history {path}: {e}")
+
+    def predict(self, scope: str, nodeids: List[str]) -> float:
+        """
+        Predicts how long a work unit takes.
+
+        Args:
+            scope (str): Scope of the work unit.
+            nodeids (List[str]): Tests of the work unit.
+
+        Returns:
+            float: The class average if known, else the sum of known test averages (unknown tests count as the
+                mean known test), else DEFAULT_CLASS_DURATION.
+        """
+        if scope in self.classes:
+            return self.classes[scope]
+        known = [self.tests[nodeid] for nodeid in nodeids if nodeid in self.tests]
+        if not known:
+            return DEFAULT_CLASS_DURATION
+        return sum(known) + (len(nodeids) - len(known)) * sum(known) / len(known)
+
+    def update(self, test_durations: Dict[str, float]) -> None:
+        """
+        Folds the durations of a run into the moving averages.
+
+        Args:
+            test_durations (Dict[str, float]): Node id -> setup + call + teardown seconds of this run.
+
+        Returns:
+            None
+        """
+        class_durations = defaultdict(float)
+        for nodeid, duration in test_durations.items():
+            class_durations[split_scope(nodeid)] += duration
+        for averages, durations in ((self.tests, test_durations), (self.classes, class_durations)):
+            for key, duration in durations.items():
+                previous = averages.get(key)
+                averages[key] = duration if previous is None else round(
+                    HISTORY_SMOOTHING * duration + (1 - HISTORY_SMOOTHING) * previous, 3)
+
+    def save(self) -> None:
+        """
+        Writes the history file.
+
+        Returns:
+            None
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump({"tests": self.tests, "classes": self.classes}, file, indent=2, sort_keys=True)
+
+
+class DurationScheduling:
+    """
+    xdist scheduler that hands out test classes longest-first using the duration history.
+
+    Keeping a class on one worker lets it reuse its class-scoped driver; longest-first (LPT) keeps the long
+    classes from starting last and leaving the other workers idle. Units of a browser listed in
+    constant.BROWSER_MAX_PARALLEL are held back while that many workers already run the browser.
+
+    Implements the xdist scheduler protocol (xdist.scheduler.protocol.Scheduling) and only uses the public
+    WorkerController methods, so it does not depend on the internals of the bundled xdist schedulers.
+    """
+
+    def __init__(self, config: pytest.Config, log=None, plugin: "DurationSchedulingPlugin" = None):
+        """
+        Initializes the scheduler.
+
+        Args:
+            config (pytest.Config): Pytest config object; the number of workers is read from its --tx specs.
+            log (optional): xdist log producer.
+            plugin (DurationSchedulingPlugin, optional): Plugin holding the history and receiving the prediction.
+        """
+        self.config = config
+        self.log = log.durationsched if log is not None else Producer("durationsched")
+        self.plugin = plugin
+        self.numnodes = len(parse_tx_spec_config(config))
+        self.collection: Optional[List[str]] = None
+        self.registered_collections: Dict = {}
+        # Work units not handed out yet, longest first: scope -> {node id: completed}
+        self.workqueue: "OrderedDict[str, Dict[str, bool]]" = OrderedDict()
+        self.assigned_work: Dict = {}
+
+    @property
+    def nodes(self) -> list:
+        """Workers currently taking part in the run."""
+        return list(self.assigned_work)
+
+    @property
+    def collection_is_completed(self) -> bool:
+        """True once every initial worker has reported its collection."""
+        return len(self.registered_collections) >= self.numnodes
+
+    @property
+    def tests_finished(self) -> bool:
+        """True once no unit is queued and every worker is on its last test."""
+        if not self.collection_is_completed or self.workqueue:
+            return False
+        return all(_pending_of(work) < 2 for work in self.assigned_work.values())
+
+    @property
+    def has_pending(self) -> bool:
+        """True while units are queued or a worker has tests left to run."""
+        return bool(self.workqueue) or any(_pending_of(work) for work in self.assigned_work.values())
+
+    def add_node(self, node) -> None:
+        """
+        Adds a worker that will be handed work units from now on.
+
+        Args:
+            node (WorkerController): The worker.
+
+        Returns:
+            None
+        """
+        self.assigned_work[node] = {}
+
+    def add_node_collection(self, node, collection: Sequence[str]) -> None:
+        """
+        Registers the tests a worker collected.
+
+        Args:
+            node (WorkerController): The worker.
+            collection (Sequence[str]): Collected node ids, in collection order.
+
+        Returns:
+            None
+        """
+        if self.collection is not None and list(collection) != self.collection:
+            self.log(report_collection_diff(self.collection, collection,
+                                            next(iter(self.registered_collections)).gateway.id, node.gateway.id))
+            return
+        self.registered_collections[node] = list(collection)
+
+    def mark_test_complete(self, node, item_index: int, duration: float = 0) -> None:
+        """
+        Marks a test as run and tops the worker up if it is on the last test of its class.
+
+        Args:
+            node (WorkerController): The worker that ran the test.
+            item_index (int): Index of the test in the worker's collection.
+            duration (float, optional): Duration reported by xdist.
+
+        Returns:
+            None
+        """
+        nodeid = self.registered_collections[node][item_index]
+        self.assigned_work[node][split_scope(nodeid)][nodeid] = True
+        self._reschedule(node)
+
+    def mark_test_pending(self, item: str) -> None:
+        """
+        Not supported: work units are never taken back from a running worker.
+
+        Raises:
+            NotImplementedError: Always.
+        """
+        raise NotImplementedError()
+
+    def remove_pending_tests_from_node(self, node, indices: Sequence[int]) -> None:
+        """
+        Not supported: work units are never taken back from a running worker.
+
+        Raises:
+            NotImplementedError: Always.
+        """
+        raise NotImplementedError()
+
+    def remove_node(self, node) -> Optional[str]:
+        """
+        Removes a worker that finished or crashed; the unfinished tests of a crashed worker are queued again first.
+
+        Args:
+            node (WorkerController): The worker.
+
+        Returns:
+            Optional[str]: Node id of the test the worker crashed in, or None if it had nothing pending.
+        """
+        workload = self.assigned_work.pop(node)
+        pending = {scope: unit for scope, unit in workload.items() if not all(unit.values())}
+        if not pending:
+            return None
+        crashitem = next(nodeid for unit in pending.values() for nodeid, completed in unit.items() if not completed)
+        for scope in reversed(list(pending)):
+            self.workqueue[scope] = {nodeid: False for nodeid, completed in pending[scope].items() if not completed}
+            self.workqueue.move_to_end(scope, last=False)
+        for other in self.nodes:
+            self._reschedule(other)
+        return crashitem
+
+    def schedule(self) -> None:
+        """
+        Orders the work units longest-first on the first call and hands one to every worker; later calls only
+        top the workers up.
+
+        Returns:
+            None
+        """
+        if self.collection is not None:
+            for node in self.nodes:
+                self._reschedule(node)
+            return
+        collections = list(self.registered_collections.items())
+        first_node, collection = collections[0]
+        for node, other in collections[1:]:
+            difference = report_collection_diff(collection, other, first_node.gateway.id, node.gateway.id)
+            if difference:
+                self.log(difference)
+                self.config.hook.pytest_collectreport(report=pytest.CollectReport(
+                    nodeid=node.gateway.id, outcome="failed", longrepr=difference, result=[]))
+                return
+        self.collection = list(collection)
+        units: Dict[str, Dict[str, bool]] = {}
+        for nodeid in self.collection:
+            units.setdefault(split_scope(nodeid), {})[nodeid] = False
+        predicted = {scope: self.plugin.history.predict(scope, list(unit)) for scope, unit in units.items()}
+        for scope in sorted(units, key=predicted.get, reverse=True):
+            self.workqueue[scope] = units[scope]
+        self.plugin.predicted_makespan = predict_makespan(list(predicted.values()), len(self.nodes))
+        log.info(f"Scheduling {len(predicted)} test classes longest-first on {len(self.nodes)} workers, "
+                 f"predicted makespan {round(self.plugin.predicted_makespan, 1)}s")
+        for node in self.nodes[len(self.workqueue):]:
+            self.assigned_work.pop(node)
+            node.shutdown()
+        for node in self.nodes:
+            self._reschedule(node)
+
+    def _other_workers_running(self, browser: str, node) -> int:
+        return sum(1 for worker, work in self.assigned_work.items() if worker is not node and any(
+            scope_browser(scope) == browser and not all(unit.values()) for scope, unit in work.items()))
+
+    def _next_scope(self, node) -> Optional[str]:
+        for scope in self.workqueue:
+            browser = scope_browser(scope)
+            if browser is None or self._other_workers_running(browser, node) < constant.BROWSER_MAX_PARALLEL[browser]:
+                return scope
+        return None
+
+    def _reschedule(self, node) -> None:
+        if node.shutting_down:
+            return
+        if not self.workqueue:
+            node.shutdown()
+            return
+        # Only queue the next class once the worker is on the last test of its current class, so a second class
+        # is not stacked behind a long one
+        if _pending_of(self.assigned_work[node]) > 1:
+            return
+        scope = self._next_scope(node)
+        # A worker only runs its last queued test once it gets more work or is shut down, so a worker that
+        # can only be offered units of browsers at their limit (run by other workers) is shut down
+        if scope is None:
+            node.shutdown()
+            return
+        unit = self.workqueue.pop(scope)
+        self.assigned_work[node][scope] = unit
+        collection = self.registered_collections[node]
+        node.send_runtest_some([collection.index(nodeid) for nodeid, completed in unit.items() if not completed])
+
+
+def _pending_of(workload: Dict[str, Dict[str, bool]]) -> int:
+    return sum(list(unit.values()).count(False) for unit in workload.values())
+
+
+class DurationSchedulingPlugin:
+    """
+    Controller-side plugin: records test durations, schedules xdist workers from them and reports the makespan.
+    """
+
+    def __init__(self, history: DurationHistory, schedule: bool = True):
+        """
+        Initializes the plugin.
+
+        Args:
+            history (DurationHistory): History used for predictions and updated at the end of the session.
+            schedule (bool, optional): Replace the xdist loadscope scheduler with DurationScheduling. Defaults to True.
+        """
+        self.history = history
+        self.schedule = schedule
+        self.durations: Dict[str, float] = defaultdict(float)
+        self.worker_busy: Dict[str, float] = defaultdict(float)
+        self.predicted_makespan: Optional[float] = None
+        self.start_time = time.monotonic()
+        self.wall_time: Optional[float] = None
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        """
+        Replaces the scheduler of --dist loadscope, the only mode that keeps a test class on one worker.
+
+        Args:
+            config: Pytest config object.
+            log: xdist log producer.
+
+        Returns:
+            DurationScheduling: The scheduler, or None to keep the one of the selected --dist mode.
+        """
+        if not self.schedule or config.getvalue("dist") != "loadscope":
+            return None
+        return DurationScheduling(config, log, plugin=self)
+
+    def pytest_runtest_logreport(self, report):
+        """
+        Adds the duration of a setup, call or teardown phase to its test and to the worker that ran it.
+
+        Args:
+            report: Test report of the phase.
+
+        Returns:
+            None
+        """
+        self.durations[report.nodeid] += report.duration
+        worker = getattr(getattr(report, "node", None), "gateway", None)
+        self.worker_busy[worker.id if worker else "main"] += report.duration
+
+    def pytest_sessionfinish(self, session):
+        """
+        Completes the prediction for runs that were not scheduled by DurationScheduling and folds the durations of
+        the run into the history file.
+
+        Args:
+            session: Pytest session object.
+
+        Returns:
+            None
+        """
+        if not self.durations:
+            return
+        self.wall_time = time.monotonic() - self.start_time
+        if self.predicted_makespan is None:
+            predicted = [self.history.predict(scope, []) for scope in {split_scope(nodeid) for nodeid in self.durations}]
+            self.predicted_makespan = predict_makespan(predicted, len(self.worker_busy))
+        self.history.update(dict(self.durations))
+        self.history.save()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """
+        Prints the predicted and actual makespan of the run.
+
+        Args:
+            terminalreporter: Pytest terminal reporter.
+
+        Returns:
+            None
+        """
+        if not self.durations or self.predicted_makespan is None:
+            return
+        busiest = max(self.worker_busy.values())
+        terminalreporter.write_sep("-", "duration-aware scheduling")
+        terminalreporter.write_line(f"predicted makespan: {round(self.predicted_makespan, 1)}s, "
+                                    f"actual: {round(busiest, 1)}s busiest worker / {round(self.wall_time, 1)}s wall time "
+                                    f"({len(self.worker_busy)} workers)")
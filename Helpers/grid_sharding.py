@@ -0,0 +1,152 @@
+from typing import Dict, List, Optional
+import pytest
+import requests
+from Helpers import custom_logger
+from Data import constant
+
+log = custom_logger.get_logger()
+
+
+def parse_grid_urls(option: Optional[str]) -> List[str]:
+    """
+    Parses the comma-separated --grid-url option.
+
+    Args:
+        option (Optional[str]): Option value, e.g. 'http://grid-a:4444,http://grid-b:4444'.
+
+    Returns:
+        List[str]: Grid URLs without trailing slashes; empty when tests run on local browsers.
+    """
+    return [url.strip().rstrip("/") for url in (option or "").split(",") if url.strip()]
+
+
+def fetch_free_slots(grid_url: str, browsers: List[str], timeout: float = constant.GRID_STATUS_TIMEOUT) -> int:
+    """
+    Counts the sessions a Selenium Grid (hub or standalone server) can start right now for the given browsers.
+
+    Reads the /status endpoint: every node that is UP contributes its slots whose stereotype is one of the
+    browsers and that run no session, capped at the sessions the node can still start (maxSessions minus the
+    sessions it already runs).
+
+    Args:
+        grid_url (str): Grid URL, e.g. http://localhost:4444.
+        browsers (List[str]): Browser names, e.g. ['chrome'].
+        timeout (float, optional): Request timeout in seconds. Defaults to constant.GRID_STATUS_TIMEOUT.
+
+    Returns:
+        int: Number of free slots, 0 if the grid is unreachable or has no free matching slot.
+    """
+    try:
+        response = requests.get(f"{grid_url}/status", timeout=timeout)
+        response.raise_for_status()
+        nodes = response.json()["value"].get("nodes", [])
+    except (requests.RequestException, ValueError, KeyError) as e:
+        log.error(f"Selenium Grid {grid_url} status could not be read: {e}")
+        return 0
+    free_slots = 0
+    for node in nodes:
+        if node.get("availability", "UP") != "UP":
+            continue
+        slots = node.get("slots", [])
+        busy = sum(1 for slot in slots if slot.get("session"))
+        free = sum(1 for slot in slots if not slot.get("session")
+                   and slot.get("stereotype", {}).get("browserName", "").lower() in browsers)
+        free_slots += max(0, min(free, node.get("maxSessions", len(slots)) - busy))
+    return free_slots
+
+
+class GridShardPlugin:
+    """
+    Controller-side plugin spreading pytest-xdist workers over several Selenium Grids in proportion to their free
+    slots.
+
+    Each worker runs its sessions on one grid, and the test classes are distributed over the workers by the xdist
+    scheduler (longest-first with duration scheduling), so every grid receives test classes according to its
+    free slots. The nodes behind one hub are balanced by the hub.
+    """
+
+    def __init__(self, grid_urls: List[str], browsers: List[str]):
+        """
+        Reads the free slots of every grid.
+
+        Args:
+            grid_urls (List[str]): Grid URLs.
+            browsers (List[str]): Browsers the tests run on.
+
+        Raises:
+            pytest.UsageError: If no grid has a slot for the browsers.
+        """
+        self.free_slots: Dict[str, int] = {url: fetch_free_slots(url, browsers) for url in grid_urls}
+        self.assigned: Dict[str, int] = {url: 0 for url in grid_urls}
+        if not any(self.free_slots.values()):
+            raise pytest.UsageError(f"No Selenium Grid in --grid-url has a free slot for {', '.join(browsers)}: "
+                                    f"{self.free_slots}")
+        log.info(f"Selenium Grid free slots: {self.free_slots}")
+
+    def next_grid(self) -> str:
+        """
+        Picks the grid for the next worker: the one with the largest share of its free slots still unassigned.
+
+        Returns:
+            str: Grid URL.
+        """
+        grids = [url for url, free_slots in self.free_slots.items() if free_slots]
+        url = max(grids, key=lambda url: ((self.free_slots[url] - self.assigned[url]) / self.free_slots[url],
+                                          self.free_slots[url]))
+        self.assigned[url] += 1
+        if self.assigned[url] > self.free_slots[url]:
+            log.warning(f"More workers than slots on {url}: sessions will queue on the grid")
+        return url
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        """
+        Pins a pytest-xdist worker to the next grid before it starts.
+
+        Args:
+            node: xdist worker controller.
+
+        Returns:
+            None
+        """
+        node.workerinput["grid_url"] = self.next_grid()
+        log.info(f"Worker {node.gateway.id} runs its browsers on {node.workerinput['grid_url']}")
+
+
+def get_grid_shard_plugin(config, browsers: List[str]) -> Optional[GridShardPlugin]:
+    """
+    Returns the grid sharding plugin of the controller, registering it on first use.
+
+    Args:
+        config: Pytest config object.
+        browsers (List[str]): Browsers the tests run on.
+
+    Returns:
+        Optional[GridShardPlugin]: The plugin, or None for local browsers.
+    """
+    grid_urls = parse_grid_urls(config.getoption("GridUrl"))
+    if not grid_urls:
+        return None
+    plugin = config.pluginmanager.get_plugin("grid_sharding")
+    if plugin is None:
+        plugin = GridShardPlugin(grid_urls, browsers)
+        config.pluginmanager.register(plugin, "grid_sharding")
+    return plugin
+
+
+def get_grid_url(config) -> Optional[str]:
+    """
+    Returns the grid the current process starts its sessions on.
+
+    Args:
+        config: Pytest config object.
+
+    Returns:
+        Optional[str]: The grid assigned to this pytest-xdist worker, the first --grid-url without xdist,
+            or None for local browsers.
+    """
+    workerinput = getattr(config, "workerinput", {})
+    if workerinput.get("grid_url"):
+        return workerinput["grid_url"]
+    grid_urls = parse_grid_urls(config.getoption("GridUrl"))
+    return grid_urls[0] if grid_urls else None
@@ -0,0 +1,455 @@
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+PROJECT_ROOT = os.path.abspath(__file__ + "/../../")
+
+LOCATORS_FILE = "locators.py"
+PAGES_DIR = "Pages"
+TESTS_DIR = "tests"
+
+RECORDED_DEPENDENCIES_PATH = os.path.join(PROJECT_ROOT, ".cache", "test_dependencies.json")
+
+# Changed files that cannot affect test selection
+IGNORED_CHANGE_PATTERN = re.compile(r"(\.md$|\.txt$|^\.gitignore$|^LogFiles/|^\.github/)")
+
+_HUNK_PATTERN = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# Sentinel returned when a change can affect every test (e.g. a helper module or conftest changed)
+ALL_TESTS = "*"
+
+
+def _read(path: str, root: str = PROJECT_ROOT) -> str:
+    with open(os.path.join(root, path), encoding="utf-8") as file:
+        return file.read()
+
+
+def _is_dunder(name: str) -> bool:
+    return name.startswith("__") and name.endswith("__")
+
+
+def _first_line(node: ast.AST) -> int:
+    # A decorator belongs to the definition it decorates
+    return min([decorator.lineno for decorator in getattr(node, "decorator_list", [])] + [node.lineno])
+
+
+def _definitions(tree: ast.Module) -> List[Tuple[str, ast.AST]]:
+    """
+    Lists the named definitions of a module: module-level assignments, functions, classes and class members.
+
+    Args:
+        tree (ast.Module): Parsed module.
+
+    Returns:
+        List[Tuple[str, ast.AST]]: (qualified name, node) pairs; class members are named 'Class.member'.
+    """
+    definitions = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            definitions.append((node.name, node))
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            definitions.extend((target.id, node) for target in targets if isinstance(target, ast.Name))
+        if isinstance(node, ast.ClassDef):
+            for member in node.body:
+                if isinstance(member, (ast.FunctionDef, ast.Assign)):
+                    name = member.name if isinstance(member, ast.FunctionDef) else getattr(member.targets[0], "id", None)
+                    if name:
+                        definitions.append((f"{node.name}.{name}", member))
+    return definitions
+
+
+def _attribute_names(node: ast.AST, owner: Optional[str] = None) -> Set[str]:
+    """
+    Collects attribute names accessed in a node, e.g. {'open_page'} for self.home_page_obj.open_page(...).
+
+    Args:
+        node (ast.AST): Node to scan.
+        owner (Optional[str], optional): Only keep attributes of this name (e.g. 'locators'). Defaults to any owner.
+
+    Returns:
+        Set[str]: Attribute names.
+    """
+    return {child.attr for child in ast.walk(node) if isinstance(child, ast.Attribute)
+            and (owner is None or (isinstance(child.value, ast.Name) and child.value.id == owner))}
+
+
+class DependencyGraph:
+    """
+    Static graph from locators.py constants to the page-object members using them and on to the tests calling those.
+
+    Page members are qualified by class ('Homepage.get_ongoing_deals_elements'). Calls through self resolve along the
+    class hierarchy: to the implementation the class inherits and to the overrides of its subclasses. Calls on any
+    other object, and the calls of tests, are matched by attribute name, so a name shared by two pages links to
+    both (never misses a test).
+    """
+
+    def __init__(self, root: str = PROJECT_ROOT):
+        """
+        Builds the graph from the files on disk.
+
+        Args:
+            root (str, optional): Project root holding locators.py, Pages/ and tests/. Defaults to this project.
+        """
+        self.root = root
+        self.locators: Dict[str, Tuple[int, int]] = {}
+        self.locator_users: Dict[str, Set[str]] = defaultdict(set)
+        self.global_locators: Set[str] = set()
+        self.members: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self.class_bases: Dict[str, List[str]] = {}
+        self.member_callers: Dict[str, Set[str]] = defaultdict(set)
+        self.tests: Dict[str, Dict[str, object]] = {}
+        self._build_locators()
+        self._build_pages()
+        self._build_global_locators()
+        self._build_tests()
+
+    def _build_locators(self) -> None:
+        for name, node in _definitions(ast.parse(_read(LOCATORS_FILE, self.root))):
+            self.locators[name] = (node.lineno, node.end_lineno)
+
+    def _build_pages(self) -> None:
+        bodies: Dict[str, ast.AST] = {}
+        for file_name in sorted(os.listdir(os.path.join(self.root, PAGES_DIR))):
+            if not file_name.endswith(".py"):
+                continue
+            path = f"{PAGES_DIR}/{file_name}"
+            self.members[path] = {}
+            for name, node in _definitions(ast.parse(_read(path, self.root))):
+                if isinstance(node, ast.ClassDef) and "." not in name:
+                    self.class_bases[name] = [base.id for base in node.bases if isinstance(base, ast.Name)]
+                if "." not in name:
+                    continue
+                self.members[path][name] = (_first_line(node), node.end_lineno)
+                bodies[name] = node
+                for locator in _attribute_names(node, owner="locators"):
+                    self.locator_users[locator].add(name)
+        for name, node in bodies.items():
+            owner, member = name.split(".", 1)
+            for child in ast.walk(node):
+                if not isinstance(child, ast.Attribute):
+                    continue
+                if isinstance(child.value, ast.Name) and child.value.id == "self":
+                    callees = self._resolve_self_call(owner, child.attr)
+                elif isinstance(child.value, ast.Call) and getattr(child.value.func, "id", None) == "super":
+                    callees = self._resolve_self_call(self.class_bases[owner][0], child.attr) \
+                        if self.class_bases.get(owner) else set()
+                else:
+                    callees = self._qualified(child.attr)
+                for callee in callees - {name}:
+                    self.member_callers[callee].add(name)
+
+    def _ancestors(self, cls: str) -> List[str]:
+        """
+        Returns a page class and its base classes, nearest first.
+
+        Args:
+            cls (str): Class name.
+
+        Returns:
+            List[str]: Class names of the page objects in the lookup order (single inheritance).
+        """
+        ancestors = []
+        while cls in self.class_bases and cls not in ancestors:
+            ancestors.append(cls)
+            cls = self.class_bases[cls][0] if self.class_bases[cls] else None
+        return ancestors
+
+    def _qualified(self, member: str) -> Set[str]:
+        """
+        Returns every page member with the given name.
+
+        Args:
+            member (str): Member name, e.g. 'open_page'.
+
+        Returns:
+            Set[str]: Qualified names, e.g. {'BasePage.open_page'}.
+        """
+        return {name for members in self.members.values() for name in members if name.split(".", 1)[1] == member}
+
+    def _resolve_self_call(self, cls: str, member: str) -> Set[str]:
+        """
+        Resolves self.<member> inside a class to the members that can run.
+
+        Args:
+            cls (str): Class whose method makes the call.
+            member (str): Called member name.
+
+        Returns:
+            Set[str]: The implementation the class inherits, plus the overrides of its subclasses.
+        """
+        defined = self._qualified(member)
+        inherited = next((f"{ancestor}.{member}" for ancestor in self._ancestors(cls)
+                          if f"{ancestor}.{member}" in defined), None)
+        overrides = {name for name in defined if cls in self._ancestors(name.split(".", 1)[0])[1:]}
+        return overrides | ({inherited} if inherited else set())
+
+    def _build_global_locators(self) -> None:
+        # Locators used outside the page objects (e.g. the popup handling in driver_helpers) can affect any test
+        for directory in ("Helpers", "Utility"):
+            for root, _, files in os.walk(os.path.join(self.root, directory)):
+                for file_name in files:
+                    if file_name.endswith(".py"):
+                        with open(os.path.join(root, file_name), encoding="utf-8") as file:
+                            self.global_locators |= _attribute_names(ast.parse(file.read()), owner="locators")
+
+    def _build_tests(self) -> None:
+        for file_name in sorted(os.listdir(os.path.join(self.root, TESTS_DIR))):
+            if not (file_name.startswith("test_") and file_name.endswith(".py")):
+                continue
+            path = f"{TESTS_DIR}/{file_name}"
+            for node in ast.parse(_read(path, self.root)).body:
+                if not isinstance(node, ast.ClassDef):
+                    if isinstance(node, ast.FunctionDef) and node.name.startswith("test"):
+                        self.tests[f"{path}::{node.name}"] = {"lines": (node.lineno, node.end_lineno),
+                                                              "calls": _attribute_names(node)}
+                    continue
+                # Class fixtures (open_page, page objects) run for every test of the class
+                shared_calls = set()
+                for member in node.body:
+                    if isinstance(member, ast.FunctionDef) and not member.name.startswith("test"):
+                        shared_calls |= _attribute_names(member)
+                for member in node.body:
+                    if isinstance(member, ast.FunctionDef) and member.name.startswith("test"):
+                        self.tests[f"{path}::{node.name}::{member.name}"] = {
+                            "lines": (member.lineno, member.end_lineno), "class_lines": (node.lineno, node.end_lineno),
+                            "calls": _attribute_names(member) | shared_calls}
+
+    def _expand_members(self, members: Set[str]) -> Set[str]:
+        """
+        Adds every member that (transitively) calls one of the given members.
+
+        Args:
+            members (Set[str]): Qualified member names.
+
+        Returns:
+            Set[str]: The members and their callers.
+        """
+        affected, frontier = set(members), set(members)
+        while frontier:
+            frontier = set().union(*(self.member_callers.get(member, set()) for member in frontier)) - affected
+            affected |= frontier
+        return affected
+
+    def tests_using_members(self, members: Set[str]):
+        """
+        Returns the tests that call any of the members, directly or through other page members.
+
+        A member that nothing in the graph calls (used dynamically) or that runs through a dunder method (called
+        implicitly, e.g. __init__) can affect any test.
+
+        Args:
+            members (Set[str]): Qualified page-object member names.
+
+        Returns:
+            Union[Set[str], str]: Test node ids (without parameters), or ALL_TESTS.
+        """
+        affected = self._expand_members(members)
+        names = {member.split(".", 1)[1] for member in affected}
+        recorded = load_recorded_dependencies()
+        tests = {test for test, info in self.tests.items() if info["calls"] & names} | \
+                {test for test, used in recorded.items() if set(used) & names}
+        called_by_tests = set().union(*(info["calls"] for info in self.tests.values()), *recorded.values())
+        if any(_is_dunder(member.split(".", 1)[1]) for member in affected):
+            return ALL_TESTS
+        if any(not self.member_callers.get(member) and member.split(".", 1)[1] not in called_by_tests
+               for member in members):
+            return ALL_TESTS
+        return tests
+
+    def tests_using_locators(self, locators: Set[str]):
+        """
+        Returns the tests that depend on any of the locators.
+
+        Args:
+            locators (Set[str]): Names of constants in locators.py.
+
+        Returns:
+            Union[Set[str], str]: Test node ids (without parameters), or ALL_TESTS.
+        """
+        members = set().union(*(self.locator_users.get(locator, set()) for locator in locators))
+        return self.tests_using_members(members)
+
+    def affected_tests(self, changes: Dict[str, Set[int]]):
+        """
+        Maps changed lines to the tests they can affect.
+
+        Args:
+            changes (Dict[str, Set[int]]): Changed file path -> changed line numbers (of the new version).
+
+        Returns:
+            Union[Set[str], str]: Test node ids (without parameters), or ALL_TESTS if the change can affect any test.
+        """
+        affected = set()
+        for path, lines in changes.items():
+            if IGNORED_CHANGE_PATTERN.search(path):
+                continue
+            if path == LOCATORS_FILE:
+                changed = {name for name, (start, end) in self.locators.items() if any(start <= line <= end for line in lines)}
+                if not changed or changed & self.global_locators:
+                    return ALL_TESTS
+                selected = self.tests_using_locators(changed)
+            elif path in self.members:
+                source = _read(path, self.root).splitlines()
+                changed = set()
+                for line in lines:
+                    # Blank and comment lines between definitions cannot change behavior
+                    if line <= len(source) and source[line - 1].strip()[:1] in ("", "#"):
+                        continue
+                    hit = {name for name, (start, end) in self.members[path].items() if start <= line <= end}
+                    if not hit:
+                        # Imports, module-level or class-level code of a page object
+                        return ALL_TESTS
+                    changed |= hit
+                selected = self.tests_using_members(changed)
+            elif path.startswith(f"{TESTS_DIR}/test_") and path.endswith(".py"):
+                in_file = {test: info for test, info in self.tests.items() if test.startswith(f"{path}::")}
+                hit = {test for test, info in in_file.items()
+                       if any(info["lines"][0] <= line <= info["lines"][1] for line in lines)}
+                class_hit = {test for test, info in in_file.items() if "class_lines" in info and
+                             any(info["class_lines"][0] <= line <= info["class_lines"][1] for line in lines)}
+                # A change outside any test (imports, class fixtures) selects the whole module or class
+                selected = hit or class_hit or set(in_file)
+            elif path.endswith(".py") or path.endswith(".ini") or path.endswith(".json"):
+                return ALL_TESTS
+            else:
+                continue
+            if selected == ALL_TESTS:
+                return ALL_TESTS
+            affected |= selected
+        return affected
+
+
+def parse_diff(diff: str) -> Dict[str, Set[int]]:
+    """
+    Extracts changed line numbers per file from a unified diff.
+
+    Deleted lines are mapped to the line they were removed before, so the enclosing definition is still hit.
+
+    Args:
+        diff (str): Output of `git diff --unified=0`.
+
+    Returns:
+        Dict[str, Set[int]]: File path (new name) -> changed line numbers of the new version.
+    """
+    changes: Dict[str, Set[int]] = defaultdict(set)
+    path = None
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            path = line[4:].strip()
+            path = None if path == "/dev/null" else path[2:] if path.startswith("b/") else path
+        elif line.startswith("--- ") and line[4:].strip() != "/dev/null":
+            old_path = line[4:].strip()
+            changes.setdefault(old_path[2:] if old_path.startswith("a/") else old_path, set())
+        elif path and line.startswith("@@"):
+            match = _HUNK_PATTERN.match(line)
+            start, count = int(match.group(3)), int(match.group(4) or 1)
+            changes[path].update(range(start, start + count) if count else {max(start, 1)})
+    return dict(changes)
+
+
+def git_changes(base: str) -> Dict[str, Set[int]]:
+    """
+    Returns the lines changed between a git revision and the working tree.
+
+    Args:
+        base (str): Revision to compare against, e.g. 'origin/main' or 'HEAD~1'.
+
+    Returns:
+        Dict[str, Set[int]]: File path -> changed line numbers.
+
+    Raises:
+        subprocess.CalledProcessError: If git fails (e.g. unknown revision).
+    """
+    diff = subprocess.run(["git", "diff", "--unified=0", base, "--"], cwd=PROJECT_ROOT,
+                          capture_output=True, text=True, check=True).stdout
+    untracked = subprocess.run(["git", "ls-files", "--others", "--exclude-standard"], cwd=PROJECT_ROOT,
+                               capture_output=True, text=True, check=True).stdout.split()
+    changes = parse_diff(diff)
+    for path in untracked:
+        changes[path] = set(range(1, _read(path).count("\n") + 2)) if path.endswith(".py") else {1}
+    return changes
+
+
+def load_recorded_dependencies() -> Dict[str, List[str]]:
+    """
+    Loads the page-object members each test was seen calling at runtime (recorded from the step timing spans).
+
+    Returns:
+        Dict[str, List[str]]: Test node id (without parameters) -> member names.
+    """
+    try:
+        with open(RECORDED_DEPENDENCIES_PATH, encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def members_from_spans(tree: Dict[str, object]) -> Set[str]:
+    """
+    Returns the page-object members found in a step span tree recorded by Helpers.step_timing.
+
+    Args:
+        tree (Dict[str, object]): Root span of a test.
+
+    Returns:
+        Set[str]: Member names, e.g. {'open_page', 'get_ongoing_deals_elements'}.
+    """
+    members = set()
+    for span in tree["children"]:
+        owner, _, member = span["name"].partition(".")
+        if owner == "page":
+            members.add(f"{member}_page")
+        elif owner[:1].isupper():
+            members.add(member)
+        members |= members_from_spans(span)
+    return members
+
+
+def record_dependencies(observed: Dict[str, Set[str]]) -> None:
+    """
+    Merges page-object members observed at runtime into the recorded dependencies file.
+
+    Args:
+        observed (Dict[str, Set[str]]): Test node id (without parameters) -> member names called during the test.
+
+    Returns:
+        None
+    """
+    recorded = load_recorded_dependencies()
+    for test, members in observed.items():
+        recorded[test] = sorted(set(recorded.get(test, [])) | members)
+    os.makedirs(os.path.dirname(RECORDED_DEPENDENCIES_PATH), exist_ok=True)
+    with open(RECORDED_DEPENDENCIES_PATH, "w", encoding="utf-8") as file:
+        json.dump(recorded, file, indent=2, sort_keys=True)
+
+
+def main() -> None:
+    """
+    Prints the tests affected by the changes since a git revision, or the locator graph.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Select tests affected by a change")
+    parser.add_argument("--base", default="HEAD", help="git revision to diff against (default: HEAD)")
+    parser.add_argument("--graph", action="store_true", help="print locator -> page members -> tests instead")
+    args = parser.parse_args()
+    graph = DependencyGraph()
+    if args.graph:
+        for locator in sorted(graph.locators):
+            tests = graph.tests_using_locators({locator})
+            print(f"{locator}: {sorted(graph.locator_users.get(locator, []))} -> "
+                  f"{'all tests' if tests == ALL_TESTS else sorted(tests)}")
+        return
+    affected = graph.affected_tests(git_changes(args.base))
+    print("all tests" if affected == ALL_TESTS else "\n".join(sorted(affected)) or "no tests affected")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Dict, Mapping, Optional, Union
+from selenium.webdriver.common.by import By
+from Helpers import custom_logger
+
+import locators
+
+log = custom_logger.get_logger()
+
+# Locator constant name suffix -> Selenium By strategy
+LOCATOR_SUFFIX_MAPPING = {"css": By.CSS_SELECTOR, "xpath": By.XPATH, "id": By.ID}
+
+
+@dataclass(frozen=True)
+class Locator:
+    """
+    A locator with its Selenium By strategy resolved up front.
+
+    Attributes:
+        name (str): Name of the locator constant (e.g., 'campaign_pop_up_xpath').
+        value (str): The raw locator string passed to Selenium.
+        by (str): The Selenium By strategy (e.g., By.XPATH).
+        scope (str): Namespace the locator belongs to ('global' for locators.py).
+    """
+    name: str
+    value: str
+    by: str
+    scope: str = "global"
+
+    def as_tuple(self) -> tuple:
+        """
+        Returns the locator in the (By, value) form expected by Selenium and expected_conditions.
+
+        Returns:
+            tuple: (by, value) pair.
+        """
+        return self.by, self.value
+
+    def __str__(self) -> str:
+        return self.value
+
+
+def strategy_from_name(name: str) -> str:
+    """
+    Derives the Selenium By strategy from a locator constant name suffix.
+
+    Args:
+        name (str): Locator constant name ending with _xpath, _css or _id.
+
+    Returns:
+        str: The Selenium By strategy.
+
+    Raises:
+        ValueError: If the name does not end with a supported suffix.
+    """
+    suffix = name.split("_")[-1]
+    if suffix not in LOCATOR_SUFFIX_MAPPING:
+        raise ValueError(f"Locator '{name}' must end with one of {['_' + s for s in LOCATOR_SUFFIX_MAPPING]}")
+    return LOCATOR_SUFFIX_MAPPING[suffix]
+
+
+def infer_strategy(value: str) -> str:
+    """
+    Guesses the Selenium By strategy for an unregistered locator string.
+
+    Args:
+        value (str): The raw locator string.
+
+    Returns:
+        str: By.XPATH for strings starting with '/' or '(', By.CSS_SELECTOR otherwise.
+    """
+    return By.XPATH if value.lstrip().startswith(("/", "(")) else By.CSS_SELECTOR
+
+
+def _validate(name: str, value: str, by: str) -> None:
+    """
+    Performs cheap import-time sanity checks on a locator.
+
+    Args:
+        name (str): Locator constant name.
+        value (str): The raw locator string.
+        by (str): The resolved By strategy.
+
+    Raises:
+        ValueError: If the locator is empty or its value does not fit its strategy.
+    """
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"Locator '{name}' has an empty value")
+    if by == By.XPATH and not value.lstrip().startswith(("/", "(", ".")):
+        raise ValueError(f"Locator '{name}' is declared as xpath but does not look like one: {value}")
+    if by == By.XPATH and value.count("[") != value.count("]"):
+        raise ValueError(f"Locator '{name}' has unbalanced brackets: {value}")
+
+
+class LocatorRegistry:
+    """
+    Index of known locators keyed by their raw string value for O(1) resolution.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty registry.
+        """
+        self._by_value: Dict[str, Locator] = {}
+        self._by_name: Dict[str, Locator] = {}
+        self._ad_hoc: Dict[str, Locator] = {}
+
+    def register(self, name: str, value: str, by: Optional[str] = None, scope: str = "global") -> Locator:
+        """
+        Registers a single locator, validating it and resolving its strategy.
+
+        Args:
+            name (str): Locator name. Its suffix decides the strategy unless `by` is given.
+            value (str): The raw locator string.
+            by (str, optional): Explicit Selenium By strategy. Defaults to None.
+            scope (str, optional): Namespace of the locator (e.g., a page name). Defaults to 'global'.
+
+        Returns:
+            Locator: The registered locator.
+
+        Raises:
+            ValueError: If the locator is invalid or its value is already registered with another strategy.
+        """
+        by = by or strategy_from_name(name)
+        _validate(name, value, by)
+        existing = self._by_value.get(value)
+        if existing and existing.by != by:
+            raise ValueError(f"Locator '{name}' conflicts with '{existing.name}': same value, different strategy")
+        locator = Locator(name=name, value=value, by=by, scope=scope)
+        self._by_value.setdefault(value, locator)
+        self._by_name[f"{scope}.{name}"] = locator
+        return locator
+
+    def register_namespace(self, namespace: Union[ModuleType, Mapping[str, object]], scope: str = "global") -> int:
+        """
+        Registers every locator constant (names ending in _xpath, _css or _id) found in a module or mapping.
+
+        Args:
+            namespace (Union[ModuleType, Mapping[str, object]]): Module, class __dict__ or plain dict to scan.
+            scope (str, optional): Namespace of the locators. Defaults to 'global'.
+
+        Returns:
+            int: Number of locators registered.
+        """
+        items = vars(namespace).items() if isinstance(namespace, ModuleType) else namespace.items()
+        count = 0
+        for name, value in items:
+            if name.startswith("_") or name.split("_")[-1] not in LOCATOR_SUFFIX_MAPPING:
+                continue
+            self.register(name, value, scope=scope)
+            count += 1
+        return count
+
+    def resolve(self, locator: Union[str, Locator]) -> Locator:
+        """
+        Resolves a locator string or Locator object to a Locator.
+
+        Unregistered strings are treated as ad-hoc locators: their strategy is inferred once, with a warning, and
+        cached for later resolutions.
+
+        Args:
+            locator (Union[str, Locator]): The locator to resolve.
+
+        Returns:
+            Locator: The resolved locator.
+        """
+        if isinstance(locator, Locator):
+            return locator
+        resolved = self._by_value.get(locator) or self._ad_hoc.get(locator)
+        if resolved is None:
+            resolved = Locator(name="ad_hoc", value=locator, by=infer_strategy(locator), scope="ad_hoc")
+            self._ad_hoc[locator] = resolved
+            log.warning(f"Locator '{locator}' is not registered, inferred strategy '{resolved.by}'")
+        return resolved
+
+    def get(self, name: str, scope: str = "global") -> Locator:
+        """
+        Looks up a registered locator by name.
+
+        Args:
+            name (str): Locator name.
+            scope (str, optional): Namespace of the locator. Defaults to 'global'.
+
+        Returns:
+            Locator: The registered locator.
+
+        Raises:
+            KeyError: If no locator with that name is registered in the scope.
+        """
+        return self._by_name[f"{scope}.{name}"]
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def __contains__(self, locator: Union[str, Locator]) -> bool:
+        value = locator.value if isinstance(locator, Locator) else locator
+        return value in self._by_value
+
+
+registry = LocatorRegistry()
+registry.register_namespace(locators)
@@ -0,0 +1,290 @@
+import json
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Type
+from urllib.parse import urlsplit
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.common.bidi.common import command_builder
+from selenium.webdriver.common.bidi.network import NetworkEvent
+from selenium.common import WebDriverException
+from Helpers import custom_logger
+from Data import constant
+
+log = custom_logger.get_logger()
+
+
+@dataclass
+class CapturedResponse:
+    """
+    A response observed by the browser while loading a page.
+
+    Attributes:
+        url (str): Requested URL (the original URL when the request was redirected).
+        status (int): Final HTTP status code.
+        size (int): Encoded bytes received, or 0 when unknown.
+        duration (float): Seconds from request start to load finish, or 0.0 when unknown.
+        mime_type (str): Response MIME type.
+        final_url (str): URL that produced the final response.
+    """
+    url: str
+    status: int
+    size: int = 0
+    duration: float = 0.0
+    mime_type: str = ""
+    final_url: str = ""
+
+
+class NetworkCaptureBackend(ABC):
+    """
+    Base class for browser-specific sources of network events.
+    """
+
+    def __init__(self, driver: WebDriver):
+        """
+        Initializes the backend for a driver.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance to capture from.
+        """
+        self.driver = driver
+
+    @classmethod
+    @abstractmethod
+    def is_supported(cls, driver: WebDriver) -> bool:
+        """
+        Tells whether the backend can capture from this driver.
+
+        Args:
+            driver (WebDriver): The Selenium WebDriver instance.
+
+        Returns:
+            bool: True if the backend can be used.
+        """
+
+    def start(self) -> None:
+        """
+        Starts listening for network events.
+
+        Returns:
+            None
+        """
+
+    @abstractmethod
+    def collect(self) -> List[CapturedResponse]:
+        """
+        Returns the responses completed since the previous call.
+
+        Returns:
+            List[CapturedResponse]: Newly completed responses.
+        """
+
+
+class PerformanceLogBackend(NetworkCaptureBackend):
+    """
+    Reads CDP Network events from the Chrome performance log (requires the goog:loggingPrefs performance capability).
+    """
+
+    def __init__(self, driver: WebDriver):
+        super().__init__(driver)
+        self._requests: Dict[str, Dict[str, object]] = {}
+
+    @classmethod
+    def is_supported(cls, driver: WebDriver) -> bool:
+        # Only Chromium sessions have the performance log. The log is read through execute because remote
+        # drivers (Selenium Grid) have no log_types/get_log helpers
+        if driver.capabilities.get("browserName") not in constant.CHROMIUM_BROWSER_NAMES:
+            return False
+        try:
+            return "performance" in driver.execute(Command.GET_AVAILABLE_LOG_TYPES)["value"]
+        except WebDriverException:
+            return False
+
+    def collect(self) -> List[CapturedResponse]:
+        completed = []
+        for entry in self.driver.execute(Command.GET_LOG, {"type": "performance"})["value"]:
+            message = json.loads(entry["message"])["message"]
+            method, params = message.get("method"), message.get("params", {})
+            request_id = params.get("requestId")
+            if method == "Network.requestWillBeSent":
+                # Redirects reuse the requestId, so keep the URL of the first hop
+                pending = self._requests.setdefault(request_id, {"url": params["request"]["url"], "start": params["timestamp"]})
+                pending["final_url"] = params["request"]["url"]
+            elif method == "Network.responseReceived" and request_id in self._requests:
+                response = params["response"]
+                self._requests[request_id].update(status=response["status"], mime_type=response.get("mimeType", ""),
+                                                  final_url=response["url"])
+            elif method in ("Network.loadingFinished", "Network.loadingFailed") and request_id in self._requests:
+                pending = self._requests.pop(request_id)
+                if "status" not in pending:
+                    continue
+                completed.append(CapturedResponse(url=pending["url"], status=pending["status"],
+                                                  size=int(params.get("encodedDataLength", 0)),
+                                                  duration=params["timestamp"] - pending["start"],
+                                                  mime_type=pending["mime_type"], final_url=pending["final_url"]))
+        return completed
+
+
+class BiDiBackend(NetworkCaptureBackend):
+    """
+    Subscribes to WebDriver BiDi network.responseCompleted events (requires a driver started with enable_bidi).
+    """
+
+    EVENT_NAME = "network.responseCompleted"
+
+    def __init__(self, driver: WebDriver):
+        super().__init__(driver)
+        self._completed: List[CapturedResponse] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def is_supported(cls, driver: WebDriver) -> bool:
+        return bool(driver.caps.get("webSocketUrl"))
+
+    def _on_response_completed(self, event: NetworkEvent) -> None:
+        request, response = event.params["request"], event.params["response"]
+        timings = request.get("timings") or {}
+        duration = (timings.get("responseEnd", 0) - timings.get("requestTime", timings.get("fetchStart", 0))) / 1000
+        captured = CapturedResponse(url=request["url"], status=response["status"], size=int(response.get("bytesReceived", 0)),
+                                    duration=max(duration, 0.0), mime_type=response.get("mimeType", ""),
+                                    final_url=response["url"])
+        with self._lock:
+            self._completed.append(captured)
+
+    def start(self) -> None:
+        connection = self.driver.network.conn
+        connection.add_callback(NetworkEvent(self.EVENT_NAME), self._on_response_completed)
+        connection.execute(command_builder("session.subscribe", {"events": [self.EVENT_NAME]}))
+
+    def collect(self) -> List[CapturedResponse]:
+        with self._lock:
+            completed, self._completed = self._completed, []
+        return completed
+
+
+# Backends tried in order; register_backend adds new ones in front
+BACKENDS: List[Type[NetworkCaptureBackend]] = [PerformanceLogBackend, BiDiBackend]
+
+
+def register_backend(backend: Type[NetworkCaptureBackend]) -> None:
+    """
+    Registers a capture backend so it is preferred over the built-in ones.
+
+    Args:
+        backend (Type[NetworkCaptureBackend]): Backend class to register.
+
+    Returns:
+        None
+    """
+    BACKENDS.insert(0, backend)
+
+
+class NetworkCapture:
+    """
+    Responses captured from one driver, indexed by URL.
+    """
+
+    def __init__(self, backend: NetworkCaptureBackend):
+        """
+        Initializes the capture with a started backend.
+
+        Args:
+            backend (NetworkCaptureBackend): Source of network events.
+        """
+        self.backend = backend
+        self.responses: Dict[str, CapturedResponse] = {}
+
+    def refresh(self) -> None:
+        """
+        Pulls newly completed responses from the backend.
+
+        Returns:
+            None
+        """
+        try:
+            completed = self.backend.collect()
+        except WebDriverException as e:
+            log.warning(f"Network capture could not read events: {e.msg}")
+            return
+        for response in completed:
+            self.responses[response.url] = response
+            if response.final_url:
+                self.responses.setdefault(response.final_url, response)
+
+    def get(self, url: str) -> Optional[CapturedResponse]:
+        """
+        Returns the captured response for a URL without pulling new events; call refresh first.
+
+        Args:
+            url (str): Requested or final URL.
+
+        Returns:
+            Optional[CapturedResponse]: The captured response, or None if the browser did not load the URL.
+        """
+        return self.responses.get(url)
+
+    def visited_origins(self) -> Set[str]:
+        """
+        Returns the origins of the HTML documents the browser loaded, pulling new events first.
+
+        Returns:
+            Set[str]: Origins such as 'https://www.pelago.com', including those of redirect targets.
+        """
+        self.refresh()
+        origins = set()
+        for response in self.responses.values():
+            if response.mime_type.startswith("text/html"):
+                for url in (response.url, response.final_url):
+                    parts = urlsplit(url)
+                    if parts.scheme in ("http", "https"):
+                        origins.add(f"{parts.scheme}://{parts.netloc}")
+        return origins
+
+    def clear(self) -> None:
+        """
+        Drops everything captured so far, including events still buffered by the backend.
+
+        Returns:
+            None
+        """
+        self.refresh()
+        self.responses.clear()
+
+
+def start_network_capture(driver: WebDriver) -> Optional[NetworkCapture]:
+    """
+    Starts capturing responses on the driver with the first supported backend and attaches it as driver.network_capture.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+
+    Returns:
+        Optional[NetworkCapture]: The capture, or None if no backend supports the driver.
+    """
+    for backend_class in BACKENDS:
+        if backend_class.is_supported(driver):
+            backend = backend_class(driver)
+            try:
+                backend.start()
+            except WebDriverException as e:
+                log.warning(f"Network capture backend {backend_class.__name__} failed to start: {e.msg}")
+                continue
+            driver.network_capture = NetworkCapture(backend)
+            log.info(f"Network capture started with {backend_class.__name__}")
+            return driver.network_capture
+    log.warning("No network capture backend supports this driver")
+    return None
+
+
+def get_network_capture(driver: WebDriver) -> Optional[NetworkCapture]:
+    """
+    Returns the capture attached to the driver.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+
+    Returns:
+        Optional[NetworkCapture]: The capture, or None if capturing was never started.
+    """
+    return getattr(driver, "network_capture", None)
@@ -0,0 +1,211 @@
+import json
+import threading
+from typing import Dict, List, Union
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.common import WebDriverException
+from Helpers import custom_logger
+from Helpers.locator_registry import Locator, registry
+from Helpers.wait_engine import JS_FIND_ALL
+
+import locators
+from Data import constant
+
+log = custom_logger.get_logger()
+
+# Overlays hidden as soon as they are attached to the DOM, before they can intercept clicks
+OVERLAY_LOCATORS: List[Locator] = [registry.resolve(locators.campaign_modal_xpath)]
+
+_SUPPRESSED_COUNTER_KEY = "__uiOverlaySuppressed"
+
+_JS_READ_AND_RESET_COUNTER = f"""
+var key = '{_SUPPRESSED_COUNTER_KEY}', count = 0;
+try {{ count = Number(sessionStorage.getItem(key) || 0); sessionStorage.removeItem(key); }}
+catch (e) {{ count = window[key] || 0; window[key] = 0; }}
+return count;
+"""
+
+_stats = {"suppressed_overlays": 0, "unprevented_interceptions": 0}
+_stats_lock = threading.Lock()
+
+
+def register_overlay_locator(locator: Union[str, Locator]) -> None:
+    """
+    Adds a locator to the list of overlays hidden on every page.
+
+    Drivers that already have suppression installed only pick it up after install_overlay_suppression is called again.
+
+    Args:
+        locator (Union[str, Locator]): Locator of the overlay container to hide.
+
+    Returns:
+        None
+    """
+    resolved = registry.resolve(locator)
+    if resolved not in OVERLAY_LOCATORS:
+        OVERLAY_LOCATORS.append(resolved)
+
+
+def _build_suppression_script() -> str:
+    """
+    Builds the self-contained suppression script for the currently registered overlays.
+
+    Returns:
+        str: JavaScript source that can run at document start or on an already loaded page.
+    """
+    overlays = json.dumps([locator.as_tuple() for locator in OVERLAY_LOCATORS])
+    return "(function (overlays) {" + JS_FIND_ALL + f"""
+    if (window.__uiOverlaySuppressionInstalled) {{ return; }}
+    window.__uiOverlaySuppressionInstalled = true;
+    var key = '{_SUPPRESSED_COUNTER_KEY}', scheduled = false;
+    function countSuppressed() {{
+        try {{ sessionStorage.setItem(key, String(Number(sessionStorage.getItem(key) || 0) + 1)); }}
+        catch (e) {{ window[key] = (window[key] || 0) + 1; }}
+    }}
+    function suppress() {{
+        scheduled = false;
+        overlays.forEach(function (overlay) {{
+            findAll(overlay[0], overlay[1]).forEach(function (node) {{
+                if (node.dataset.uiSuppressed) {{ return; }}
+                node.dataset.uiSuppressed = '1';
+                node.style.setProperty('display', 'none', 'important');
+                node.style.setProperty('pointer-events', 'none', 'important');
+                // Modals usually lock page scrolling while open
+                if (document.body) {{ document.body.style.removeProperty('overflow'); }}
+                countSuppressed();
+            }});
+        }});
+    }}
+    function schedule() {{
+        if (!scheduled) {{ scheduled = true; window.requestAnimationFrame(suppress); }}
+    }}
+    suppress();
+    new MutationObserver(schedule).observe(document, {{childList: true, subtree: true}});
+}})({overlays});
+"""
+
+
+def install_overlay_suppression(driver: WebDriver) -> None:
+    """
+    Installs overlay suppression on the driver.
+
+    On Chromium drivers the script is registered through CDP so it runs at the start of every future document of
+    the current tab; other tabs are covered by apply_overlay_suppression_to_window when they are switched to.
+    It is also applied to the current document so already open pages are covered.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+
+    Returns:
+        None
+    """
+    script = _build_suppression_script()
+    try:
+        # Every WebDriver has execute_cdp_cmd, but only Chromium sessions accept the command
+        if driver.capabilities.get("browserName") in constant.CHROMIUM_BROWSER_NAMES:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": script})
+            driver.overlay_suppression_on_new_document = True
+            driver.overlay_suppression_windows = set()
+            log.info(f"Overlay suppression registered for new documents ({len(OVERLAY_LOCATORS)} overlays)")
+        driver.execute_script(script)
+    except WebDriverException as e:
+        log.warning(f"Overlay suppression could not be installed: {e.msg}")
+
+
+def apply_overlay_suppression(driver: WebDriver) -> None:
+    """
+    Applies overlay suppression to the current document on drivers without document-start script support.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+
+    Returns:
+        None
+    """
+    if getattr(driver, "overlay_suppression_on_new_document", False):
+        return
+    try:
+        driver.execute_script(_build_suppression_script())
+    except WebDriverException as e:
+        log.warning(f"Overlay suppression could not be applied: {e.msg}")
+
+
+def apply_overlay_suppression_to_window(driver: WebDriver, handle: str) -> None:
+    """
+    Covers a tab the driver has just switched to.
+
+    The CDP document-start script only applies to the tab it was registered from, so on Chromium drivers it is
+    registered again the first time each other tab is switched to. The tab's current document is covered either way.
+    Registering twice on a tab is harmless, the script only installs itself once per document.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance, switched to the tab.
+        handle (str): Window handle of the tab.
+
+    Returns:
+        None
+    """
+    script = _build_suppression_script()
+    try:
+        windows = getattr(driver, "overlay_suppression_windows", None)
+        if getattr(driver, "overlay_suppression_on_new_document", False) and windows is not None \
+                and handle not in windows:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": script})
+            windows.add(handle)
+        driver.execute_script(script)
+    except WebDriverException as e:
+        log.warning(f"Overlay suppression could not be applied to window {handle}: {e.msg}")
+
+
+def collect_suppressed_overlays(driver: WebDriver) -> int:
+    """
+    Reads and resets the in-page count of suppressed overlays and adds it to the session total.
+
+    Call before navigating away from a page and before the driver quits.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+
+    Returns:
+        int: Number of overlays suppressed on the current page since the last collection.
+    """
+    try:
+        count = int(driver.execute_script(_JS_READ_AND_RESET_COUNTER) or 0)
+    except WebDriverException:
+        return 0
+    with _stats_lock:
+        _stats["suppressed_overlays"] += count
+    return count
+
+
+def record_unprevented_interception() -> None:
+    """
+    Counts a click that was still intercepted and had to go through the reactive popup retry.
+
+    Returns:
+        None
+    """
+    with _stats_lock:
+        _stats["unprevented_interceptions"] += 1
+
+
+def get_overlay_suppression_summary() -> Dict[str, int]:
+    """
+    Returns session totals for overlay suppression.
+
+    Returns:
+        Dict[str, int]: Suppressed overlays (prevented interceptions) and clicks that still needed the reactive retry.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def log_overlay_suppression_summary() -> None:
+    """
+    Logs session totals for overlay suppression.
+
+    Returns:
+        None
+    """
+    summary = get_overlay_suppression_summary()
+    log.info(f"Overlay suppression: {summary['suppressed_overlays']} overlays suppressed before they could intercept a click, "
+             f"{summary['unprevented_interceptions']} clicks still needed the popup retry")
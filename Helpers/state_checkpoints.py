@@ -0,0 +1,286 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.common import WebDriverException
+from Helpers import custom_logger
+from Data import constant
+
+log = custom_logger.get_logger()
+
+DEFAULT_STORE_PATH = os.path.join(os.path.abspath(__file__ + "/../../"), ".cache", "state_checkpoints.json")
+
+_JS_READ_STORAGE = """
+var read = function (storage) {
+    var items = {};
+    try { for (var i = 0; i < storage.length; i++) { items[storage.key(i)] = storage.getItem(storage.key(i)); } }
+    catch (e) {}
+    return items;
+};
+return [window.location.href, read(window.localStorage), read(window.sessionStorage)];
+"""
+
+_JS_WRITE_STORAGE = """
+var write = function (storage, items) {
+    try { storage.clear(); Object.keys(items).forEach(function (key) { storage.setItem(key, items[key]); }); }
+    catch (e) {}
+};
+write(window.localStorage, arguments[0]);
+write(window.sessionStorage, arguments[1]);
+"""
+
+
+def capture_checkpoint(driver: WebDriver) -> Optional[Dict[str, object]]:
+    """
+    Captures the browser state of the current tab: URL, cookies, localStorage and sessionStorage.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+
+    Returns:
+        Optional[Dict[str, object]]: The checkpoint, or None if the state could not be read.
+    """
+    try:
+        url, local_storage, session_storage = driver.execute_script(_JS_READ_STORAGE)
+        cookies = driver.get_cookies()
+    except WebDriverException as e:
+        log.error(f"State checkpoint could not be captured: {e.msg}")
+        return None
+    return {"url": url, "cookies": cookies, "local_storage": local_storage, "session_storage": session_storage,
+            "captured_at": time.time()}
+
+
+def is_checkpoint_fresh(checkpoint: Dict[str, object], max_age: float = constant.STATE_CHECKPOINT_MAX_AGE_SECONDS) -> bool:
+    """
+    Checks that a checkpoint is recent enough and none of its cookies has expired.
+
+    Args:
+        checkpoint (Dict[str, object]): Checkpoint returned by capture_checkpoint.
+        max_age (float, optional): Seconds a checkpoint can be restored after it was captured.
+
+    Returns:
+        bool: True if the checkpoint can be restored.
+    """
+    now = time.time()
+    return now - checkpoint["captured_at"] <= max_age and \
+        all(cookie.get("expiry", now + 1) > now for cookie in checkpoint["cookies"])
+
+
+def inject_checkpoint(driver: WebDriver, checkpoint: Dict[str, object]) -> bool:
+    """
+    Loads the checkpoint's cookies and storage into the browser, without opening the checkpoint URL.
+
+    Cookies and storage can only be set for the loaded origin, so a lightweight page of the checkpoint's origin
+    (constant.STATE_CHECKPOINT_BOOTSTRAP_PATH) is opened first. Cookies of other domains are skipped.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+        checkpoint (Dict[str, object]): Checkpoint returned by capture_checkpoint.
+
+    Returns:
+        bool: True if the state was injected, False if the browser rejected it.
+    """
+    parts = urlsplit(checkpoint["url"])
+    try:
+        driver.get(f"{parts.scheme}://{parts.netloc}{constant.STATE_CHECKPOINT_BOOTSTRAP_PATH}")
+        driver.delete_all_cookies()
+        skipped = 0
+        for cookie in checkpoint["cookies"]:
+            try:
+                driver.add_cookie(cookie)
+            except WebDriverException:
+                skipped += 1
+        driver.execute_script(_JS_WRITE_STORAGE, checkpoint["local_storage"], checkpoint["session_storage"])
+    except WebDriverException as e:
+        log.error(f"State checkpoint could not be injected: {e.msg}")
+        return False
+    if skipped:
+        log.warning(f"{skipped} of {len(checkpoint['cookies'])} checkpoint cookies were rejected by the browser")
+    return True
+
+
+class CheckpointStore:
+    """
+    Named browser-state checkpoints shared by the tests of one run through a JSON file.
+
+    The file is re-read on a miss, so a checkpoint saved by one pytest-xdist worker can be restored by another.
+    It holds session cookies, so it is only readable by its owner and the controller deletes it when the run
+    starts and finishes (see clear).
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        """
+        Initializes the store; the file is read lazily.
+
+        Args:
+            path (str, optional): Path of the JSON file. Defaults to .cache/state_checkpoints.json in the project root.
+        """
+        self.path = path
+        self._checkpoints: Dict[str, Dict[str, object]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"restored": 0, "saved": 0, "stale": 0}
+
+    def _load(self) -> Dict[str, Dict[str, object]]:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (ValueError, OSError) as e:
+            log.warning(f"Ignoring unreadable state checkpoint file {self.path}: {e}")
+            return {}
+
+    def get(self, key: str) -> Optional[Dict[str, object]]:
+        """
+        Returns a fresh checkpoint.
+
+        Args:
+            key (str): Checkpoint key, see checkpoint_key.
+
+        Returns:
+            Optional[Dict[str, object]]: The checkpoint, or None if there is none or it is stale.
+        """
+        with self._lock:
+            if key not in self._checkpoints:
+                self._checkpoints.update(self._load())
+            checkpoint = self._checkpoints.get(key)
+            if checkpoint is not None and not is_checkpoint_fresh(checkpoint):
+                self.stats["stale"] += 1
+                return None
+            return checkpoint
+
+    def put(self, key: str, checkpoint: Dict[str, object]) -> None:
+        """
+        Stores a checkpoint and writes the file (replaced atomically, merged with checkpoints of other processes).
+
+        Args:
+            key (str): Checkpoint key, see checkpoint_key.
+            checkpoint (Dict[str, object]): Checkpoint returned by capture_checkpoint.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._checkpoints = {**self._load(), **self._checkpoints, key: checkpoint}
+            self._checkpoints = {k: v for k, v in self._checkpoints.items() if is_checkpoint_fresh(v)}
+            self.stats["saved"] += 1
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temporary_path = f"{self.path}.{os.getpid()}.tmp"
+            with os.fdopen(os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w",
+                           encoding="utf-8") as file:
+                json.dump(self._checkpoints, file)
+            os.replace(temporary_path, self.path)
+
+    def clear(self) -> None:
+        """
+        Forgets every checkpoint and deletes the file, so no session cookie outlives the run.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._checkpoints = {}
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+def checkpoint_key(server: str, browser: str, name: str) -> str:
+    """
+    Builds the store key of a checkpoint; state is never shared between servers or browsers.
+
+    Args:
+        server (str): Server the tests run against, e.g. 'PROD'.
+        browser (str): Browser name, e.g. 'chrome'.
+        name (str): Checkpoint name, e.g. 'activity_page_date_selected'.
+
+    Returns:
+        str: The key, e.g. 'PROD/chrome/activity_page_date_selected'.
+    """
+    return f"{server}/{browser}/{name}"
+
+
+class StateCheckpoints:
+    """
+    Saves and restores named checkpoints for the test classes of one server and browser.
+
+    Tests that verify a UI flow run it and save checkpoints along the way; tests that only need the resulting
+    state call reach(), which restores the checkpoint and falls back to the UI flow when there is none.
+    """
+
+    def __init__(self, store: CheckpointStore, server: str, browser: str, restore: bool = True):
+        """
+        Initializes the checkpoints.
+
+        Args:
+            store (CheckpointStore): Store the checkpoints are kept in.
+            server (str): Server the tests run against, e.g. 'PROD'.
+            browser (str): Browser name, e.g. 'chrome'.
+            restore (bool, optional): Restore checkpoints; False always runs the UI flow. Defaults to True.
+        """
+        self.store = store
+        self.server = server
+        self.browser = browser
+        self.restore_enabled = restore
+
+    def save(self, name: str, page) -> bool:
+        """
+        Captures the browser state the page is in as a named checkpoint.
+
+        Args:
+            name (str): Checkpoint name, e.g. 'cart_with_one_item'.
+            page (BasePage): Page object of the driver to capture.
+
+        Returns:
+            bool: True if the checkpoint was saved.
+        """
+        checkpoint = page.capture_state()
+        if checkpoint is None:
+            return False
+        self.store.put(checkpoint_key(self.server, self.browser, name), checkpoint)
+        log.info(f"State checkpoint '{name}' saved at {checkpoint['url']}")
+        return True
+
+    def restore(self, name: str, page) -> bool:
+        """
+        Restores a named checkpoint.
+
+        Args:
+            name (str): Checkpoint name.
+            page (BasePage): Page object of the driver to restore into.
+
+        Returns:
+            bool: True if the checkpoint was restored, False if there is no fresh one or injection failed.
+        """
+        checkpoint = self.store.get(checkpoint_key(self.server, self.browser, name)) if self.restore_enabled else None
+        if checkpoint is None or not page.restore_state(checkpoint):
+            return False
+        self.store.stats["restored"] += 1
+        log.info(f"State checkpoint '{name}' restored at {checkpoint['url']}")
+        return True
+
+    def reach(self, name: str, page, build, verify=None) -> bool:
+        """
+        Brings the browser to a checkpoint: restores it, or runs the UI flow and saves it.
+
+        Args:
+            name (str): Checkpoint name.
+            page (BasePage): Page object of the driver.
+            build (Callable[[], None]): UI flow that reaches the state from the current page.
+            verify (Callable[[], bool], optional): Checks a restored state (e.g. the cart is not empty); the UI flow
+                runs if it returns False, for example when the server-side session behind the cookies expired.
+
+        Returns:
+            bool: True if the checkpoint was restored, False if the UI flow ran.
+        """
+        if self.restore(name, page):
+            if verify is None or verify():
+                return True
+            log.warning(f"Restored state checkpoint '{name}' failed verification, running the UI flow")
+        build()
+        self.save(name, page)
+        return False
@@ -0,0 +1,182 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Outcome of a step whose function returned False (the helpers' way of reporting a wait timeout)
+OUTCOME_FALSE = "false"
+
+_state = threading.local()
+
+
+def _stack() -> Optional[list]:
+    """
+    Returns the open spans of the current thread, or None when no test is being recorded.
+
+    Returns:
+        Optional[list]: Open spans, innermost last.
+    """
+    return getattr(_state, "stack", None)
+
+
+def start_recording(test_name: str) -> None:
+    """
+    Starts recording the step spans of a test on the current thread.
+
+    Args:
+        test_name (str): Node id of the test.
+
+    Returns:
+        None
+    """
+    _state.root = {"name": test_name, "locator": None, "start": time.time(), "duration": 0.0, "outcome": "passed",
+                   "children": []}
+    _state.stack = [_state.root]
+
+
+def stop_recording() -> Optional[Dict[str, object]]:
+    """
+    Stops recording and returns the span tree of the test.
+
+    Returns:
+        Optional[Dict[str, object]]: Root span whose children are the top-level steps, or None if not recording.
+    """
+    root = getattr(_state, "root", None)
+    _state.stack = None
+    _state.root = None
+    if root is not None:
+        root["duration"] = round(time.time() - root["start"], 6)
+    return root
+
+
+def timed_step(name: str, locator_argument: Optional[str] = "locator") -> Callable:
+    """
+    Decorator recording each call of a helper as a span of the current test's step tree.
+
+    Calls outside a recorded test go straight to the function. A generator function is timed over its iteration,
+    from the first item requested until it is exhausted or closed; steps run while it produces an item are
+    recorded under its span.
+
+    Args:
+        name (str): Span name, e.g. 'click' or 'wait.visible'.
+        locator_argument (Optional[str], optional): Parameter whose value is recorded as the span's locator.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(function: Callable) -> Callable:
+        parameters = list(inspect.signature(function).parameters)
+        locator_index = parameters.index(locator_argument) if locator_argument in parameters else None
+
+        def open_span(stack: list, args: tuple, kwargs: dict) -> Dict[str, object]:
+            locator = kwargs.get(locator_argument)
+            if locator is None and locator_index is not None and locator_index < len(args):
+                locator = args[locator_index]
+            span = {"name": name, "locator": None if locator is None else str(locator), "start": time.time(),
+                    "duration": 0.0, "outcome": "passed", "children": []}
+            stack[-1]["children"].append(span)
+            return span
+
+        if inspect.isgeneratorfunction(function):
+            @functools.wraps(function)
+            def generator_wrapper(*args, **kwargs):
+                stack = _stack()
+                if stack is None:
+                    return (yield from function(*args, **kwargs))
+                span = open_span(stack, args, kwargs)
+                start_time = time.perf_counter()
+                generator = function(*args, **kwargs)
+                try:
+                    while True:
+                        # The span is only open while the generator runs, so the caller's steps between
+                        # items are not recorded under it
+                        stack.append(span)
+                        try:
+                            item = next(generator)
+                        except StopIteration as stop:
+                            return stop.value
+                        finally:
+                            stack.pop()
+                        yield item
+                except GeneratorExit:
+                    generator.close()
+                    raise
+                except BaseException as e:
+                    span["outcome"] = f"error: {type(e).__name__}"
+                    raise
+                finally:
+                    span["duration"] = round(time.perf_counter() - start_time, 6)
+            return generator_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            stack = _stack()
+            if stack is None:
+                return function(*args, **kwargs)
+            span = open_span(stack, args, kwargs)
+            stack.append(span)
+            start_time = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+                if result is False:
+                    span["outcome"] = OUTCOME_FALSE
+                return result
+            except BaseException as e:
+                span["outcome"] = f"error: {type(e).__name__}"
+                raise
+            finally:
+                span["duration"] = round(time.perf_counter() - start_time, 6)
+                stack.pop()
+        return wrapper
+    return decorator
+
+
+def to_chrome_trace(trees: List[Dict[str, object]]) -> Dict[str, object]:
+    """
+    Converts span trees to the Chrome trace event format (chrome://tracing, Perfetto).
+
+    Args:
+        trees (List[Dict[str, object]]): Root spans returned by stop_recording, each with a 'worker' key.
+
+    Returns:
+        Dict[str, object]: Trace with one complete ('X') event per span; one process per worker, one track per test.
+    """
+    events = []
+    worker_ids: Dict[str, int] = {}
+
+    def add(span: Dict[str, object], worker: int, track: int) -> None:
+        events.append({"name": span["name"], "cat": "step", "ph": "X", "pid": worker, "tid": track,
+                       "ts": round(span["start"] * 1_000_000), "dur": round(span["duration"] * 1_000_000),
+                       "args": {"locator": span["locator"], "outcome": span["outcome"]}})
+        for child in span["children"]:
+            add(child, worker, track)
+
+    for track, tree in enumerate(trees):
+        worker = tree.get("worker", "main")
+        if worker not in worker_ids:
+            worker_ids[worker] = len(worker_ids)
+            events.append({"name": "process_name", "ph": "M", "pid": worker_ids[worker], "args": {"name": worker}})
+        events.append({"name": "thread_name", "ph": "M", "pid": worker_ids[worker], "tid": track,
+                       "args": {"name": tree["name"]}})
+        add(tree, worker_ids[worker], track)
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export_spans(trees: List[Dict[str, object]], path: str, trace_format: str = "chrome") -> None:
+    """
+    Writes span trees to a file.
+
+    Args:
+        trees (List[Dict[str, object]]): Root spans returned by stop_recording.
+        path (str): Output file path.
+        trace_format (str, optional): 'chrome' for the Chrome trace format, 'json' for the raw span trees.
+
+    Returns:
+        None
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(to_chrome_trace(trees) if trace_format == "chrome" else trees, file)
@@ -0,0 +1,247 @@
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Union
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.wait import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common import TimeoutException, WebDriverException
+from Helpers import custom_logger
+from Helpers.locator_registry import Locator, registry
+
+log = custom_logger.get_logger()
+
+# Set UI_WAIT_ENGINE=polling to force the plain WebDriverWait engine
+EVENT_DRIVEN_WAITS = os.getenv("UI_WAIT_ENGINE", "event").lower() != "polling"
+
+# Poll interval used by WebDriverWait, used to estimate the latency the event engine avoids
+WEBDRIVER_WAIT_POLL_FREQUENCY = 0.5
+
+# In-browser helper that returns every node matching a (by, value) locator pair
+JS_FIND_ALL = """
+function findAll(by, value) {
+    if (by === 'xpath') {
+        var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+        return nodes;
+    }
+    if (by === 'id') { var node = document.getElementById(value); return node ? [node] : []; }
+    return Array.prototype.slice.call(document.querySelectorAll(value));
+}
+"""
+
+# Resolves as soon as a node satisfies the condition, re-checking on DOM mutations and on every animation frame
+_JS_WAIT_FOR_CONDITION = JS_FIND_ALL + """
+var by = arguments[0], value = arguments[1], target = arguments[2], condition = arguments[3];
+var deadline = Date.now() + arguments[4];
+var done = arguments[arguments.length - 1];
+var started = performance.now(), finished = false, initial = true, observer = null;
+
+function isVisible(node) {
+    if (!node.isConnected || node.getClientRects().length === 0) { return false; }
+    var style = window.getComputedStyle(node);
+    return style.visibility !== 'hidden' && style.display !== 'none' && parseFloat(style.opacity) !== 0;
+}
+function matches(node) {
+    if (condition === 'present') { return node.isConnected; }
+    if (condition === 'visible') { return isVisible(node); }
+    return isVisible(node) && !node.disabled;
+}
+function candidates() { return target ? [target] : findAll(by, value); }
+function finish(node) {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    // A match on the very first check would have been found by the first WebDriverWait poll too
+    done({element: node, elapsed: initial ? 0 : (performance.now() - started) / 1000});
+}
+function check() {
+    if (finished) { return; }
+    var nodes = candidates();
+    for (var i = 0; i < nodes.length; i++) { if (matches(nodes[i])) { finish(nodes[i]); return; } }
+    if (Date.now() >= deadline) { finish(null); }
+}
+function onFrame() { check(); if (!finished) { window.requestAnimationFrame(onFrame); } }
+
+check();
+initial = false;
+if (!finished) {
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+    window.requestAnimationFrame(onFrame);
+    // Animation frames are throttled in background tabs, so keep a coarse timer as a safety net
+    (function tick() { check(); if (!finished) { setTimeout(tick, 100); } })();
+}
+"""
+
+_EXPECTED_CONDITIONS = {
+    "present": (EC.presence_of_element_located, None),
+    "visible": (EC.visibility_of_element_located, EC.visibility_of),
+    "clickable": (EC.element_to_be_clickable, EC.element_to_be_clickable),
+}
+
+_wait_metrics: List[Dict[str, object]] = []
+_wait_metrics_lock = threading.Lock()
+
+
+@contextmanager
+def script_timeout(driver: WebDriver, seconds: float):
+    """
+    Temporarily raises the async script timeout of the driver.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+        seconds (float): Script timeout to apply inside the block.
+    """
+    previous_script_timeout = driver.timeouts.script
+    driver.set_script_timeout(seconds)
+    try:
+        yield
+    finally:
+        driver.set_script_timeout(previous_script_timeout)
+
+
+def _record_wait(condition: str, locator: str, engine: str, elapsed: float, outcome: str, in_browser_elapsed: float = 0.0) -> None:
+    """
+    Stores the latency of a single wait call.
+
+    Args:
+        condition (str): Wait condition ('present', 'visible' or 'clickable').
+        locator (str): Locator waited on, or 'element' for element waits.
+        engine (str): Engine that resolved the wait ('event' or 'polling').
+        elapsed (float): Wall-clock duration of the wait call in seconds.
+        outcome (str): 'found' or 'timeout'.
+        in_browser_elapsed (float, optional): Time the event engine waited inside the browser. Defaults to 0.
+    """
+    # WebDriverWait only notices a match on its next poll, so it would have returned at the next multiple of the poll frequency
+    polling_equivalent = math.ceil(in_browser_elapsed / WEBDRIVER_WAIT_POLL_FREQUENCY) * WEBDRIVER_WAIT_POLL_FREQUENCY
+    saved = polling_equivalent - in_browser_elapsed if engine == "event" and outcome == "found" else 0.0
+    with _wait_metrics_lock:
+        _wait_metrics.append({"condition": condition, "locator": locator, "engine": engine,
+                              "elapsed": elapsed, "estimated_saving": saved, "outcome": outcome})
+
+
+def _wait_event_driven(driver: WebDriver, condition: str, locator: Optional[Locator], element: Optional[WebElement],
+                       timeout: float) -> tuple:
+    """
+    Waits for the condition inside the browser via a MutationObserver injected with execute_async_script.
+
+    Returns:
+        tuple: (matching element or None on timeout, seconds spent waiting inside the browser).
+
+    Raises:
+        WebDriverException: If the script cannot be run (e.g., page navigation while waiting).
+    """
+    by, value = locator.as_tuple() if locator else (None, None)
+    with script_timeout(driver, timeout + 5):
+        result = driver.execute_async_script(_JS_WAIT_FOR_CONDITION, by, value, element, condition, timeout * 1000)
+    return (result["element"], result["elapsed"]) if result else (None, 0.0)
+
+
+def _wait_polling(driver: WebDriver, condition: str, locator: Optional[Locator], element: Optional[WebElement],
+                  timeout: float) -> WebElement:
+    """
+    Waits for the condition with WebDriverWait polling.
+
+    Returns:
+        WebElement: The matching element.
+
+    Raises:
+        TimeoutException: If the condition is not met within the timeout.
+    """
+    locator_condition, element_condition = _EXPECTED_CONDITIONS[condition]
+    if locator:
+        return WebDriverWait(driver, timeout).until(locator_condition(locator.as_tuple()))
+    if element_condition is None:
+        return element
+    WebDriverWait(driver, timeout).until(element_condition(element))
+    return element
+
+
+def wait_for_condition(driver: WebDriver, condition: str, locator: Union[str, Locator] = None, element: WebElement = None,
+                       timeout: float = 30) -> WebElement:
+    """
+    Waits until a locator or element satisfies the condition, resolving as soon as the DOM changes.
+
+    The event-driven engine is used first. If it cannot run (script errors, navigation during the wait),
+    the remaining time is spent polling with WebDriverWait. Every call records its latency.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance.
+        condition (str): One of 'present', 'visible' or 'clickable'.
+        locator (Union[str, Locator], optional): The locator to wait on. Either locator or element must be provided.
+        element (WebElement, optional): The web element to wait on.
+        timeout (float, optional): Maximum time to wait in seconds. Defaults to 30.
+
+    Returns:
+        WebElement: The element satisfying the condition.
+
+    Raises:
+        TimeoutException: If the condition is not met within the timeout.
+    """
+    if condition not in _EXPECTED_CONDITIONS:
+        raise ValueError(f"Invalid wait condition: {condition}. Valid conditions: {list(_EXPECTED_CONDITIONS)}")
+    resolved = registry.resolve(locator) if locator else None
+    label = resolved.value if resolved else "element"
+    start_time = time.perf_counter()
+    engine = "event" if EVENT_DRIVEN_WAITS else "polling"
+    found, in_browser_elapsed = None, 0.0
+    if engine == "event":
+        try:
+            found, in_browser_elapsed = _wait_event_driven(driver, condition, resolved, element, timeout)
+        except WebDriverException as e:
+            log.warning(f"Event-driven wait unavailable for '{label}', falling back to polling: {e.msg}")
+            engine = "polling"
+        else:
+            if found is None:
+                _record_wait(condition, label, engine, time.perf_counter() - start_time, "timeout")
+                raise TimeoutException(f"'{label}' not {condition} within {timeout} seconds")
+    if engine == "polling":
+        remaining = max(timeout - (time.perf_counter() - start_time), 0)
+        try:
+            found = _wait_polling(driver, condition, resolved, element, remaining)
+        except TimeoutException:
+            _record_wait(condition, label, engine, time.perf_counter() - start_time, "timeout")
+            raise
+    _record_wait(condition, label, engine, time.perf_counter() - start_time, "found", in_browser_elapsed)
+    return found
+
+
+def get_wait_latency_summary() -> Dict[str, Dict[str, float]]:
+    """
+    Summarises recorded wait latencies per engine.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Per engine: calls, timeouts, total and mean latency, and the
+            estimated time saved versus 0.5s WebDriverWait polling.
+    """
+    with _wait_metrics_lock:
+        metrics = list(_wait_metrics)
+    summary = {}
+    for metric in metrics:
+        engine_summary = summary.setdefault(metric["engine"], {"calls": 0, "timeouts": 0, "total_elapsed": 0.0,
+                                                              "estimated_saving": 0.0})
+        engine_summary["calls"] += 1
+        engine_summary["timeouts"] += metric["outcome"] == "timeout"
+        engine_summary["total_elapsed"] += metric["elapsed"]
+        engine_summary["estimated_saving"] += metric["estimated_saving"]
+    for engine_summary in summary.values():
+        engine_summary["mean_elapsed"] = engine_summary["total_elapsed"] / engine_summary["calls"]
+    return summary
+
+
+def log_wait_latency_summary() -> None:
+    """
+    Logs the per-engine wait latency summary.
+
+    Returns:
+        None
+    """
+    for engine, engine_summary in get_wait_latency_summary().items():
+        log.info(f"Wait engine '{engine}': {engine_summary['calls']} calls, {engine_summary['timeouts']} timeouts, "
+                 f"mean {engine_summary['mean_elapsed']:.3f}s, total {engine_summary['total_elapsed']:.2f}s, "
+                 f"estimated saving vs polling {engine_summary['estimated_saving']:.2f}s")
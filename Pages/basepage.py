@@ -1,8 +1,27 @@
+import inspect
+from Helpers import overlay_suppression, driver_helpers, custom_logger, state_checkpoints
+from Helpers.step_timing import timed_step
+
+log = custom_logger.get_logger()
+
 
 class BasePage:
     """
     Base page class providing common functionality for all page objects.
+
+    Public methods of BasePage and its subclasses are recorded as steps of the running test (see
+    Helpers.step_timing).
     """
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Wraps the public methods a page subclass defines in timed steps named '<Page>.<method>'.
+
+        Args:
+            **kwargs: Passed on to object.__init_subclass__.
+        """
+        super().__init_subclass__(**kwargs)
+        _time_public_methods(cls)
     
     def __init__(self, driver):
         """
@@ -13,6 +32,7 @@ class BasePage:
         """
         self.driver = driver
 
+    @timed_step("page.reload", locator_argument=None)
     def reload_page(self):
         """
         Reloads the current page.
@@ -22,9 +42,10 @@ class BasePage:
         """
         self.driver.refresh()
 
+    @timed_step("page.open", locator_argument="url")
     def open_page(self, url):
         """
-        Navigates to the specified URL.
+        Navigates to the specified URL with overlay suppression applied.
         
         Args:
             url (str): The URL to navigate to.
@@ -32,13 +53,140 @@ class BasePage:
         Returns:
             None
         """
+        overlay_suppression.collect_suppressed_overlays(self.driver)
         self.driver.get(url)
+        overlay_suppression.apply_overlay_suppression(self.driver)
+
+    def capture_state(self):
+        """
+        Captures the URL, cookies and storage of the current tab so a test can later resume from this point.
+
+        Returns:
+            dict: The checkpoint, or None if the state could not be read.
+        """
+        return state_checkpoints.capture_checkpoint(self.driver)
+
+    def restore_state(self, checkpoint):
+        """
+        Restores a checkpoint captured by capture_state: injects its cookies and storage, then opens its URL.
+
+        Args:
+            checkpoint (dict): Checkpoint returned by capture_state.
+
+        Returns:
+            bool: True if the page was opened with the restored state.
+        """
+        if not state_checkpoints.inject_checkpoint(self.driver, checkpoint):
+            return False
+        self.open_page(checkpoint["url"])
+        return True
 
     def switch_to_newest_tab(self):
         """
-        Switches focus to the newest opened browser tab.
+        Switches focus to the newest opened browser tab and applies overlay suppression to it.
         
         Returns:
             None
         """
-        self.driver.switch_to.window(self.driver.window_handles[-1])
+        overlay_suppression.collect_suppressed_overlays(self.driver)
+        handle = self.driver.window_handles[-1]
+        self.driver.switch_to.window(handle)
+        overlay_suppression.apply_overlay_suppression_to_window(self.driver, handle)
+
+    def _page_snapshot_key(self, name):
+        """
+        Builds the key of a snapshot of the currently loaded page.
+
+        Args:
+            name (str): Name of the snapshot.
+
+        Returns:
+            tuple: (name, URL, document time origin); the time origin is None if the page cannot be read.
+        """
+        url, time_origin = driver_helpers.get_page_load_id(self.driver)
+        if not hasattr(self.driver, "page_snapshots"):
+            self.driver.page_snapshots = {}
+        return name, url, time_origin
+
+    def _store_page_snapshot(self, key, snapshot):
+        """
+        Stores a snapshot for the page load in the key and drops snapshots of earlier page loads.
+
+        Args:
+            key (tuple): Key returned by _page_snapshot_key.
+            snapshot (object): The harvested data.
+
+        Returns:
+            None
+        """
+        if key[2] is None:
+            return
+        # Only the current page load can be hit again
+        self.driver.page_snapshots = {k: v for k, v in self.driver.page_snapshots.items() if k[1:] == key[1:]}
+        self.driver.page_snapshots[key] = snapshot
+
+    def get_page_snapshot(self, name, build):
+        """
+        Returns data harvested from the currently loaded page, building it only once per page load.
+
+        Snapshots are stored on the driver, so page objects sharing a driver share them. Navigating or
+        reloading changes the page load id and makes older snapshots unreachable.
+
+        Args:
+            name (str): Name of the snapshot (e.g., 'famous_destinations').
+            build (Callable[[], object]): Harvests the data from the page when no snapshot exists.
+
+        Returns:
+            object: The snapshot.
+        """
+        key = self._page_snapshot_key(name)
+        if key[2] is not None and key in self.driver.page_snapshots:
+            log.info(f"Using '{name}' snapshot of {key[1]}")
+            return self.driver.page_snapshots[key]
+        snapshot = build()
+        self._store_page_snapshot(key, snapshot)
+        return snapshot
+
+    def iter_page_snapshot(self, name, generate):
+        """
+        Streaming form of get_page_snapshot: yields items as they are harvested, or from the snapshot if one exists.
+
+        The snapshot is stored only once the generator has been consumed to the end.
+
+        Args:
+            name (str): Name of the snapshot (e.g., 'famous_destinations').
+            generate (Callable[[], Iterator]): Harvests the items from the page when no snapshot exists.
+
+        Yields:
+            object: The harvested items, in order.
+        """
+        key = self._page_snapshot_key(name)
+        if key[2] is not None and key in self.driver.page_snapshots:
+            log.info(f"Using '{name}' snapshot of {key[1]}")
+            yield from self.driver.page_snapshots[key]
+            return
+        items = []
+        for item in generate():
+            items.append(item)
+            yield item
+        self._store_page_snapshot(key, items)
+
+
+def _time_public_methods(cls):
+    """
+    Wraps the public methods a page class defines in timed steps named '<Page>.<method>'.
+
+    Generator methods are timed over their iteration. Methods already decorated with timed_step keep their span.
+
+    Args:
+        cls (type): BasePage or a subclass.
+
+    Returns:
+        None
+    """
+    for name, member in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.isfunction(member) and not hasattr(member, "__wrapped__"):
+            setattr(cls, name, timed_step(f"{cls.__name__}.{name}", locator_argument=None)(member))
+
+
+_time_public_methods(BasePage)
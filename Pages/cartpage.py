@@ -38,6 +38,21 @@ class CartPage(BasePage):
         """
         driver_helpers.click_element(self.driver, locators.button_explore_activities_xpath, timeout=10)
 
+    def has_cart_items(self, timeout=5):
+        """
+        Checks if the cart lists at least one item.
+
+        Args:
+            timeout (int, optional): Maximum time to wait for an item price in seconds. Default is 5.
+
+        Returns:
+            bool: True if a cart item is shown, False otherwise.
+        """
+        if driver_helpers.wait_till_element_is_present(self.driver, locators.price_per_cart_item_xpath, timeout=timeout):
+            return True
+        log.info("Cart has no items")
+        return False
+
     def get_price_of_cart_item(self):
         """
         Retrieves the price of an item in the cart.
@@ -27,6 +27,52 @@ class Homepage(BasePage):
         log.info(f"famous destinations found: {len(famous_destinations)}")
         return famous_destinations
 
+    # Cards read on every destination chip: group name -> (locator, field that must be non-empty)
+    FAMOUS_DESTINATION_CARD_GROUPS = {
+        "links": (locators.famous_destinations_link_under_each_title_xpath, "href"),
+        "images": (locators.famous_destinations_image_under_each_title_xpath, "src"),
+    }
+
+    # currentSrc is the URL the browser picked and loaded (from srcset or <picture> sources), src the fallback
+    FAMOUS_DESTINATION_CARD_FIELDS = ("href", "src", "currentSrc", "alt", "title")
+
+    def harvest_famous_destinations(self):
+        """
+        Clicks every famous destination chip once and reads href, src, currentSrc, alt and title of each card link
+        and image.
+
+        The result is cached for the current page load, so later calls on the same page do not click the chips again.
+
+        Returns:
+            list: One dict per chip with 'chip' (chip text), 'links' and 'images' (lists of field dicts).
+        """
+        return list(self.iter_famous_destinations())
+
+    def iter_famous_destinations(self):
+        """
+        Streaming form of harvest_famous_destinations: yields each chip's cards as soon as the chip is processed.
+
+        Yields:
+            dict: 'chip' (chip text), 'links' and 'images' (lists of field dicts).
+        """
+        return self.iter_page_snapshot("famous_destinations", self._traverse_famous_destinations)
+
+    def _traverse_famous_destinations(self):
+        """
+        Performs the chip traversal behind iter_famous_destinations.
+
+        Yields:
+            dict: 'chip' (chip text), 'links' and 'images' (lists of field dicts).
+        """
+        famous_destinations = self.get_famous_destinations_elements()
+        for destination in famous_destinations:
+            driver_helpers.click_element(self.driver, element=destination, timeout=10)
+            cards = driver_helpers.get_elements_fields(
+                self.driver, self.FAMOUS_DESTINATION_CARD_GROUPS, self.FAMOUS_DESTINATION_CARD_FIELDS)
+            chip = destination.text
+            log.info(f"{chip}: {len(cards['links'])} links, {len(cards['images'])} images found")
+            yield {"chip": chip, **cards}
+
     def get_famous_destination_tile_links(self):
         """
         Extracts all links from famous destination tiles.
@@ -34,17 +80,18 @@ class Homepage(BasePage):
         Returns:
             list: List of URLs from famous destination tiles.
         """
-        total_links = []
-        famous_destinations = self.get_famous_destinations_elements()
-        for destination in famous_destinations:
-            driver_helpers.click_element(self.driver, element=destination, timeout=10)
-            links = driver_helpers.get_all_elements(self.driver, locators.famous_destinations_link_under_each_title_xpath)
-            log.info(f"links found: {len(links)}")
-            for link_element in links:
-                link = driver_helpers.get_element_attribute_value(driver=self.driver, element=link_element, attribute_name="href")
-                total_links.append(link)
-        log.info(f"total links: {total_links}")
-        return total_links
+        return list(self.stream_famous_destination_tile_links())
+
+    def stream_famous_destination_tile_links(self):
+        """
+        Yields the famous destination tile links chip by chip, so they can be validated while the next chip loads.
+
+        Yields:
+            str: URL of a famous destination tile.
+        """
+        for chip in self.iter_famous_destinations():
+            for card in chip["links"]:
+                yield card["href"]
 
     def get_famous_destination_images(self):
         """
@@ -53,17 +100,19 @@ class Homepage(BasePage):
         Returns:
             list: List of image URLs from famous destination tiles.
         """
-        images_links = []
-        famous_destinations = self.get_famous_destinations_elements()
-        for destination in famous_destinations:
-            driver_helpers.click_element(self.driver, element=destination, timeout=10)
-            img_elements = driver_helpers.get_all_elements(self.driver, locators.famous_destinations_image_under_each_title_xpath)
-            log.info(f"Images found: {len(img_elements)}")
-            for img_element in img_elements:
-                image_url = driver_helpers.get_element_attribute_value(driver=self.driver, element=img_element, attribute_name="src")
-                images_links.append(image_url)
-        log.info(f"images links: {images_links}")
-        return images_links
+        return list(self.stream_famous_destination_images())
+
+    def stream_famous_destination_images(self):
+        """
+        Yields the famous destination image URLs chip by chip, so they can be validated while the next chip loads.
+
+        Yields:
+            str: Image URL of a famous destination tile: the one the browser loaded (currentSrc), or src if the
+                image was not loaded.
+        """
+        for chip in self.iter_famous_destinations():
+            for card in chip["images"]:
+                yield card.get("currentSrc") or card["src"]
 
     def get_ongoing_deals_elements(self):
         """
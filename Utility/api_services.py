@@ -1,11 +1,431 @@
+import random
 import requests
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from itertools import zip_longest
+from requests.adapters import HTTPAdapter
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
 from Helpers import custom_logger
+from Utility.url_cache import UrlResultCache, canonicalize_url, ttl_for_status
+from Utility import http_metrics
+from Data import constant
 import time
 
 log = custom_logger.get_logger()
 
+DEFAULT_HEADERS = {'User-Agent': 'UIAutomation-PelagoWebsite/1.0'}
 
-def return_status_code_of_url(api_url: str, method_name: str, timeout: int = 30) -> int:
+# Status codes servers use to reject HEAD, answered by retrying with a streamed GET
+HEAD_REJECTED_STATUS_CODES = (403, 405, 501)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request when the circuit breaker of the host is open.
+    """
+
+    def __init__(self, host: str, retry_in: float):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f"Circuit open for host {host}: request not sent (next trial in {round(retry_in, 1)}s)")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting the request rate to one host.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initializes a full bucket.
+
+        Args:
+            rate (float): Tokens added per second (sustained requests per second).
+            capacity (int): Maximum tokens (burst size).
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes one token, sleeping until one is available.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker: opens after consecutive failures, then lets a single trial request through
+    once the reset timeout has passed.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """
+        Initializes a closed breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit.
+            reset_timeout (float): Seconds the circuit stays open before a trial request is allowed.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> Tuple[Optional[float], bool]:
+        """
+        Tells whether a request may be sent.
+
+        Returns:
+            Tuple[Optional[float], bool]: (None if the request may be sent, otherwise seconds until the next trial;
+                True if the request is the single trial of a half-open circuit).
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return None, False
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed >= self.reset_timeout and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return None, True
+            return max(self.reset_timeout - elapsed, 0.0), False
+
+    def record(self, success: bool, trial: bool = False) -> bool:
+        """
+        Records the outcome of a request.
+
+        Args:
+            success (bool): False for 5xx responses and connection errors.
+            trial (bool, optional): True for the trial request let through by allow. Only its outcome lets the
+                next trial through; requests sent before the circuit opened can still finish. Defaults to False.
+
+        Returns:
+            bool: True if this outcome tripped the circuit open.
+        """
+        with self._lock:
+            if trial:
+                self._trial_in_flight = False
+            if success:
+                self._failures, self._opened_at = 0, None
+                return False
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                tripped = self._opened_at is None or time.monotonic() - self._opened_at >= self.reset_timeout
+                self._opened_at = time.monotonic()
+                return tripped
+            return False
+
+    def abandon_trial(self) -> None:
+        """
+        Lets another trial through after the trial request ended without an outcome (e.g. an invalid URL).
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class HostResilience:
+    """
+    Rate limiting, retry with jittered exponential backoff and circuit breaking, applied per host.
+    """
+
+    def __init__(self, rate_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+                 max_attempts: int = constant.HTTP_RETRY_MAX_ATTEMPTS, base_delay: float = constant.HTTP_RETRY_BASE_DELAY,
+                 max_delay: float = constant.HTTP_RETRY_MAX_DELAY,
+                 failure_threshold: int = constant.HTTP_CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = constant.HTTP_CIRCUIT_RESET_TIMEOUT):
+        """
+        Initializes the policy; buckets and breakers are created per host on first use.
+
+        Args:
+            rate_limits (Optional[Dict[str, Tuple[float, int]]], optional): Host -> (requests per second, burst).
+                The 'default' entry applies to other hosts. Defaults to constant.HTTP_HOST_RATE_LIMITS.
+            max_attempts (int, optional): Attempts per request, including the first one.
+            base_delay (float, optional): Backoff base in seconds; attempt n waits up to base_delay * 2**(n-1).
+            max_delay (float, optional): Upper bound of a single backoff in seconds.
+            failure_threshold (int, optional): Consecutive failed requests that open a host's circuit.
+            reset_timeout (float, optional): Seconds an open circuit waits before letting a trial request through.
+        """
+        self.rate_limits = constant.HTTP_HOST_RATE_LIMITS if rate_limits is None else rate_limits
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, float]] = defaultdict(lambda: {"retries": 0, "fast_failed": 0, "trips": 0,
+                                                                       "rate_limited_wait": 0.0})
+
+    def _for_host(self, host: str) -> Tuple[TokenBucket, CircuitBreaker]:
+        with self._lock:
+            if host not in self._buckets:
+                rate, burst = self.rate_limits.get(host, self.rate_limits["default"])
+                self._buckets[host] = TokenBucket(rate, burst)
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._buckets[host], self._breakers[host]
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns the full-jitter backoff before the given retry.
+
+        Args:
+            attempt (int): Number of the attempt that just failed, starting at 1.
+
+        Returns:
+            float: Seconds to sleep.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def execute(self, url: str, send, method: str = "get", deadline_at: Optional[float] = None) -> requests.Response:
+        """
+        Sends a request through the host's rate limiter, circuit breaker and retry schedule.
+
+        5xx responses and connection errors/timeouts are retried; the last 5xx response is returned and the
+        last exception is re-raised once attempts are exhausted or the deadline leaves no time for the next
+        attempt. A 501 answer to HEAD means the server does not implement HEAD: it is returned at once and not
+        counted as a failure, so the caller can fall back to GET.
+
+        Args:
+            url (str): Request URL, used to pick the host.
+            send (Callable[[], requests.Response]): Sends the request once.
+            method (str, optional): HTTP method of the request. Defaults to 'get'.
+            deadline_at (Optional[float], optional): time.monotonic() value after which no retry is started.
+                Defaults to None (no deadline).
+
+        Returns:
+            requests.Response: The final response.
+
+        Raises:
+            CircuitOpenError: If the host's circuit is open.
+        """
+        host = urlsplit(url).netloc
+        bucket, breaker = self._for_host(host)
+        for attempt in range(1, self.max_attempts + 1):
+            retry_in, trial = breaker.allow()
+            if retry_in is not None:
+                with self._lock:
+                    self.stats[host]["fast_failed"] += 1
+                raise CircuitOpenError(host, retry_in)
+            waited = bucket.acquire()
+            with self._lock:
+                self.stats[host]["rate_limited_wait"] += waited
+            delay = self.backoff(attempt)
+            try:
+                response = send()
+                failed = response.status_code >= 500 and not (method.lower() == "head" and response.status_code == 501)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if breaker.record(False, trial):
+                    self._log_trip(host)
+                if self._is_last_attempt(attempt, deadline_at, delay):
+                    raise
+            except Exception:
+                if trial:
+                    breaker.abandon_trial()
+                raise
+            else:
+                if breaker.record(not failed, trial):
+                    self._log_trip(host)
+                if not failed or self._is_last_attempt(attempt, deadline_at, delay):
+                    return response
+                response.close()
+            with self._lock:
+                self.stats[host]["retries"] += 1
+            log.warning(f"Retrying {url} in {round(delay, 2)}s (attempt {attempt + 1}/{self.max_attempts})")
+            time.sleep(delay)
+
+    def _is_last_attempt(self, attempt: int, deadline_at: Optional[float], delay: float) -> bool:
+        # No retry if the backoff before it would end past the deadline
+        return attempt >= self.max_attempts or (deadline_at is not None and time.monotonic() + delay >= deadline_at)
+
+    def _log_trip(self, host: str) -> None:
+        with self._lock:
+            self.stats[host]["trips"] += 1
+        log.error(f"Circuit opened for host {host} after {self.failure_threshold} consecutive failures")
+
+    def log_stats(self) -> None:
+        """
+        Logs per-host retry, circuit breaker and rate limiting statistics.
+
+        Returns:
+            None
+        """
+        for host, host_stats in self.stats.items():
+            log.info(f"HTTP resilience {host}: {host_stats['retries']} retries, {host_stats['trips']} circuit trips, "
+                     f"{host_stats['fast_failed']} fast-failed requests, "
+                     f"{round(host_stats['rate_limited_wait'], 2)}s rate limited")
+
+
+class HttpClient:
+    """
+    Thread-safe HTTP client that keeps TCP/TLS connections alive and reuses them across requests.
+
+    One requests.Session is shared by all threads; urllib3 connection pools are thread-safe and cookies are
+    not needed for status checks. Hosts listed in `host_pool_sizes` get their own, larger pool.
+    """
+
+    def __init__(self, pool_maxsize: int = 10, host_pool_sizes: Optional[Dict[str, int]] = None,
+                 headers: Optional[Dict[str, str]] = None, resilience: Optional[HostResilience] = None):
+        """
+        Initializes the client and mounts the connection pools.
+
+        Args:
+            pool_maxsize (int, optional): Connections kept alive per host by default. Defaults to 10.
+            host_pool_sizes (Optional[Dict[str, int]], optional): Base URL (scheme://host) -> connections kept alive
+                for that host. Defaults to constant.HTTP_HOST_POOL_SIZES.
+            headers (Optional[Dict[str, str]], optional): Headers sent with every request. Defaults to DEFAULT_HEADERS.
+            resilience (Optional[HostResilience], optional): Per-host rate limiting, retries and circuit breaking
+                applied to every request. Defaults to None (requests are sent once, unthrottled).
+        """
+        self.resilience = resilience
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        default_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", default_adapter)
+        self.session.mount("https://", default_adapter)
+        host_pool_sizes = constant.HTTP_HOST_POOL_SIZES if host_pool_sizes is None else host_pool_sizes
+        for base_url, size in host_pool_sizes.items():
+            self.session.mount(base_url, HTTPAdapter(pool_connections=1, pool_maxsize=size))
+
+    def request(self, method: str, url: str, timeout: int = 30, deadline_at: Optional[float] = None,
+                **kwargs) -> requests.Response:
+        """
+        Sends a request over a pooled connection, through the resilience policy if one is set.
+
+        Every attempt is recorded in http_metrics.registry under its host and the current page section.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            timeout (int, optional): Request timeout in seconds. Defaults to 30.
+            deadline_at (Optional[float], optional): time.monotonic() value bounding every attempt's timeout and
+                after which no retry is started. Defaults to None (no deadline).
+            **kwargs: Passed through to requests.Session.request.
+
+        Returns:
+            requests.Response: The response.
+
+        Raises:
+            CircuitOpenError: If the host's circuit breaker is open.
+        """
+        def send() -> requests.Response:
+            start_time = time.perf_counter()
+            host = urlsplit(url).netloc
+            attempt_timeout = timeout if deadline_at is None else max(min(timeout, deadline_at - time.monotonic()), 0.1)
+            try:
+                response = self.session.request(method=method, url=url, timeout=attempt_timeout, **kwargs)
+            except Exception:
+                http_metrics.registry.record_request(host, time.perf_counter() - start_time, error=True)
+                raise
+            bytes_received = 0 if kwargs.get("stream") else len(response.content)
+            http_metrics.registry.record_request(host, time.perf_counter() - start_time,
+                                                 ttfb=response.elapsed.total_seconds(), bytes_received=bytes_received)
+            return response
+
+        return self.resilience.execute(url, send, method, deadline_at) if self.resilience else send()
+
+    def get_connection_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns per-host connection reuse statistics read from the urllib3 connection pools.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Host -> requests sent, connections opened (TCP/TLS handshakes)
+                and requests served over an already open connection.
+        """
+        stats: Dict[str, Dict[str, int]] = {}
+        for adapter in {id(adapter): adapter for adapter in self.session.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for pool_key in pools.keys():
+                pool = pools.get(pool_key)
+                if pool is None:
+                    continue
+                host_stats = stats.setdefault(f"{pool_key.key_host}:{pool_key.key_port}", {"requests": 0, "connections": 0})
+                host_stats["requests"] += pool.num_requests
+                host_stats["connections"] += pool.num_connections
+        for host_stats in stats.values():
+            host_stats["reused"] = max(host_stats["requests"] - host_stats["connections"], 0)
+        return stats
+
+    def log_connection_stats(self) -> None:
+        """
+        Logs per-host connection reuse statistics.
+
+        Returns:
+            None
+        """
+        for host, stats in self.get_connection_stats().items():
+            log.info(f"HTTP pool {host}: {stats['requests']} requests over {stats['connections']} connections "
+                     f"({stats['reused']} reused)")
+
+    def close(self) -> None:
+        """
+        Closes every pooled connection.
+
+        Returns:
+            None
+        """
+        self.session.close()
+
+
+_default_client: Optional[HttpClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Returns the process-wide HTTP client, creating it on first use.
+
+    Returns:
+        HttpClient: The shared client.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient(resilience=HostResilience())
+        return _default_client
+
+
+def set_http_client(client: Optional[HttpClient]) -> None:
+    """
+    Replaces the process-wide HTTP client (e.g., with one configured by a pytest fixture).
+
+    Args:
+        client (Optional[HttpClient]): The client to use, or None to create a default one on next use.
+
+    Returns:
+        None
+    """
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
+
+
+def return_status_code_of_url(api_url: str, method_name: str, timeout: int = 30, client: Optional[HttpClient] = None,
+                              deadline_at: Optional[float] = None) -> int:
     """
     Makes an HTTP request to the specified URL and returns the status code.
     
@@ -16,6 +436,8 @@ def return_status_code_of_url(api_url: str, method_name: str, timeout: int = 30)
         api_url (str): The URL to make the request to. Should be a valid HTTP/HTTPS URL.
         method_name (str): HTTP method to use (e.g., 'get', 'post', 'put', 'delete').
         timeout (int, optional): Request timeout in seconds. Defaults to 30.
+        client (Optional[HttpClient], optional): Pooled client to send the request with. Defaults to the shared client.
+        deadline_at (Optional[float], optional): time.monotonic() value after which no retry is started.
     
     Returns:
         int: HTTP status code (e.g., 200, 404, 500).
@@ -42,12 +464,12 @@ def return_status_code_of_url(api_url: str, method_name: str, timeout: int = 30)
     try:
         log.info(f"Making {method_name.upper()} request to: {api_url}")
         
-        response = requests.request(
+        response = (client or get_http_client()).request(
             method=method_name, 
             url=api_url, 
             timeout=timeout,
-            allow_redirects=True,
-            headers={'User-Agent': 'UIAutomation-PelagoWebsite/1.0'}
+            deadline_at=deadline_at,
+            allow_redirects=True
         )
         
         status_code = response.status_code
@@ -67,3 +489,307 @@ def return_status_code_of_url(api_url: str, method_name: str, timeout: int = 30)
         log.error(f"✗ Unexpected error after {elapsed_time}s: {api_url} - {str(e)}")
         raise
 
+
+@dataclass
+class UrlCheckResult:
+    """
+    Outcome of checking a single URL.
+
+    Attributes:
+        url (str): The checked URL.
+        status_code (Optional[int]): HTTP status code, or None if the check failed.
+        error (Optional[str]): Error message when no status code could be obtained.
+        fast_failed (bool): True if the URL was not requested because its host's circuit breaker was open.
+        method (str): HTTP method that produced the final status ('head' or 'get').
+        redirect_chain (List[Tuple[int, str]]): (status code, URL) of every redirect hop before the final response.
+        content_type (Optional[str]): Content-Type header of the final response.
+        content_length (Optional[int]): Content-Length header of the final response, if sent.
+        etag (Optional[str]): ETag header of the final response, used for cache revalidation.
+        last_modified (Optional[str]): Last-Modified header of the final response, used for cache revalidation.
+        from_cache (bool): True if the result was served from the URL result cache.
+    """
+    url: str
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    fast_failed: bool = False
+    method: str = "get"
+    redirect_chain: List[Tuple[int, str]] = field(default_factory=list)
+    content_type: Optional[str] = None
+    content_length: Optional[int] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    from_cache: bool = False
+
+
+def fetch_url_status(api_url: str, timeout: int = 30, client: Optional[HttpClient] = None,
+                     headers: Optional[Dict[str, str]] = None, deadline_at: Optional[float] = None) -> UrlCheckResult:
+    """
+    Gets the status of a URL without downloading its body.
+
+    Sends HEAD first. If the server rejects HEAD (403/405/501), falls back to a streamed GET that is closed
+    as soon as the headers arrive, so the body is never read.
+
+    Args:
+        api_url (str): The URL to check. Should be a valid HTTP/HTTPS URL.
+        timeout (int, optional): Request timeout in seconds. Defaults to 30.
+        client (Optional[HttpClient], optional): Pooled client to use. Defaults to the shared client.
+        headers (Optional[Dict[str, str]], optional): Extra request headers (e.g., conditional headers). Defaults to None.
+        deadline_at (Optional[float], optional): time.monotonic() value after which no retry is started.
+
+    Returns:
+        UrlCheckResult: Final status code, method used, redirect chain, content type, content length and validators.
+
+    Raises:
+        requests.exceptions.RequestException: For network-related errors.
+        ValueError: If an invalid URL is provided.
+    """
+    if not api_url or not isinstance(api_url, str):
+        raise ValueError(f"Invalid URL provided: {api_url}")
+
+    client = client or get_http_client()
+    start_time = time.time()
+    method_name = "head"
+    response = client.request("head", api_url, timeout=timeout, deadline_at=deadline_at, allow_redirects=True,
+                              headers=headers)
+    if response.status_code in HEAD_REJECTED_STATUS_CODES:
+        log.info(f"HEAD rejected with {response.status_code}, retrying with streamed GET: {api_url}")
+        method_name = "get"
+        response = client.request("get", api_url, timeout=timeout, deadline_at=deadline_at, allow_redirects=True,
+                                  stream=True, headers=headers)
+        response.close()  # Drop the connection instead of reading the body
+
+    content_length = response.headers.get("Content-Length")
+    result = UrlCheckResult(
+        url=api_url,
+        status_code=response.status_code,
+        method=method_name,
+        redirect_chain=[(hop.status_code, hop.url) for hop in response.history],
+        content_type=response.headers.get("Content-Type"),
+        content_length=int(content_length) if content_length and content_length.isdigit() else None,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified")
+    )
+    elapsed_time = round(time.time() - start_time, 2)
+    log.info(f"✓ {method_name.upper()} {api_url} → {result.status_code} ({elapsed_time}s, {len(result.redirect_chain)} redirects)")
+    return result
+
+
+def fetch_url_status_cached(api_url: str, cache: UrlResultCache, timeout: int = 30,
+                            client: Optional[HttpClient] = None, deadline_at: Optional[float] = None) -> UrlCheckResult:
+    """
+    Gets the status of a URL through the URL result cache.
+
+    Fresh entries are returned without a request. Stale entries with an ETag or Last-Modified value are
+    revalidated with If-None-Match / If-Modified-Since; a 304 answer keeps the cached result.
+
+    Args:
+        api_url (str): The URL to check.
+        cache (UrlResultCache): Cache to read from and write to.
+        timeout (int, optional): Request timeout in seconds. Defaults to 30.
+        client (Optional[HttpClient], optional): Pooled client to use. Defaults to the shared client.
+        deadline_at (Optional[float], optional): time.monotonic() value after which no retry is started.
+
+    Returns:
+        UrlCheckResult: The cached or freshly fetched result.
+    """
+    entry = cache.lookup(api_url)
+    if entry and entry["fresh"]:
+        cache.record("hits")
+        log.info(f"✓ cached {api_url} → {entry['status_code']}")
+        return UrlCheckResult(url=api_url, status_code=entry["status_code"], method="cache",
+                              content_type=entry["content_type"], content_length=entry["content_length"],
+                              etag=entry["etag"], last_modified=entry["last_modified"], from_cache=True)
+
+    cache.record("misses")
+    conditional_headers = {}
+    if entry and entry["etag"]:
+        conditional_headers["If-None-Match"] = entry["etag"]
+    if entry and entry["last_modified"]:
+        conditional_headers["If-Modified-Since"] = entry["last_modified"]
+    result = fetch_url_status(api_url, timeout=timeout, client=client, headers=conditional_headers or None,
+                              deadline_at=deadline_at)
+
+    if entry and result.status_code == 304:
+        cache.mark_revalidated(api_url)
+        log.info(f"✓ revalidated {api_url} → {entry['status_code']} (304 Not Modified)")
+        return replace(result, status_code=entry["status_code"], content_type=entry["content_type"],
+                       content_length=entry["content_length"], from_cache=True)
+    if ttl_for_status(result.status_code) > 0:
+        cache.store(api_url, result.status_code, result.content_type, result.content_length,
+                    result.etag, result.last_modified)
+    return result
+
+
+def _interleave_by_host(urls: List[str]) -> List[int]:
+    """
+    Orders URL indexes round-robin across hosts so one slow host cannot occupy every worker.
+
+    Args:
+        urls (List[str]): URLs to order.
+
+    Returns:
+        List[int]: Indexes into `urls` in submission order.
+    """
+    indexes_by_host = defaultdict(list)
+    for index, url in enumerate(urls):
+        indexes_by_host[urlsplit(url).netloc if isinstance(url, str) else ""].append(index)
+    return [index for group in zip_longest(*indexes_by_host.values()) for index in group if index is not None]
+
+
+def _make_url_checker(method_name: str, timeout: int, per_host_limit: int, deadline: Optional[float],
+                      client: Optional[HttpClient], status_only: bool, cache: Optional[UrlResultCache],
+                      section: Optional[str]) -> Callable[[str], UrlCheckResult]:
+    """
+    Builds the thread-safe per-URL check shared by validate_urls and validate_url_stream.
+
+    The deadline starts counting when the checker is built.
+
+    Args:
+        method_name (str): HTTP method used when status_only is False.
+        timeout (int): Per-request timeout in seconds.
+        per_host_limit (int): Maximum requests in flight per host.
+        deadline (Optional[float]): Seconds after which URLs not yet checked are reported as failed.
+        client (Optional[HttpClient]): Pooled client to use, or None for the shared client.
+        status_only (bool): Use fetch_url_status instead of a full `method_name` request.
+        cache (Optional[UrlResultCache]): Cache consulted in status_only mode.
+        section (Optional[str]): Page section the requests are attributed to in http_metrics.
+
+    Returns:
+        Callable[[str], UrlCheckResult]: Checks one URL; never raises.
+    """
+    start_time = time.monotonic()
+    host_semaphores = defaultdict(lambda: threading.BoundedSemaphore(per_host_limit))
+    host_semaphores_lock = threading.Lock()
+
+    def remaining_time() -> Optional[float]:
+        return None if deadline is None else deadline - (time.monotonic() - start_time)
+
+    def check(url: str) -> UrlCheckResult:
+        with http_metrics.metrics_section(section):
+            return check_url(url)
+
+    def check_url(url: str) -> UrlCheckResult:
+        with host_semaphores_lock:
+            semaphore = host_semaphores[urlsplit(url).netloc if isinstance(url, str) else ""]
+        remaining = remaining_time()
+        if remaining is not None and (remaining <= 0 or not semaphore.acquire(timeout=remaining)):
+            return UrlCheckResult(url=url, error=f"Deadline of {deadline}s exceeded before the URL was checked")
+        if remaining is None:
+            semaphore.acquire()
+        try:
+            # Retries and their backoff stop at the deadline, and every attempt's timeout is bounded by it
+            deadline_at = None if deadline is None else start_time + deadline
+            if status_only and cache is not None:
+                return fetch_url_status_cached(api_url=url, cache=cache, timeout=timeout, client=client,
+                                               deadline_at=deadline_at)
+            if status_only:
+                return fetch_url_status(api_url=url, timeout=timeout, client=client, deadline_at=deadline_at)
+            status_code = return_status_code_of_url(api_url=url, method_name=method_name, timeout=timeout, client=client,
+                                                    deadline_at=deadline_at)
+            return UrlCheckResult(url=url, status_code=status_code, method=method_name)
+        except CircuitOpenError as e:
+            return UrlCheckResult(url=url, error=str(e), fast_failed=True)
+        except Exception as e:
+            return UrlCheckResult(url=url, error=str(e))
+        finally:
+            semaphore.release()
+
+    return check
+
+
+def validate_urls(urls: List[str], method_name: str = "get", timeout: int = 30, max_workers: int = 16,
+                  per_host_limit: int = 8, deadline: Optional[float] = None,
+                  client: Optional[HttpClient] = None, status_only: bool = False,
+                  cache: Optional[UrlResultCache] = None, section: Optional[str] = None) -> List[UrlCheckResult]:
+    """
+    Fetches the status code of many URLs concurrently.
+
+    URLs that canonicalize to the same value are requested once.
+
+    Args:
+        urls (List[str]): URLs to check.
+        method_name (str, optional): HTTP method to use. Defaults to 'get'.
+        timeout (int, optional): Per-request timeout in seconds. Defaults to 30.
+        max_workers (int, optional): Maximum requests in flight overall. Defaults to 16.
+        per_host_limit (int, optional): Maximum requests in flight per host. Defaults to 8.
+        deadline (Optional[float], optional): Seconds after which URLs not yet checked are reported as
+            failed instead of being requested. Defaults to None (no deadline).
+        client (Optional[HttpClient], optional): Pooled client to use. Defaults to the shared client.
+        status_only (bool, optional): Use fetch_url_status (HEAD, then streamed GET) instead of a full
+            `method_name` request, so response bodies are not downloaded. Defaults to False.
+        cache (Optional[UrlResultCache], optional): Cache consulted in status_only mode. Defaults to None.
+        section (Optional[str], optional): Page section the requests are attributed to in http_metrics. Defaults to None.
+
+    Returns:
+        List[UrlCheckResult]: One result per URL, in the same order as `urls`.
+    """
+    start_time = time.monotonic()
+    check = _make_url_checker(method_name, timeout, per_host_limit, deadline, client, status_only, cache, section)
+    first_url_by_key: Dict[str, str] = {}
+    for url in urls:
+        first_url_by_key.setdefault(canonicalize_url(url), url)
+    unique_urls = list(first_url_by_key.values())
+    unique_results: Dict[str, UrlCheckResult] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        order = _interleave_by_host(unique_urls)
+        for index, result in zip(order, executor.map(check, [unique_urls[index] for index in order])):
+            unique_results[canonicalize_url(unique_urls[index])] = result
+    log.info(f"Validated {len(urls)} URLs ({len(unique_urls)} unique) in {round(time.monotonic() - start_time, 2)}s "
+             f"({max_workers} workers, {per_host_limit} per host)")
+    results = []
+    for url in urls:
+        result = unique_results[canonicalize_url(url)]
+        results.append(result if result.url == url else replace(result, url=url))
+    return results
+
+
+def validate_url_stream(urls: Iterable[str], method_name: str = "get", timeout: int = 30, max_workers: int = 16,
+                        per_host_limit: int = 8, deadline: Optional[float] = None,
+                        client: Optional[HttpClient] = None, status_only: bool = False,
+                        cache: Optional[UrlResultCache] = None, section: Optional[str] = None) -> Iterator[UrlCheckResult]:
+    """
+    Streaming form of validate_urls: checks URLs in background workers while they are still being produced.
+
+    `urls` is consumed on the calling thread (it may drive the browser); each URL is submitted as soon as it
+    arrives and results are yielded in input order as soon as they are ready, so producing the next URLs and
+    checking the previous ones overlap.
+
+    Args:
+        urls (Iterable[str]): URLs to check, typically a generator harvesting them from the page.
+        method_name (str, optional): HTTP method to use. Defaults to 'get'.
+        timeout (int, optional): Per-request timeout in seconds. Defaults to 30.
+        max_workers (int, optional): Maximum requests in flight overall. Defaults to 16.
+        per_host_limit (int, optional): Maximum requests in flight per host. Defaults to 8.
+        deadline (Optional[float], optional): Seconds after which URLs not yet checked are reported as
+            failed instead of being requested. Defaults to None (no deadline).
+        client (Optional[HttpClient], optional): Pooled client to use. Defaults to the shared client.
+        status_only (bool, optional): Use fetch_url_status instead of a full `method_name` request. Defaults to False.
+        cache (Optional[UrlResultCache], optional): Cache consulted in status_only mode. Defaults to None.
+        section (Optional[str], optional): Page section the requests are attributed to in http_metrics. Defaults to None.
+
+    Yields:
+        UrlCheckResult: One result per URL, in the same order as `urls`.
+    """
+    start_time = time.monotonic()
+    check = _make_url_checker(method_name, timeout, per_host_limit, deadline, client, status_only, cache, section)
+    futures_by_key: Dict[str, Future] = {}
+    pending: Deque[Tuple[str, Future]] = deque()
+
+    def result_of(url: str, future: Future) -> UrlCheckResult:
+        result = future.result()
+        return result if result.url == url else replace(result, url=url)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for url in urls:
+            key = canonicalize_url(url)
+            if key not in futures_by_key:
+                futures_by_key[key] = executor.submit(check, url)
+            pending.append((url, futures_by_key[key]))
+            while pending and pending[0][1].done():
+                yield result_of(*pending.popleft())
+        produced_time = time.monotonic()
+        while pending:
+            yield result_of(*pending.popleft())
+    log.info(f"Validated {len(futures_by_key)} unique streamed URLs in {round(time.monotonic() - start_time, 2)}s, "
+             f"{round(time.monotonic() - produced_time, 2)}s of it after the last URL was produced "
+             f"({max_workers} workers, {per_host_limit} per host)")
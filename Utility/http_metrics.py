@@ -0,0 +1,248 @@
+import bisect
+import json
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Upper bounds (seconds) of the latency buckets: 1ms to ~2min, each 25% wider than the previous one
+LATENCY_BUCKET_BOUNDS: List[float] = [round(0.001 * 1.25 ** i, 6) for i in range(54)]
+
+PERCENTILES = (50, 95, 99)
+
+_section = threading.local()
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram whose memory use does not grow with the number of samples.
+    """
+
+    def __init__(self, bounds: List[float] = LATENCY_BUCKET_BOUNDS):
+        """
+        Initializes an empty histogram.
+
+        Args:
+            bounds (List[float], optional): Sorted bucket upper bounds in seconds; one overflow bucket is added.
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        """
+        Adds one sample.
+
+        Args:
+            value (float): Latency in seconds.
+
+        Returns:
+            None
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Returns the upper bound of the bucket holding the given percentile (capped at the observed maximum).
+
+        Args:
+            percent (float): Percentile between 0 and 100.
+
+        Returns:
+            Optional[float]: Latency in seconds, or None if the histogram is empty.
+        """
+        if self.count == 0:
+            return None
+        rank = max(1, round(self.count * percent / 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Adds every sample of another histogram with the same bounds.
+
+        Args:
+            other (LatencyHistogram): Histogram to merge in.
+
+        Returns:
+            None
+        """
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Serializes the histogram.
+
+        Returns:
+            Dict[str, object]: JSON-serializable histogram state.
+        """
+        return {"counts": self.counts, "count": self.count, "total": self.total, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "LatencyHistogram":
+        """
+        Rebuilds a histogram serialized with to_dict.
+
+        Args:
+            data (Dict[str, object]): Serialized histogram state.
+
+        Returns:
+            LatencyHistogram: The histogram.
+        """
+        histogram = cls()
+        histogram.counts, histogram.count = list(data["counts"]), data["count"]
+        histogram.total, histogram.max = data["total"], data["max"]
+        return histogram
+
+
+class MetricsRegistry:
+    """
+    In-memory registry of HTTP timings, grouped by host and by page section.
+
+    Timings recorded per request: 'ttfb' (request sent until response headers parsed) and 'total'
+    (until the response returned to the caller). requests/urllib3 do not expose DNS, connect and TLS
+    phases separately, so those are included in the first request's ttfb on each new connection.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty registry.
+        """
+        self._histograms: Dict[str, Dict[str, Dict[str, LatencyHistogram]]] = {"host": {}, "section": {}}
+        self._counters: Dict[str, Dict[str, Dict[str, int]]] = {"host": {}, "section": {}}
+        self._lock = threading.Lock()
+
+    def record_request(self, host: str, total: float, ttfb: Optional[float] = None, bytes_received: int = 0,
+                       error: bool = False) -> None:
+        """
+        Records the timings of one HTTP request under its host and the current page section.
+
+        Args:
+            host (str): Host the request was sent to.
+            total (float): Total duration in seconds.
+            ttfb (Optional[float], optional): Time to first byte in seconds, if a response was received.
+            bytes_received (int, optional): Body bytes received. Defaults to 0.
+            error (bool, optional): True if the request raised instead of returning a response.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for dimension, key in (("host", host), ("section", get_section())):
+                histograms = self._histograms[dimension].setdefault(key, {"total": LatencyHistogram(), "ttfb": LatencyHistogram()})
+                histograms["total"].record(total)
+                if ttfb is not None:
+                    histograms["ttfb"].record(ttfb)
+                counters = self._counters[dimension].setdefault(key, {"requests": 0, "errors": 0, "bytes": 0})
+                counters["requests"] += 1
+                counters["errors"] += error
+                counters["bytes"] += bytes_received
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, object]]]:
+        """
+        Returns p50/p95/p99 and counters per host and per page section.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, object]]]: dimension ('host'/'section') -> key -> metrics, with
+                latencies in milliseconds.
+        """
+        with self._lock:
+            result = {}
+            for dimension, entries in self._histograms.items():
+                result[dimension] = {}
+                for key, histograms in entries.items():
+                    metrics = dict(self._counters[dimension][key])
+                    for name, histogram in histograms.items():
+                        for percent in PERCENTILES:
+                            value = histogram.percentile(percent)
+                            metrics[f"{name}_p{percent}_ms"] = None if value is None else round(value * 1000, 1)
+                    result[dimension][key] = metrics
+            return result
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Serializes the raw histograms and counters so another process can merge them.
+
+        Returns:
+            Dict[str, object]: JSON-serializable registry state.
+        """
+        with self._lock:
+            return {"histograms": {dimension: {key: {name: histogram.to_dict() for name, histogram in histograms.items()}
+                                               for key, histograms in entries.items()}
+                                   for dimension, entries in self._histograms.items()},
+                    "counters": json.loads(json.dumps(self._counters))}
+
+    def merge_dict(self, data: Dict[str, object]) -> None:
+        """
+        Merges state produced by to_dict (e.g., from a pytest-xdist worker).
+
+        Args:
+            data (Dict[str, object]): Serialized registry state.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for dimension, entries in data["histograms"].items():
+                for key, histograms in entries.items():
+                    mine = self._histograms[dimension].setdefault(key, {"total": LatencyHistogram(), "ttfb": LatencyHistogram()})
+                    for name, histogram in histograms.items():
+                        mine[name].merge(LatencyHistogram.from_dict(histogram))
+            for dimension, entries in data["counters"].items():
+                for key, counters in entries.items():
+                    mine = self._counters[dimension].setdefault(key, {"requests": 0, "errors": 0, "bytes": 0})
+                    for name, value in counters.items():
+                        mine[name] += value
+
+    def export_json(self, path: str) -> None:
+        """
+        Writes the percentile summary to a JSON file.
+
+        Args:
+            path (str): Output file path.
+
+        Returns:
+            None
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.summary(), file, indent=2)
+
+
+registry = MetricsRegistry()
+
+
+def get_section() -> str:
+    """
+    Returns the page section requests on this thread are attributed to.
+
+    Returns:
+        str: Section name, or 'unspecified'.
+    """
+    return getattr(_section, "name", None) or "unspecified"
+
+
+@contextmanager
+def metrics_section(name: Optional[str]):
+    """
+    Attributes requests made on this thread inside the block to a page section.
+
+    Args:
+        name (Optional[str]): Section name (e.g., 'famous_destination_images'). None leaves the current section.
+    """
+    previous = getattr(_section, "name", None)
+    _section.name = name or previous
+    try:
+        yield
+    finally:
+        _section.name = previous
@@ -5,11 +5,17 @@ from datetime import datetime
 from bs4 import BeautifulSoup
 from Utility.AWS.s3_methods import upload_report_to_s3
 from Utility.GCP.gmail_methods import send_mail
+from Utility.results_sidecar import DEFAULT_RESULTS_PATH, read_results_summary
+from Utility import template_engine
 from Helpers import custom_logger
+from Data import constant
 
 log = custom_logger.get_logger()
 
 
+EMAIL_TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), 'email_template.html')
+
+
 def generate_email_html(report_data: Dict[str, Any]) -> str:
     """
     Generates HTML email content for test report notifications.
@@ -20,7 +26,10 @@ def generate_email_html(report_data: Dict[str, Any]) -> str:
             - passed_tests: Number of passed tests
             - failed_tests: Number of failed tests
             - skipped_tests: Number of skipped tests
-            - browser_name: Browser used for testing
+            - browser_name: Browser(s) used for testing, comma-separated
+            - browser_results: Per-browser outcome counts (browser -> {'passed', 'failed', 'skipped', 'error'})
+            - failed_test_records: Failed and errored tests (dicts with nodeid, browser, outcome, duration), at most
+              constant.EMAIL_MAX_FAILED_TESTS
             - test_environment: Environment (PROD/QA)
             - execution_time: Test execution duration
             - report_s3_url: S3 URL where detailed report is stored
@@ -29,11 +38,6 @@ def generate_email_html(report_data: Dict[str, Any]) -> str:
     Returns:
         str: Complete HTML email content ready to send.
     """
-    # Read the HTML template
-    template_path = os.path.join(os.path.dirname(__file__), 'email_template.html')
-    with open(template_path, 'r', encoding='utf-8') as file:
-        html_template = file.read()
-    
     # Calculate success rate
     total = report_data.get('total_tests', 0)
     passed = report_data.get('passed_tests', 0)
@@ -50,34 +54,82 @@ def generate_email_html(report_data: Dict[str, Any]) -> str:
     else:
         test_status = "mixed"
         test_status_text = "Mixed Results ⚠️"
-    
-    # Replace placeholders with actual data
-    replacements = {
-        '{TEST_STATUS}': test_status,
-        '{TEST_STATUS_TEXT}': test_status_text,
-        '{TOTAL_TESTS}': str(report_data.get('total_tests', 0)),
-        '{PASSED_TESTS}': str(report_data.get('passed_tests', 0)),
-        '{FAILED_TESTS}': str(report_data.get('failed_tests', 0)),
-        '{SKIPPED_TESTS}': str(report_data.get('skipped_tests', 0)),
-        '{BROWSER_NAME}': report_data.get('browser_name', 'Chrome').title(),
-        '{TEST_ENVIRONMENT}': report_data.get('test_environment', 'PROD'),
-        '{EXECUTION_TIME}': report_data.get('execution_time', 'N/A'),
-        '{SUCCESS_RATE}': str(success_rate),
-        '{REPORT_S3_URL}': report_data.get('report_s3_url', '#'),
-        '{REPORT_TIMESTAMP}': report_data.get('report_timestamp', 'N/A')
+
+    browser_results = report_data.get('browser_results', {})
+    failed_test_records = report_data.get('failed_test_records', [])
+    shown_failures = failed_test_records[:constant.EMAIL_MAX_FAILED_TESTS]
+    context = {
+        'TEST_STATUS': test_status,
+        'TEST_STATUS_TEXT': test_status_text,
+        'TOTAL_TESTS': report_data.get('total_tests', 0),
+        'PASSED_TESTS': report_data.get('passed_tests', 0),
+        'FAILED_TESTS': report_data.get('failed_tests', 0),
+        'SKIPPED_TESTS': report_data.get('skipped_tests', 0),
+        'BROWSER_NAME': report_data.get('browser_name', 'Chrome').title(),
+        'TEST_ENVIRONMENT': report_data.get('test_environment', 'PROD'),
+        'EXECUTION_TIME': report_data.get('execution_time', 'N/A'),
+        'SUCCESS_RATE': success_rate,
+        'REPORT_S3_URL': report_data.get('report_s3_url', '#'),
+        'REPORT_TIMESTAMP': report_data.get('report_timestamp', 'N/A'),
+        # The per-browser table is only shown when more than one browser was tested
+        'BROWSER_BREAKDOWN': len(browser_results) > 1,
+        'BROWSER_RESULTS': [{'BROWSER': browser.title(), 'PASSED': counts.get('passed', 0),
+                             'FAILED': counts.get('failed', 0) + counts.get('error', 0),
+                             'SKIPPED': counts.get('skipped', 0)} for browser, counts in browser_results.items()],
+        'FAILURES': bool(shown_failures),
+        'FAILED_TEST_ROWS': [{'NODEID': record['nodeid'], 'BROWSER': (record.get('browser') or '').title(),
+                              'OUTCOME': record['outcome'], 'DURATION': record['duration']}
+                             for record in shown_failures],
+        # The results summary lists at most EMAIL_MAX_FAILED_TESTS failures, the counts cover all of them
+        'MORE_FAILURES': max(report_data.get('failed_tests', 0) + report_data.get('error_tests', 0),
+                             len(failed_test_records)) - len(shown_failures)
     }
-    
-    # Apply all replacements
-    for placeholder, value in replacements.items():
-        html_template = html_template.replace(placeholder, value)
-    
-    return html_template
+    return template_engine.render_template(EMAIL_TEMPLATE_PATH, context)
+
+
+REPORT_FILE_PATH = os.path.join(os.path.abspath(__file__ + "/../../"), 'new_report.html')
+
+# Seconds the results file may predate the HTML report and still belong to the same run
+RESULTS_MAX_REPORT_LAG = 300
+
+
+def load_report_data() -> Dict[str, Any]:
+    """
+    Loads the test execution details of the last run for the email.
+
+    Reads the first and last line of the test_results.jsonl file written by conftest.py while the tests ran.
+    The HTML report is only parsed when that file is missing or older than the report (legacy runs).
+
+    Returns:
+        Dict[str, Any]: Same keys as parse_pytest_html_report.
+    """
+    results = read_results_summary(DEFAULT_RESULTS_PATH)
+    if results is not None and os.path.exists(REPORT_FILE_PATH) and \
+            os.path.getmtime(DEFAULT_RESULTS_PATH) < os.path.getmtime(REPORT_FILE_PATH) - RESULTS_MAX_REPORT_LAG:
+        log.warning(f"{DEFAULT_RESULTS_PATH} is older than the HTML report, ignoring it")
+        results = None
+    if results is None:
+        log.info("No test results file for this run, parsing the HTML report")
+        return parse_pytest_html_report()
+    report_data = {key: results.get(key, 0) for key in (
+        'total_tests', 'passed_tests', 'failed_tests', 'skipped_tests', 'xfailed_tests', 'xpassed_tests',
+        'error_tests', 'rerun_tests')}
+    report_data.update({
+        'execution_time': results.get('execution_time', 'N/A'),
+        'browser_name': ', '.join(results.get('browsers', [])) or 'N/A',
+        'browser_results': results.get('browser_results', {}),
+        'test_environment': results.get('environment', 'N/A'),
+        'report_timestamp': results.get('report_timestamp', 'N/A'),
+        'failed_test_records': results.get('failed_test_records', [])})
+    return report_data
 
 
 def parse_pytest_html_report() -> Dict[str, Any]:
     """
     Parses pytest HTML report to extract test execution details and configuration.
 
+    Legacy fallback of load_report_data for runs without a test_results.jsonl file.
+
     Returns:
         Dict[str, Any]: Dictionary containing parsed test data with keys:
             - total_tests: Total number of tests
@@ -89,13 +141,13 @@ def parse_pytest_html_report() -> Dict[str, Any]:
             - error_tests: Number of tests with errors
             - rerun_tests: Number of reruns
             - execution_time: Test execution duration
-            - browser_name: Browser used for testing
+            - browser_name: Browser(s) used for testing, comma-separated
+            - browser_results: Per-browser outcome counts from the 'Results per browser' table
             - test_environment: Environment (PROD/QA)
             - report_timestamp: When the report was generated
     """
-    report_file_path = os.path.join(os.path.abspath(__file__ + "/../../"), 'new_report.html')
     try:
-        with open(report_file_path, 'r', encoding='utf-8') as file:
+        with open(REPORT_FILE_PATH, 'r', encoding='utf-8') as file:
             html_content = file.read()
         
         soup = BeautifulSoup(html_content, 'html.parser')
@@ -112,6 +164,7 @@ def parse_pytest_html_report() -> Dict[str, Any]:
             'rerun_tests': 0,
             'execution_time': 'N/A',
             'browser_name': 'N/A',
+            'browser_results': {},
             'test_environment': 'N/A',
             'report_timestamp': 'N/A'
         }
@@ -197,7 +250,7 @@ def parse_pytest_html_report() -> Dict[str, Any]:
             # Parse: "Browser: Chrome | Environment: PROD | Headless: False"
             
             # Extract browser
-            browser_match = re.search(r'Browser:\s*(\w+)', config_text, re.IGNORECASE)
+            browser_match = re.search(r'Browser:\s*([\w, ]+?)\s*(\||$)', config_text, re.IGNORECASE)
             if browser_match:
                 result['browser_name'] = browser_match.group(1).lower()
             
@@ -224,6 +277,13 @@ def parse_pytest_html_report() -> Dict[str, Any]:
             elif 'prod' in text_content and 'environment' in text_content:
                 result['test_environment'] = 'PROD'
         
+        # Extract per-browser results added in conftest.py
+        browser_table = soup.find('table', id='browser-results')
+        if browser_table:
+            for row in browser_table.find_all('tr', attrs={'data-browser': True}):
+                counts = [int(cell.get_text()) for cell in row.find_all('td')[1:]]
+                result['browser_results'][row['data-browser']] = dict(zip(('passed', 'failed', 'skipped', 'error'), counts))
+
         # Extract report generation timestamp
         # Look for pattern: "Report generated on 15-Aug-2025 at 16:45:09 by pytest-html"
         timestamp_match = re.search(r'Report generated on (\d{1,2}-\w{3}-\d{4} at \d{2}:\d{2}:\d{2})', html_content)
@@ -245,6 +305,7 @@ def parse_pytest_html_report() -> Dict[str, Any]:
             'rerun_tests': 0,
             'execution_time': 'N/A',
             'browser_name': 'NA',
+            'browser_results': {},
             'test_environment': 'NA',
             'report_timestamp': 'N/A'
         }
@@ -252,7 +313,7 @@ def parse_pytest_html_report() -> Dict[str, Any]:
 
 def generate_email_body_from_report(report_s3_url: str = '#') -> str:
     """
-    Generates email HTML by parsing pytest report and extracting all configuration.
+    Generates email HTML from the test results of the last run.
     
     Args:
         report_s3_url (str): S3 URL where the report is uploaded.
@@ -260,8 +321,8 @@ def generate_email_body_from_report(report_s3_url: str = '#') -> str:
     Returns:
         str: Complete HTML email content.
     """
-    # Parse the pytest report for test results and configuration
-    parsed_data = parse_pytest_html_report()
+    # Load the test results and configuration of the run
+    parsed_data = load_report_data()
     
     # Add the S3 URL
     parsed_data['report_s3_url'] = report_s3_url
@@ -0,0 +1,241 @@
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from Helpers import custom_logger
+from Data import constant
+
+log = custom_logger.get_logger()
+
+DEFAULT_RESULTS_PATH = os.path.join(os.path.abspath(__file__ + "/../../"), "test_results.jsonl")
+
+# Outcome counters, named like the pytest-html filters the mail pipeline used to scrape
+OUTCOMES = ("passed", "failed", "skipped", "xfailed", "xpassed", "error", "rerun")
+
+# Outcomes listed as failures in the summary line
+FAILED_OUTCOMES = ("failed", "error")
+
+# Bytes read from the end of the file to find the summary line
+_TAIL_CHUNK_SIZE = 64 * 1024
+
+
+def report_outcome(report) -> Optional[str]:
+    """
+    Maps a test report to the outcome it contributes to the run, the way pytest-html counts it.
+
+    Args:
+        report: Test report of one phase.
+
+    Returns:
+        Optional[str]: One of OUTCOMES, or None for phases that do not decide an outcome (passed setup/teardown).
+    """
+    if report.outcome == "rerun":
+        return "rerun"
+    if hasattr(report, "wasxfail"):
+        return "xfailed" if report.skipped else "xpassed"
+    if report.when == "call":
+        return report.outcome
+    if report.failed:
+        return "error"
+    if report.skipped and report.when == "setup":
+        return "skipped"
+    return None
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Formats a duration like the pytest-html run count ('took 00:01:23').
+
+    Args:
+        seconds (float): Duration in seconds.
+
+    Returns:
+        str: HH:MM:SS.
+    """
+    seconds = int(round(seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class ResultsSidecarPlugin:
+    """
+    Controller-side plugin writing test_results.jsonl next to the HTML report while the tests run.
+
+    Line 1 holds the run configuration, one line is appended per test outcome as it is reported and the last line
+    holds the summary, so readers get the totals and the failed tests (up to constant.EMAIL_MAX_FAILED_TESTS) from
+    the first and last line without parsing the report.
+    """
+
+    def __init__(self, path: str = DEFAULT_RESULTS_PATH, run: Optional[Dict[str, Any]] = None):
+        """
+        Initializes the plugin; the file is created when the session starts.
+
+        Args:
+            path (str, optional): Output file. Defaults to test_results.jsonl in the project root.
+            run (Optional[Dict[str, Any]], optional): Run configuration, e.g. browsers, environment and headless.
+        """
+        self.path = path
+        self.run = dict(run or {})
+        self.counts = {outcome: 0 for outcome in OUTCOMES}
+        self.browser_results: Dict[str, Dict[str, int]] = {}
+        self.failed_test_records: List[Dict[str, Any]] = []
+        self.start_time = time.time()
+        self._file = None
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def pytest_sessionstart(self, session):
+        self.start_time = time.time()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._write({"type": "run", "started_at": self.start_time, **self.run})
+
+    def pytest_runtest_logreport(self, report):
+        outcome = report_outcome(report)
+        if outcome is None or self._file is None:
+            return
+        browser = getattr(report, "browser", None)
+        self.counts[outcome] += 1
+        if browser and outcome != "rerun":
+            browser_counts = self.browser_results.setdefault(browser, {})
+            browser_counts[outcome] = browser_counts.get(outcome, 0) + 1
+        worker = getattr(getattr(report, "node", None), "gateway", None)
+        record = {"type": "test", "nodeid": report.nodeid, "when": report.when, "outcome": outcome,
+                  "duration": round(report.duration, 3), "browser": browser,
+                  "worker": worker.id if worker else "main", "finished_at": round(time.time(), 3)}
+        if outcome in FAILED_OUTCOMES and len(self.failed_test_records) < constant.EMAIL_MAX_FAILED_TESTS:
+            self.failed_test_records.append(_failed_test_record(record))
+        self._write(record)
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        if self._file is None:
+            return
+        duration = time.time() - self.start_time
+        self._write({"type": "summary", "total_tests": sum(count for outcome, count in self.counts.items()
+                                                            if outcome != "rerun"),
+                     **{f"{outcome}_tests": count for outcome, count in self.counts.items()},
+                     "browser_results": self.browser_results, "failed_test_records": self.failed_test_records,
+                     "duration": round(duration, 3),
+                     "execution_time": format_duration(duration), "exit_status": int(exitstatus),
+                     "report_timestamp": datetime.now().strftime("%d-%b-%Y at %H:%M:%S")})
+        self._file.close()
+        self._file = None
+        log.info(f"Test results written to {self.path}")
+
+
+def _failed_test_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Picks the fields of a test line listed for a failure in the summary line.
+
+    Args:
+        record (Dict[str, Any]): Test line.
+
+    Returns:
+        Dict[str, Any]: nodeid, browser, outcome and duration.
+    """
+    return {key: record.get(key) for key in ("nodeid", "browser", "outcome", "duration")}
+
+
+def _read_last_line(path: str) -> Optional[str]:
+    """
+    Reads the last line of a file without reading the whole file.
+
+    Args:
+        path (str): File path.
+
+    Returns:
+        Optional[str]: The last non-empty line, or None if the file is empty.
+    """
+    with open(path, "rb") as file:
+        file.seek(0, os.SEEK_END)
+        end = file.tell()
+        chunk = b""
+        position = end
+        while position > 0:
+            position = max(0, position - _TAIL_CHUNK_SIZE)
+            file.seek(position)
+            chunk = file.read(end - position)
+            lines = chunk.rstrip(b"\n").split(b"\n")
+            if len(lines) > 1 or position == 0:
+                return lines[-1].decode("utf-8") or None
+    return None
+
+
+def _summarize_tests(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Rebuilds the summary from the per-test lines of a run that ended without writing one (e.g. it was killed).
+
+    Args:
+        records (List[Dict[str, Any]]): Test lines of the file.
+
+    Returns:
+        Dict[str, Any]: Summary with the same keys as the summary line.
+    """
+    counts = {outcome: 0 for outcome in OUTCOMES}
+    browser_results: Dict[str, Dict[str, int]] = {}
+    failed_test_records = []
+    for record in records:
+        counts[record["outcome"]] += 1
+        if record["outcome"] in FAILED_OUTCOMES and len(failed_test_records) < constant.EMAIL_MAX_FAILED_TESTS:
+            failed_test_records.append(_failed_test_record(record))
+        if record.get("browser") and record["outcome"] != "rerun":
+            browser_counts = browser_results.setdefault(record["browser"], {})
+            browser_counts[record["outcome"]] = browser_counts.get(record["outcome"], 0) + 1
+    return {"total_tests": sum(count for outcome, count in counts.items() if outcome != "rerun"),
+            **{f"{outcome}_tests": count for outcome, count in counts.items()},
+            "browser_results": browser_results, "failed_test_records": failed_test_records, "execution_time": "N/A",
+            "report_timestamp": "N/A"}
+
+
+def read_results_summary(path: str = DEFAULT_RESULTS_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Reads the run configuration and summary of a results file from its first and last line.
+
+    Args:
+        path (str, optional): Results file. Defaults to test_results.jsonl in the project root.
+
+    Returns:
+        Optional[Dict[str, Any]]: The 'run' line merged with the 'summary' line, or None if the file is missing
+            or unreadable.
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            run = json.loads(file.readline())
+        last_line = _read_last_line(path)
+    except (OSError, ValueError) as e:
+        log.warning(f"Test results file {path} could not be read: {e}")
+        return None
+    try:
+        summary = json.loads(last_line or "{}")
+    except ValueError:
+        summary = {}  # Line cut off by a killed run
+    if run.get("type") != "run":
+        return None
+    if summary.get("type") != "summary":
+        log.warning(f"Test results file {path} has no summary line, counting the test lines")
+        summary = _summarize_tests(read_test_records(path))
+    return {**run, **summary}
+
+
+def read_test_records(path: str = DEFAULT_RESULTS_PATH) -> List[Dict[str, Any]]:
+    """
+    Reads the per-test lines of a results file.
+
+    Args:
+        path (str, optional): Results file. Defaults to test_results.jsonl in the project root.
+
+    Returns:
+        List[Dict[str, Any]]: One record per test outcome, in the order they were reported.
+    """
+    records = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Line cut off by a killed run
+            if record.get("type") == "test":
+                records.append(record)
+    return records
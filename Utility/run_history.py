@@ -0,0 +1,357 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from Helpers import custom_logger
+from Utility.results_sidecar import DEFAULT_RESULTS_PATH
+
+log = custom_logger.get_logger()
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.abspath(__file__ + "/../../"), ".cache", "run_history.sqlite")
+
+# Outcomes counted as a failure in flakiness statistics
+FAILED_OUTCOMES = ("failed", "error")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    environment TEXT,
+    browsers TEXT,
+    total_tests INTEGER,
+    failed_tests INTEGER,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs (started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_environment ON runs (environment, started_at);
+CREATE TABLE IF NOT EXISTS tests (
+    test_id INTEGER PRIMARY KEY,
+    nodeid TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT NOT NULL,
+    test_id INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    browser TEXT,
+    environment TEXT,
+    phase TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_test ON results (test_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_results_started_at ON results (started_at);
+CREATE INDEX IF NOT EXISTS idx_results_browser ON results (browser, environment, started_at);
+"""
+
+
+class RunHistory:
+    """
+    Append-only SQLite store of test outcomes and durations across runs, with trend queries.
+
+    Results carry the start time, browser and environment of their run, so a query over the last N runs is an
+    index range scan whatever the size of the history.
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH):
+        """
+        Opens (and creates if needed) the history database.
+
+        Args:
+            path (str, optional): Path of the SQLite file. Defaults to .cache/run_history.sqlite in the project root.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def ingest_results_file(self, path: str = DEFAULT_RESULTS_PATH) -> int:
+        """
+        Adds the run recorded in a test_results.jsonl file (see Utility.results_sidecar). A run is only added once.
+
+        Args:
+            path (str, optional): Results file. Defaults to test_results.jsonl in the project root.
+
+        Returns:
+            int: Number of test results added, 0 if the run was already stored or the file has no run line.
+        """
+        run, summary, records = None, {}, []
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Line cut off by a killed run
+                if record.get("type") == "run":
+                    run = record
+                elif record.get("type") == "test":
+                    records.append(record)
+                elif record.get("type") == "summary":
+                    summary = record
+        if run is None:
+            log.warning(f"{path} has no run line, nothing added to the run history")
+            return 0
+        run_id, started_at, environment = run.get("run_id") or str(run["started_at"]), run["started_at"], run.get("environment")
+        with self._lock, self._connection:
+            if self._connection.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone():
+                return 0
+            self._connection.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, started_at, environment, ",".join(run.get("browsers", [])), summary.get("total_tests"),
+                 summary.get("failed_tests"), summary.get("duration")))
+            self._connection.executemany("INSERT OR IGNORE INTO tests (nodeid) VALUES (?)",
+                                         {(record["nodeid"],) for record in records})
+            test_ids = self._test_ids({record["nodeid"] for record in records})
+            self._connection.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, test_ids[record["nodeid"]], started_at, record.get("browser"), environment, record["when"],
+                  record["outcome"], record["duration"]) for record in records])
+        log.info(f"Run {run_id}: {len(records)} test results added to the run history")
+        return len(records)
+
+    def _test_ids(self, nodeids) -> Dict[str, int]:
+        ids = {}
+        nodeids = list(nodeids)
+        for start in range(0, len(nodeids), 500):
+            chunk = nodeids[start:start + 500]
+            ids.update(self._connection.execute(
+                f"SELECT nodeid, test_id FROM tests WHERE nodeid IN ({','.join('?' * len(chunk))})", chunk).fetchall())
+        return ids
+
+    def _window(self, last_runs: int, environment: Optional[str]) -> Optional[Tuple[float, float]]:
+        """
+        Returns the start time of the oldest and of the middle run among the last runs.
+
+        Args:
+            last_runs (int): Number of most recent runs.
+            environment (Optional[str]): Only count runs of this environment.
+
+        Returns:
+            Optional[Tuple[float, float]]: (oldest start, start of the first run of the recent half), or None
+                if there are no runs.
+        """
+        starts = [row[0] for row in self._connection.execute(
+            "SELECT started_at FROM runs WHERE (? IS NULL OR environment = ?) ORDER BY started_at DESC LIMIT ?",
+            (environment, environment, last_runs))]
+        if not starts:
+            return None
+        return starts[-1], starts[(len(starts) - 1) // 2]
+
+    def duration_trends(self, last_runs: int = 30, browser: Optional[str] = None, environment: Optional[str] = None,
+                        limit: int = 20) -> List[Dict[str, object]]:
+        """
+        Lists the tests whose call duration grew the most between the older and the recent half of the last runs.
+
+        Args:
+            last_runs (int, optional): Number of most recent runs compared. Defaults to 30.
+            browser (Optional[str], optional): Only results of this browser.
+            environment (Optional[str], optional): Only runs of this environment (e.g. PROD).
+            limit (int, optional): Maximum number of tests returned. Defaults to 20.
+
+        Returns:
+            List[Dict[str, object]]: nodeid, runs, earlier_avg, recent_avg (seconds) and change (recent / earlier),
+                slowest-growing first.
+        """
+        with self._lock:
+            window = self._window(last_runs, environment)
+            if window is None:
+                return []
+            rows = self._connection.execute(
+                "SELECT nodeid, runs, earlier, recent FROM ("
+                " SELECT t.nodeid, COUNT(*) AS runs, AVG(CASE WHEN r.started_at < :mid THEN r.duration END) AS earlier,"
+                " AVG(CASE WHEN r.started_at >= :mid THEN r.duration END) AS recent"
+                " FROM results r JOIN tests t ON t.test_id = r.test_id"
+                " WHERE r.started_at >= :start AND r.phase = 'call' AND (:browser IS NULL OR r.browser = :browser)"
+                " AND (:environment IS NULL OR r.environment = :environment) GROUP BY r.test_id)"
+                " WHERE earlier > 0 AND recent IS NOT NULL ORDER BY recent / earlier DESC LIMIT :limit",
+                {"start": window[0], "mid": window[1], "browser": browser, "environment": environment,
+                 "limit": limit}).fetchall()
+        return [{"nodeid": nodeid, "runs": runs, "earlier_avg": round(earlier, 3), "recent_avg": round(recent, 3),
+                 "change": round(recent / earlier, 2)} for nodeid, runs, earlier, recent in rows]
+
+    def flakiness(self, last_runs: int = 30, browser: Optional[str] = None, environment: Optional[str] = None,
+                  limit: int = 20) -> List[Dict[str, object]]:
+        """
+        Lists the tests whose outcome flipped between passing and failing most often over the last runs.
+
+        The phases of a test in one run are collapsed to one outcome (failed if any phase failed or errored).
+        A test that always fails is broken, not flaky, so tests are ranked by flip rate (outcome changes between
+        consecutive runs on the same browser) and then by failure rate.
+
+        Args:
+            last_runs (int, optional): Number of most recent runs. Defaults to 30.
+            browser (Optional[str], optional): Only results of this browser.
+            environment (Optional[str], optional): Only runs of this environment (e.g. PROD).
+            limit (int, optional): Maximum number of tests returned. Defaults to 20.
+
+        Returns:
+            List[Dict[str, object]]: nodeid, runs (runs of the test per browser), failures, reruns, failure_rate and
+                flip_rate, flakiest first.
+        """
+        failed = ", ".join(f"'{outcome}'" for outcome in FAILED_OUTCOMES)
+        with self._lock:
+            window = self._window(last_runs, environment)
+            if window is None:
+                return []
+            rows = self._connection.execute(
+                f"WITH recent AS ("
+                f" SELECT run_id, test_id, browser, started_at, outcome FROM results WHERE started_at >= :start"
+                f" AND outcome != 'skipped' AND (:browser IS NULL OR browser = :browser)"
+                f" AND (:environment IS NULL OR environment = :environment)),"
+                # One outcome per run of a test on a browser: failed if any phase failed (e.g. a teardown error
+                # after a passed call)
+                f" per_run AS ("
+                f" SELECT run_id, test_id, browser, started_at, MAX(outcome IN ({failed})) AS failed,"
+                f" SUM(outcome = 'rerun') AS reruns, SUM(outcome != 'rerun') AS decided"
+                f" FROM recent GROUP BY run_id, test_id, browser),"
+                f" outcomes AS ("
+                f" SELECT test_id, failed,"
+                f" LAG(failed) OVER (PARTITION BY test_id, browser ORDER BY started_at, run_id) AS previous"
+                f" FROM per_run WHERE decided > 0),"
+                f" per_test AS ("
+                f" SELECT test_id, COUNT(*) AS runs, SUM(failed) AS failures,"
+                f" SUM(previous IS NOT NULL AND previous != failed) AS flips, SUM(previous IS NOT NULL) AS pairs"
+                f" FROM outcomes GROUP BY test_id),"
+                f" reruns AS (SELECT test_id, SUM(reruns) AS reruns FROM per_run GROUP BY test_id)"
+                f" SELECT t.nodeid, p.runs, p.failures, COALESCE(reruns.reruns, 0), p.flips, p.pairs"
+                f" FROM per_test p JOIN tests t ON t.test_id = p.test_id LEFT JOIN reruns ON reruns.test_id = p.test_id"
+                f" WHERE p.failures > 0 OR reruns.reruns > 0"
+                f" ORDER BY 1.0 * p.flips / MAX(p.pairs, 1) DESC, 1.0 * p.failures / p.runs DESC LIMIT :limit",
+                {"start": window[0], "browser": browser, "environment": environment, "limit": limit}).fetchall()
+        return [{"nodeid": nodeid, "runs": runs, "failures": failures, "reruns": reruns,
+                 "failure_rate": round(failures / max(runs, 1), 3), "flip_rate": round(flips / max(pairs, 1), 3)}
+                for nodeid, runs, failures, reruns, flips, pairs in rows]
+
+    def duration_percentiles(self, percentile: float = 95, last_runs: int = 30, browser: Optional[str] = None,
+                             environment: Optional[str] = None, nodeid: Optional[str] = None,
+                             limit: int = 20) -> List[Dict[str, object]]:
+        """
+        Returns a nearest-rank percentile of the call duration per test over the last runs.
+
+        Args:
+            percentile (float, optional): Percentile between 0 and 100. Defaults to 95.
+            last_runs (int, optional): Number of most recent runs. Defaults to 30.
+            browser (Optional[str], optional): Only results of this browser.
+            environment (Optional[str], optional): Only runs of this environment (e.g. PROD).
+            nodeid (Optional[str], optional): Only this test.
+            limit (int, optional): Maximum number of tests returned. Defaults to 20.
+
+        Returns:
+            List[Dict[str, object]]: nodeid, runs and duration (seconds), slowest first.
+        """
+        with self._lock:
+            window = self._window(last_runs, environment)
+            if window is None:
+                return []
+            rows = self._connection.execute(
+                "WITH ranked AS ("
+                " SELECT r.test_id, r.duration,"
+                " ROW_NUMBER() OVER (PARTITION BY r.test_id ORDER BY r.duration) AS position,"
+                " COUNT(*) OVER (PARTITION BY r.test_id) AS runs"
+                " FROM results r JOIN tests t ON t.test_id = r.test_id"
+                " WHERE r.started_at >= :start AND r.phase = 'call' AND (:nodeid IS NULL OR t.nodeid = :nodeid)"
+                " AND (:browser IS NULL OR r.browser = :browser) AND (:environment IS NULL OR r.environment = :environment))"
+                " SELECT t.nodeid, ranked.runs, ranked.duration FROM ranked JOIN tests t ON t.test_id = ranked.test_id"
+                " WHERE ranked.position = MAX(1, CAST(ranked.runs * :fraction AS INTEGER)"
+                " + (ranked.runs * :fraction > CAST(ranked.runs * :fraction AS INTEGER)))"
+                " ORDER BY ranked.duration DESC LIMIT :limit",
+                {"start": window[0], "fraction": percentile / 100, "nodeid": nodeid, "browser": browser,
+                 "environment": environment, "limit": limit}).fetchall()
+        return [{"nodeid": test, "runs": runs, "duration": round(duration, 3)} for test, runs, duration in rows]
+
+    def test_history(self, nodeid: str, last_runs: int = 30, environment: Optional[str] = None) -> List[Dict[str, object]]:
+        """
+        Returns the results of one test over the last runs, oldest first.
+
+        Args:
+            nodeid (str): Test node id.
+            last_runs (int, optional): Number of most recent runs. Defaults to 30.
+            environment (Optional[str], optional): Only runs of this environment (e.g. PROD).
+
+        Returns:
+            List[Dict[str, object]]: run_id, started_at, browser, phase, outcome and duration per result.
+        """
+        with self._lock:
+            window = self._window(last_runs, environment)
+            if window is None:
+                return []
+            rows = self._connection.execute(
+                "SELECT r.run_id, r.started_at, r.browser, r.phase, r.outcome, r.duration FROM results r "
+                "WHERE r.test_id = (SELECT test_id FROM tests WHERE nodeid = ?) AND r.started_at >= ? "
+                "AND (? IS NULL OR r.environment = ?) ORDER BY r.started_at",
+                (nodeid, window[0], environment, environment)).fetchall()
+        return [dict(zip(("run_id", "started_at", "browser", "phase", "outcome", "duration"), row)) for row in rows]
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+
+        Returns:
+            None
+        """
+        self._connection.close()
+
+
+def _print_table(rows: List[Dict[str, object]]) -> None:
+    if not rows:
+        print("no results")
+        return
+    columns = list(rows[0])
+    widths = [max(len(column), *(len(str(row[column])) for row in rows)) for column in columns]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+
+
+def main() -> None:
+    """
+    Command line interface: ingest a results file or query duration trends, flakiness and percentiles.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Query the test run history")
+    parser.add_argument("--db", default=DEFAULT_HISTORY_PATH, help="history database (default: .cache/run_history.sqlite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="add the run of a test_results.jsonl file")
+    ingest.add_argument("path", nargs="?", default=DEFAULT_RESULTS_PATH)
+    for name, help_text in (("trends", "tests that got slower"), ("flaky", "tests with flipping outcomes"),
+                            ("p95", "duration percentile per test"), ("history", "results of one test")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--last", type=int, default=30, help="number of most recent runs (default: 30)")
+        command.add_argument("--environment", help="only runs of this environment, e.g. PROD")
+        if name != "history":
+            command.add_argument("--browser", help="only results of this browser")
+            command.add_argument("--limit", type=int, default=20, help="maximum number of tests (default: 20)")
+        if name == "p95":
+            command.add_argument("--percentile", type=float, default=95)
+            command.add_argument("--test", help="only this test node id")
+        if name == "history":
+            command.add_argument("test", help="test node id")
+    args = parser.parse_args()
+    history = RunHistory(args.db)
+    try:
+        if args.command == "ingest":
+            print(f"{history.ingest_results_file(args.path)} results added")
+        elif args.command == "trends":
+            _print_table(history.duration_trends(args.last, args.browser, args.environment, args.limit))
+        elif args.command == "flaky":
+            _print_table(history.flakiness(args.last, args.browser, args.environment, args.limit))
+        elif args.command == "p95":
+            _print_table(history.duration_percentiles(args.percentile, args.last, args.browser, args.environment,
+                                                      args.test, args.limit))
+        else:
+            rows = history.test_history(args.test, args.last, args.environment)
+            for row in rows:
+                row["started_at"] = datetime.fromtimestamp(row["started_at"]).strftime("%Y-%m-%d %H:%M")
+            _print_table(rows)
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
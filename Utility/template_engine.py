@@ -0,0 +1,173 @@
+import html
+import os
+import re
+import threading
+from typing import Any, Dict, List, Tuple, Union
+from Helpers import custom_logger
+
+log = custom_logger.get_logger()
+
+# {NAME} inserts a value, {#NAME}...{/NAME} is a block. Only upper-case names are tags, so CSS braces are left alone.
+_TAG_PATTERN = re.compile(r"\{([#/]?)([A-Z][A-Z0-9_]*)\}")
+
+Segment = Union[str, Tuple[str, str], Tuple[str, str, list]]
+
+_cache: Dict[str, Tuple[int, "CompiledTemplate"]] = {}
+_cache_lock = threading.Lock()
+
+
+class TemplateSyntaxError(ValueError):
+    """
+    Raised when a template has unbalanced block tags.
+    """
+
+
+class RawHtml(str):
+    """
+    String inserted into a template without HTML escaping.
+    """
+
+
+def _parse(source: str, name: str) -> list:
+    """
+    Splits a template into literal text, value tags and nested blocks.
+
+    Args:
+        source (str): Template text.
+        name (str): Template name for error messages.
+
+    Returns:
+        list: Segments: str for text, ('value', NAME) and ('block', NAME, segments).
+
+    Raises:
+        TemplateSyntaxError: If a block is not closed or closed by the wrong tag.
+    """
+    root: list = []
+    stack: List[Tuple[str, list]] = [("", root)]
+    position = 0
+    for match in _TAG_PATTERN.finditer(source):
+        if match.start() > position:
+            stack[-1][1].append(source[position:match.start()])
+        position = match.end()
+        kind, tag = match.groups()
+        if kind == "#":
+            block: list = []
+            stack[-1][1].append(("block", tag, block))
+            stack.append((tag, block))
+        elif kind == "/":
+            if len(stack) == 1:
+                raise TemplateSyntaxError(f"{name}: {{/{tag}}} at offset {match.start()} closes no block")
+            if stack[-1][0] != tag:
+                raise TemplateSyntaxError(f"{name}: {{/{tag}}} at offset {match.start()} does not close "
+                                          f"{{#{stack[-1][0]}}}")
+            stack.pop()
+        else:
+            stack[-1][1].append(("value", tag))
+    if len(stack) > 1:
+        raise TemplateSyntaxError(f"{name}: block {{#{stack[-1][0]}}} is not closed")
+    if position < len(source):
+        root.append(source[position:])
+    return root
+
+
+class CompiledTemplate:
+    """
+    Template parsed once into segments and rendered in a single pass.
+
+    Values are HTML-escaped unless they are RawHtml. A block renders once per item when its value is a list,
+    once with the value as inner context when it is a dict, once when it is any other truthy value and not at all
+    when it is falsy. Names are looked up in the innermost context first. Unknown value tags are left as they are.
+    """
+
+    def __init__(self, source: str, name: str = "<template>"):
+        """
+        Compiles a template.
+
+        Args:
+            source (str): Template text.
+            name (str, optional): Template name for error messages.
+
+        Raises:
+            TemplateSyntaxError: If the blocks are unbalanced.
+        """
+        self.name = name
+        self.segments = _parse(source, name)
+
+    def render(self, context: Dict[str, Any]) -> str:
+        """
+        Renders the template.
+
+        Args:
+            context (Dict[str, Any]): Tag name -> value.
+
+        Returns:
+            str: The rendered text.
+        """
+        output: List[str] = []
+        self._render(self.segments, [context], output)
+        return "".join(output)
+
+    def _render(self, segments: list, contexts: List[Dict[str, Any]], output: List[str]) -> None:
+        for segment in segments:
+            if isinstance(segment, str):
+                output.append(segment)
+                continue
+            found, value = _lookup(contexts, segment[1])
+            if segment[0] == "value":
+                if not found:
+                    output.append(f"{{{segment[1]}}}")
+                elif isinstance(value, RawHtml):
+                    output.append(value)
+                else:
+                    output.append(html.escape(str(value)))
+            elif isinstance(value, (list, tuple)):
+                for item in value:
+                    self._render(segment[2], contexts + [item if isinstance(item, dict) else {}], output)
+            elif isinstance(value, dict):
+                self._render(segment[2], contexts + [value], output)
+            elif value:
+                self._render(segment[2], contexts, output)
+
+
+def _lookup(contexts: List[Dict[str, Any]], name: str) -> Tuple[bool, Any]:
+    for context in reversed(contexts):
+        if name in context:
+            return True, context[name]
+    return False, None
+
+
+def load_template(path: str) -> CompiledTemplate:
+    """
+    Returns the compiled template of a file, compiling it again only when the file's modification time changed.
+
+    Args:
+        path (str): Template file path.
+
+    Returns:
+        CompiledTemplate: The compiled template.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    with open(path, encoding="utf-8") as file:
+        template = CompiledTemplate(file.read(), os.path.basename(path))
+    with _cache_lock:
+        _cache[path] = (mtime, template)
+    log.info(f"Template {path} compiled ({len(template.segments)} top-level segments)")
+    return template
+
+
+def render_template(path: str, context: Dict[str, Any]) -> str:
+    """
+    Renders a template file.
+
+    Args:
+        path (str): Template file path.
+        context (Dict[str, Any]): Tag name -> value.
+
+    Returns:
+        str: The rendered text.
+    """
+    return load_template(path).render(context)
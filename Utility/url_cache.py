@@ -0,0 +1,258 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+from Helpers import custom_logger
+from Data import constant
+
+log = custom_logger.get_logger()
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.abspath(__file__ + "/../../"), ".cache", "url_results.sqlite")
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS url_results (
+    url TEXT PRIMARY KEY,
+    status_code INTEGER NOT NULL,
+    content_type TEXT,
+    content_length INTEGER,
+    etag TEXT,
+    last_modified TEXT,
+    checked_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_url_results_last_used ON url_results (last_used);
+CREATE TABLE IF NOT EXISTS cache_stats (
+    run_id TEXT NOT NULL,
+    hits INTEGER NOT NULL,
+    misses INTEGER NOT NULL,
+    revalidated INTEGER NOT NULL
+);
+"""
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalizes a URL so equivalent spellings share one cache entry.
+
+    The scheme and host are lowercased, default ports and fragments are dropped and an empty path becomes '/'.
+    The query string is kept as-is because parameter order can matter to CDNs.
+
+    Args:
+        url (str): The URL to normalize.
+
+    Returns:
+        str: The canonical URL, or the input unchanged if it is not an absolute HTTP(S) URL.
+    """
+    if not isinstance(url, str):
+        return url
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return url
+    netloc = parts.hostname.lower()
+    if parts.port and parts.port != _DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{parts.port}"
+    if parts.username:
+        netloc = f"{parts.username}{':' + parts.password if parts.password else ''}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def ttl_for_status(status_code: int) -> int:
+    """
+    Returns how long a result with this status stays fresh.
+
+    Args:
+        status_code (int): HTTP status code.
+
+    Returns:
+        int: Time to live in seconds from constant.URL_CACHE_TTL_SECONDS (0 means never served from cache).
+    """
+    return constant.URL_CACHE_TTL_SECONDS.get(status_code // 100, 0)
+
+
+class UrlResultCache:
+    """
+    SQLite-backed cache of URL status results shared across runs and pytest-xdist workers.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = constant.URL_CACHE_MAX_ENTRIES):
+        """
+        Opens (and creates if needed) the cache database.
+
+        Args:
+            path (str, optional): Path of the SQLite file. Defaults to .cache/url_results.sqlite in the project root.
+            max_entries (int, optional): Entries kept after evict_least_recently_used. Defaults to constant.URL_CACHE_MAX_ENTRIES.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0}
+
+    def lookup(self, url: str) -> Optional[Dict[str, object]]:
+        """
+        Returns the cached entry for a URL and marks it as recently used.
+
+        Args:
+            url (str): The URL (canonicalized internally).
+
+        Returns:
+            Optional[Dict[str, object]]: Entry with status_code, content_type, content_length, etag, last_modified,
+                checked_at and a 'fresh' flag, or None if the URL is not cached.
+        """
+        key = canonicalize_url(url)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status_code, content_type, content_length, etag, last_modified, checked_at "
+                "FROM url_results WHERE url = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE url_results SET last_used = ? WHERE url = ?", (time.time(), key))
+        entry = dict(zip(("status_code", "content_type", "content_length", "etag", "last_modified", "checked_at"), row))
+        entry["fresh"] = time.time() - entry["checked_at"] < ttl_for_status(entry["status_code"])
+        return entry
+
+    def store(self, url: str, status_code: int, content_type: Optional[str] = None, content_length: Optional[int] = None,
+              etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Stores or replaces the result for a URL.
+
+        Args:
+            url (str): The URL (canonicalized internally).
+            status_code (int): Final HTTP status code.
+            content_type (Optional[str], optional): Content-Type of the response.
+            content_length (Optional[int], optional): Content-Length of the response.
+            etag (Optional[str], optional): ETag header used for If-None-Match revalidation.
+            last_modified (Optional[str], optional): Last-Modified header used for If-Modified-Since revalidation.
+
+        Returns:
+            None
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO url_results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (canonicalize_url(url), status_code, content_type, content_length, etag, last_modified, now, now))
+
+    def mark_revalidated(self, url: str) -> None:
+        """
+        Restarts the TTL of an entry after the server answered a conditional request with 304 Not Modified.
+
+        Args:
+            url (str): The URL (canonicalized internally).
+
+        Returns:
+            None
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute("UPDATE url_results SET checked_at = ?, last_used = ? WHERE url = ?",
+                                     (now, now, canonicalize_url(url)))
+            self.stats["revalidated"] += 1
+
+    def record(self, outcome: str) -> None:
+        """
+        Counts a cache hit or miss.
+
+        Args:
+            outcome (str): 'hits' or 'misses'.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def evict_least_recently_used(self, max_stats_runs: int = constant.URL_CACHE_STATS_MAX_RUNS) -> int:
+        """
+        Deletes the least recently used entries beyond max_entries, and the hit/miss counters of all but the
+        most recent runs.
+
+        Args:
+            max_stats_runs (int, optional): Runs whose counters are kept. Defaults to constant.URL_CACHE_STATS_MAX_RUNS.
+
+        Returns:
+            int: Number of entries deleted.
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM url_results WHERE url IN "
+                "(SELECT url FROM url_results ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+            # Rows are only appended, so the largest rowid of a run tells how recent it is
+            self._connection.execute(
+                "DELETE FROM cache_stats WHERE run_id NOT IN "
+                "(SELECT run_id FROM cache_stats GROUP BY run_id ORDER BY MAX(rowid) DESC LIMIT ?)", (max_stats_runs,))
+        return cursor.rowcount
+
+    def flush_stats(self, run_id: str) -> None:
+        """
+        Persists this process's hit/miss counters under the run id so the controller can aggregate all workers.
+
+        Args:
+            run_id (str): Identifier shared by every worker of the test run.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._connection.execute("INSERT INTO cache_stats VALUES (?, ?, ?, ?)",
+                                     (run_id, self.stats["hits"], self.stats["misses"], self.stats["revalidated"]))
+
+    def get_run_stats(self, run_id: str) -> Dict[str, int]:
+        """
+        Aggregates hit/miss counters flushed by every process of a run.
+
+        Args:
+            run_id (str): Identifier shared by every worker of the test run.
+
+        Returns:
+            Dict[str, int]: Total hits, misses and revalidated entries.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COALESCE(SUM(hits), 0), COALESCE(SUM(misses), 0), COALESCE(SUM(revalidated), 0) "
+                "FROM cache_stats WHERE run_id = ?", (run_id,)).fetchone()
+        return dict(zip(("hits", "misses", "revalidated"), row))
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+
+        Returns:
+            None
+        """
+        self._connection.close()
+
+
+_default_cache: Optional[UrlResultCache] = None
+
+
+def get_url_cache() -> Optional[UrlResultCache]:
+    """
+    Returns the process-wide URL result cache.
+
+    Returns:
+        Optional[UrlResultCache]: The cache, or None if caching is disabled.
+    """
+    return _default_cache
+
+
+def set_url_cache(cache: Optional[UrlResultCache]) -> None:
+    """
+    Replaces the process-wide URL result cache.
+
+    Args:
+        cache (Optional[UrlResultCache]): The cache to use, or None to disable caching.
+
+    Returns:
+        None
+    """
+    global _default_cache
+    _default_cache = cache
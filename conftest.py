@@ -1,31 +1,251 @@
+import os
+import uuid
 import pytest
 from py.xml import html
 
-from Helpers import driver_helpers
+from Helpers import driver_helpers, wait_engine, overlay_suppression, custom_logger, step_timing, impact_analysis, \
+    state_checkpoints
+from Helpers.driver_pool import ProfiledDriverPools
+from Helpers.duration_scheduling import DurationHistory, DurationSchedulingPlugin
+from Helpers.grid_sharding import get_grid_shard_plugin, get_grid_url
+from Data import constant
+from Utility import api_services, url_cache, http_metrics
+from Utility.results_sidecar import ResultsSidecarPlugin
+from Utility.run_history import RunHistory
+
+log = custom_logger.get_logger()
+
+HTTP_METRICS_JSON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "http_metrics.json")
+
+STEP_TRACE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "step_trace.json")
+
+# Step span trees of every test, collected on the controller from the test reports
+step_span_trees = []
+
+DRIVER_FACTORIES = {
+    "chrome": driver_helpers.initialize_chrome_driver,
+    "firefox": driver_helpers.initialize_firefox_driver,
+    "safari": driver_helpers.initialize_safari_driver}
+
+# Test outcomes per browser, collected on the controller from the test reports
+browser_results = {}
+
+
+def get_browsers(config) -> list:
+    """
+    Parses the comma-separated -B option.
+
+    Args:
+        config: Pytest config object.
+
+    Returns:
+        list: Browser names in the order given, e.g. ['chrome', 'firefox'].
+
+    Raises:
+        pytest.UsageError: If a browser is not supported.
+    """
+    browsers = [browser.strip().lower() for browser in config.getoption("Browser").split(",") if browser.strip()]
+    unsupported = [browser for browser in browsers if browser not in DRIVER_FACTORIES]
+    if unsupported or not browsers:
+        raise pytest.UsageError(f"Unsupported browser(s) in -B: {unsupported}. Options are: {', '.join(DRIVER_FACTORIES)}")
+    return browsers
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    """
+    Pytest fixture that provides pools of pre-launched WebDriver instances for the session, one per browser profile.
+
+    Each pytest-xdist worker is a separate process, so every worker gets its own pools. With --grid-url the
+    drivers are remote sessions on the grid assigned to the worker.
+
+    Args:
+        request: Pytest request object containing command line options.
+
+    Returns:
+        ProfiledDriverPools: Pools of drivers, one per browser and browser profile in use.
+    """
+    headless_option = request.config.getoption("Headless")
+    grid_url = get_grid_url(request.config)
+
+    def factory(browser, profile):
+        if grid_url:
+            return driver_helpers.initialize_remote_driver(browser, grid_url, headless_option, profile)
+        return DRIVER_FACTORIES[browser](headless_option, profile)
+
+    pools = ProfiledDriverPools(factory=factory,
+                                size=int(request.config.getoption("DriverPoolSize")),
+                                max_uses=int(request.config.getoption("DriverMaxUses")))
+    yield pools
+    pools.shutdown()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def http_client():
+    """
+    Pytest fixture that provides the keep-alive HTTP client shared by every URL check in the session.
+
+    Returns:
+        HttpClient: Pooled client with per-host rate limiting, retries and circuit breaking, also used by
+            api_services.return_status_code_of_url.
+    """
+    client = api_services.HttpClient(resilience=api_services.HostResilience())
+    api_services.set_http_client(client)
+    yield client
+    client.log_connection_stats()
+    client.resilience.log_stats()
+    client.close()
+    api_services.set_http_client(None)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def url_result_cache(request):
+    """
+    Pytest fixture that provides the persistent URL result cache used by URL status checks.
+
+    Args:
+        request: Pytest request object containing command line options.
+
+    Returns:
+        UrlResultCache: The cache, or None when disabled with --no-url-cache.
+    """
+    if request.config.getoption("NoUrlCache"):
+        yield None
+        return
+    cache = url_cache.UrlResultCache()
+    url_cache.set_url_cache(cache)
+    yield cache
+    log.info(f"URL cache: {cache.stats['hits']} hits, {cache.stats['misses']} misses, "
+             f"{cache.stats['revalidated']} revalidated")
+    cache.flush_stats(os.environ["UI_AUTOMATION_RUN_ID"])
+    url_cache.set_url_cache(None)
+    cache.close()
+
+
+@pytest.fixture(scope="session")
+def state_checkpoint_store():
+    """
+    Pytest fixture that provides the store of named browser-state checkpoints for the session.
+
+    Returns:
+        CheckpointStore: Store persisted in .cache/state_checkpoints.json.
+    """
+    store = state_checkpoints.CheckpointStore()
+    yield store
+    log.info(f"State checkpoints: {store.stats['restored']} restored, {store.stats['saved']} saved, "
+             f"{store.stats['stale']} stale")
+
+
+@pytest.fixture
+def state_checkpoint(request, state_checkpoint_store, browser_name):
+    """
+    Pytest fixture that saves and restores named browser-state checkpoints, so tests that only need the state
+    at the end of a UI flow can skip the flow.
+
+    Args:
+        request: Pytest request object containing command line options.
+        state_checkpoint_store: Session-scoped checkpoint store.
+        browser_name: Browser the test class runs on.
+
+    Returns:
+        StateCheckpoints: Checkpoints of the current server and browser.
+    """
+    return state_checkpoints.StateCheckpoints(state_checkpoint_store, request.config.getoption("Server"), browser_name,
+                                              restore=not request.config.getoption("NoStateCheckpoints"))
+
+
+@pytest.fixture(scope="class")
+def browser_name(request):
+    """
+    Pytest fixture that provides the browser a test class runs on.
+
+    With several browsers in -B, test classes are parametrized over them by pytest_generate_tests.
+
+    Args:
+        request: Pytest request object containing command line options.
+
+    Returns:
+        str: Browser name, e.g. 'chrome'.
+    """
+    return getattr(request, "param", None) or get_browsers(request.config)[0]
+
+
+def pytest_generate_tests(metafunc):
+    """
+    Runs every test class that uses a browser once per browser listed in -B (e.g. -B chrome,firefox).
+
+    Args:
+        metafunc: Pytest metafunc object of the test being collected.
+
+    Returns:
+        None
+    """
+    browsers = get_browsers(metafunc.config)
+    if len(browsers) > 1 and "browser_name" in metafunc.fixturenames:
+        metafunc.parametrize("browser_name", browsers, indirect=True, scope="class")
 
 
 @pytest.fixture(scope="class")
-def initiate_browser_webdriver(request):
+def initiate_browser_webdriver(request, driver_pool, browser_name):
     """
-    Pytest fixture that initializes and provides a WebDriver instance for test classes.
+    Pytest fixture that checks out a WebDriver instance from the pool for test classes.
+
+    The browser profile is taken from the class's browser_profile marker and defaults to 'full'. If a test of the
+    class failed, the driver is quit instead of being reset and returned to the pool.
     
     Args:
         request: Pytest request object containing command line options and test context.
+        driver_pool: Session-scoped pools of pre-launched drivers.
+        browser_name: Browser the test class runs on.
     
     Returns:
-        WebDriver: Configured WebDriver instance based on command line options.
+        WebDriver: Configured WebDriver instance based on command line options, reset to a clean state.
     """
-    browser_option = request.config.getoption("Browser")
-    server_option = request.config.getoption("Server")
-    headless_option = request.config.getoption("Headless")
-    request.cls.server = server_option
-    driver_options = {
-        "chrome": driver_helpers.initialize_chrome_driver,
-        "firefox": driver_helpers.initialize_firefox_driver,
-        "safari": driver_helpers.initialize_safari_driver}
-    driver = driver_options[browser_option](headless_option)
+    request.cls.server = request.config.getoption("Server")
+    request.cls.browser = browser_name
+    profile_marker = request.node.get_closest_marker("browser_profile")
+    pool = driver_pool.get(profile_marker.args[0] if profile_marker else constant.DEFAULT_BROWSER_PROFILE, browser_name)
+    driver = pool.checkout()
+    request.cls.tests_failed = False
+    # Baseline for the bytes of the class-level navigation, reported with the class's first test
+    request.cls.class_setup_transfer_start = driver_helpers.get_transferred_bytes(driver)
     yield driver
-    driver.quit()
+    # A browser left in an unknown state by a failed test is recycled rather than reset
+    pool.release(driver, healthy=not request.cls.tests_failed)
+
+
+@pytest.fixture(autouse=True)
+def record_transferred_bytes(request):
+    """
+    Pytest fixture that records how many bytes the browser transferred during each test.
+
+    The value is attached to the test report as the 'bytes_transferred' user property. When a test navigates,
+    only the bytes of the last loaded page are counted. The bytes transferred by the class fixtures (e.g. the
+    page opened for the whole class) are attached to the class's first test as 'class_setup_bytes_transferred'.
+
+    Args:
+        request: Pytest request object containing test context.
+
+    Returns:
+        None
+    """
+    driver = getattr(request.cls, "driver", None) if request.cls else None
+    if driver is None:
+        yield
+        return
+    start_origin, start_bytes = driver_helpers.get_transferred_bytes(driver)
+    class_setup_start = getattr(request.cls, "class_setup_transfer_start", None)
+    if class_setup_start is not None:
+        request.cls.class_setup_transfer_start = None
+        setup_origin, setup_bytes = class_setup_start
+        transferred = start_bytes - setup_bytes if start_origin == setup_origin else start_bytes
+        request.node.user_properties.append(("class_setup_bytes_transferred", transferred))
+        log.info(f"{request.node.nodeid.rpartition('::')[0]} class setup transferred {transferred} bytes")
+    yield
+    end_origin, end_bytes = driver_helpers.get_transferred_bytes(driver)
+    transferred = end_bytes - start_bytes if end_origin == start_origin else end_bytes
+    request.node.user_properties.append(("bytes_transferred", transferred))
+    log.info(f"{request.node.nodeid} transferred {transferred} bytes")
 
 
 def pytest_addoption(parser):
@@ -42,8 +262,9 @@ def pytest_addoption(parser):
     group._addoption(
         "-B",
         dest="Browser",
-        default="chrome",
-        help="Browser to use. Options are: chrome, firefox and safari. Example: -B firefox",
+        default=constant.DEFAULT_BROWSER,
+        help="Browser(s) to use. Options are: chrome, firefox and safari; separate several with commas to run "
+             "every test class on each of them. Example: -B firefox or -B chrome,firefox",
     )
     group._addoption(
         "-S",
@@ -57,6 +278,146 @@ def pytest_addoption(parser):
         default=False,
         help="Run in headless mode. Example: -H True",
     )
+    group._addoption(
+        "--driver-pool-size",
+        dest="DriverPoolSize",
+        default=1,
+        help="Number of browsers pre-launched per worker. Example: --driver-pool-size 2",
+    )
+    group._addoption(
+        "--driver-max-uses",
+        dest="DriverMaxUses",
+        default=20,
+        help="Test classes a pooled browser serves before it is relaunched. Example: --driver-max-uses 10",
+    )
+    group._addoption(
+        "--no-url-cache",
+        dest="NoUrlCache",
+        action="store_true",
+        default=False,
+        help="Check every URL over the network instead of using the persistent URL result cache.",
+    )
+    group._addoption(
+        "--no-duration-scheduling",
+        dest="NoDurationScheduling",
+        action="store_true",
+        default=False,
+        help="Use the default pytest-xdist distribution instead of longest-first scheduling of test classes.",
+    )
+    group._addoption(
+        "--step-trace",
+        dest="StepTrace",
+        default="chrome",
+        choices=["chrome", "json", "off"],
+        help="Format of the step timing export written to step_trace.json: chrome (chrome://tracing), json or off. "
+             "Example: --step-trace json",
+    )
+    group._addoption(
+        "--no-state-checkpoints",
+        dest="NoStateCheckpoints",
+        action="store_true",
+        default=False,
+        help="Always run the UI flows instead of restoring saved browser-state checkpoints.",
+    )
+    group._addoption(
+        "--grid-url",
+        dest="GridUrl",
+        default=None,
+        help="Run the browsers on Selenium Grid(s) instead of locally; separate several grids with commas to spread "
+             "the xdist workers over them by free slots. Example: --grid-url http://localhost:4444",
+    )
+    group._addoption(
+        "--no-run-history",
+        dest="NoRunHistory",
+        action="store_true",
+        default=False,
+        help="Do not add this run's outcomes and durations to the run history database (.cache/run_history.sqlite).",
+    )
+    group._addoption(
+        "--run-id",
+        dest="RunId",
+        default=None,
+        help="Id recorded for this run in the results file and run history. A run with an id already in the history "
+             "is not added again. Defaults to a new id per run. Example: --run-id ci-build-1234",
+    )
+    group._addoption(
+        "--changed-since",
+        dest="ChangedSince",
+        default=None,
+        help="Only run the tests affected by the changes since a git revision (locators, page objects, tests). "
+             "Runs everything if a shared helper or the configuration changed. Example: --changed-since origin/main",
+    )
+
+
+def pytest_configure(config):
+    """
+    Validates the -B option, assigns an id to the test run (--run-id or a new one), shared with pytest-xdist
+    workers through the environment, registers the duration-aware scheduling, Selenium Grid sharding and results
+    file plugins on the controller and deletes state checkpoints left by an earlier run.
+
+    Args:
+        config: Pytest config object.
+
+    Returns:
+        None
+    """
+    browsers = get_browsers(config)
+    if not hasattr(config, "workerinput"):
+        # Always set on the controller: an id left in the environment by an earlier run would make the run history
+        # skip this run's results. Workers inherit it.
+        os.environ["UI_AUTOMATION_RUN_ID"] = config.getoption("RunId") or uuid.uuid4().hex
+        config.pluginmanager.register(
+            DurationSchedulingPlugin(DurationHistory(), schedule=not config.getoption("NoDurationScheduling")),
+            "duration_scheduling")
+        get_grid_shard_plugin(config, browsers)
+        if not config.option.collectonly:
+            config.pluginmanager.register(ResultsSidecarPlugin(run={
+                "run_id": os.environ["UI_AUTOMATION_RUN_ID"], "browsers": browsers,
+                "environment": config.getoption("Server"), "headless": str(config.getoption("Headless"))}),
+                "results_sidecar")
+            # Checkpoints hold session cookies and only live for one run; drop any left by a killed run
+            state_checkpoints.CheckpointStore().clear()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """
+    Starts one pytest-xdist worker per free Selenium Grid slot with -n auto and --grid-url.
+
+    Args:
+        config: Pytest config object.
+
+    Returns:
+        int: Number of workers, or None to use the xdist default (one per CPU).
+    """
+    plugin = get_grid_shard_plugin(config, get_browsers(config))
+    return sum(plugin.free_slots.values()) if plugin else None
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Deselects the tests not affected by the changes since the --changed-since revision.
+
+    Args:
+        config: Pytest config object.
+        items: Collected test items, modified in place.
+
+    Returns:
+        None
+    """
+    base = config.getoption("ChangedSince")
+    if not base:
+        return
+    affected = impact_analysis.DependencyGraph().affected_tests(impact_analysis.git_changes(base))
+    if affected == impact_analysis.ALL_TESTS:
+        log.info(f"Changes since {base} can affect every test, running all {len(items)} tests")
+        return
+    selected = [item for item in items if item.nodeid.partition("[")[0] in affected]
+    deselected = [item for item in items if item.nodeid.partition("[")[0] not in affected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+    log.info(f"Changes since {base}: {len(selected)} affected tests selected, {len(deselected)} deselected")
 
 
 def pytest_html_results_summary(prefix, session):
@@ -71,20 +432,69 @@ def pytest_html_results_summary(prefix, session):
         None
     """
     # Get browser and environment from pytest config
-    browser = session.config.getoption("Browser", default="chrome")
+    browsers = get_browsers(session.config)
     server = session.config.getoption("Server", default="PROD")
     headless = session.config.getoption("Headless", default=False)
     
     prefix.extend([
         html.p("This UI Automation regression framework is created by ANSHUL BIDHURI"),
-        html.p(f"Browser: {browser.title()} | Environment: {server} | Headless: {headless}", 
+        html.p(f"Browser: {', '.join(browser.title() for browser in browsers)} | Environment: {server} | Headless: {headless}", 
                id="test-config-info", style="color: #666; font-size: 14px; margin: 5px 0;")
     ])
+    if not session.config.getoption("NoUrlCache"):
+        # Read from the database so counts from every xdist worker are included
+        cache = url_cache.UrlResultCache()
+        cache_stats = cache.get_run_stats(os.environ.get("UI_AUTOMATION_RUN_ID", ""))
+        cache.close()
+        prefix.append(html.p(f"URL cache: {cache_stats['hits']} hits | {cache_stats['misses']} misses | "
+                             f"{cache_stats['revalidated']} revalidated",
+                             id="url-cache-info", style="color: #666; font-size: 14px; margin: 5px 0;"))
+    prefix.extend(_browser_results_summary_table())
+    prefix.extend(_http_metrics_summary_tables())
+
+
+def _browser_results_summary_table() -> list:
+    """
+    Builds the per-browser results table for the report summary.
+
+    Returns:
+        list: HTML elements, empty if no test ran.
+    """
+    if not browser_results:
+        return []
+    outcomes = ("passed", "failed", "skipped", "error")
+    header = html.tr([html.th("Browser")] + [html.th(outcome.title()) for outcome in outcomes])
+    rows = [html.tr([html.td(browser.title())] + [html.td(counts.get(outcome, 0)) for outcome in outcomes],
+                    **{"data-browser": browser})
+            for browser, counts in browser_results.items()]
+    return [html.h3("Results per browser"), html.table([header] + rows, id="browser-results")]
+
+
+def _http_metrics_summary_tables() -> list:
+    """
+    Builds the HTTP latency tables (per host and per page section) for the report summary.
+
+    Returns:
+        list: HTML elements, empty if no HTTP request was recorded.
+    """
+    elements = []
+    for dimension, entries in http_metrics.registry.summary().items():
+        if not entries:
+            continue
+        header = html.tr([html.th(dimension.title()), html.th("Requests"), html.th("Errors"), html.th("Bytes"),
+                          html.th("p50 (ms)"), html.th("p95 (ms)"), html.th("p99 (ms)"), html.th("TTFB p95 (ms)")])
+        rows = [html.tr([html.td(key), html.td(metrics["requests"]), html.td(metrics["errors"]), html.td(metrics["bytes"]),
+                         html.td(metrics["total_p50_ms"]), html.td(metrics["total_p95_ms"]), html.td(metrics["total_p99_ms"]),
+                         html.td(metrics["ttfb_p95_ms"])])
+                for key, metrics in sorted(entries.items())]
+        elements.append(html.h3(f"HTTP latency per {dimension}"))
+        elements.append(html.table([header] + rows, id=f"http-metrics-{dimension}"))
+    return elements
 
 
 def pytest_html_results_table_header(cells):
     """
-    Customizes the HTML report table header by adding a Description column.
+    Customizes the HTML report table header by adding Browser and Description columns.
     
     Args:
         cells: List of HTML table header cells to be modified.
@@ -93,13 +503,45 @@ def pytest_html_results_table_header(cells):
         None
     """
     cells.insert(1, html.th("Description"))
+    cells.insert(1, html.th("Browser"))
     cells.pop(2)
     cells.pop()  # to remove last column name
 
 
+def _render_step_tree(span, total=None, depth=0):
+    """
+    Renders a step span tree as nested collapsible rows with duration bars scaled to the whole test.
+
+    Args:
+        span (dict): Span recorded by Helpers.step_timing, or None.
+        total (float, optional): Duration of the root span in seconds, used to scale the bars.
+        depth (int, optional): Nesting level of the span.
+
+    Returns:
+        The HTML element, or an empty string if no spans were recorded.
+    """
+    if not span:
+        return ""
+    total = total or span["duration"] or 1
+    width = max(round(span["duration"] / total * 100, 1), 0.5)
+    colour = "#9cc5a1" if span["outcome"] == "passed" else "#e8a09a"
+    label = f"{'Steps' if depth == 0 else span['name']} {round(span['duration'] * 1000)} ms"
+    if span["locator"]:
+        label += f" · {span['locator']}"
+    if span["outcome"] != "passed":
+        label += f" · {span['outcome']}"
+    bar = html.div(label, style=f"width: {width}%; min-width: max-content; background: {colour}; "
+                                f"font-size: 11px; white-space: nowrap; margin: 1px 0;")
+    if not span["children"]:
+        return html.div(bar, style="margin-left: 12px;")
+    return html.details(html.summary(bar, style="display: flex;"),
+                        [_render_step_tree(child, total, depth + 1) for child in span["children"]],
+                        style=f"margin-left: {12 if depth else 0}px;")
+
+
 def pytest_html_results_table_row(report, cells):
     """
-    Customizes HTML report table rows by adding test description data.
+    Customizes HTML report table rows by adding the browser, test description data and the step timing breakdown.
     
     Args:
         report: Pytest test report object containing test execution details.
@@ -108,7 +550,8 @@ def pytest_html_results_table_row(report, cells):
     Returns:
         None
     """
-    cells.insert(1, html.td(report.description))
+    cells.insert(1, html.td(report.description, _render_step_tree(getattr(report, "step_spans", None))))
+    cells.insert(1, html.td(getattr(report, "browser", "").title()))
     cells.pop(2)
     cells.pop()  # to remove last row values
 
@@ -116,7 +559,9 @@ def pytest_html_results_table_row(report, cells):
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     """
-    Pytest hook that captures test function docstrings for HTML report descriptions.
+    Pytest hook that captures test function docstrings for HTML report descriptions, attaches the recorded
+    step span tree to the report of the call phase (or of a failed setup) and flags test classes with a failed
+    test, so their driver is recycled.
     
     Args:
         item: Pytest test item containing test function information.
@@ -128,3 +573,120 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
     report.description = str(item.function.__doc__)
+    if report.failed and item.cls is not None:
+        item.cls.tests_failed = True
+    callspec = getattr(item, "callspec", None)
+    report.browser = callspec.params["browser_name"] if callspec and "browser_name" in callspec.params \
+        else get_browsers(item.config)[0]
+    report.step_spans = None
+    if call.when == "call" or (call.when == "setup" and not report.passed):
+        report.step_spans = step_timing.stop_recording()
+        if report.step_spans:
+            report.step_spans["outcome"] = report.outcome
+            report.step_spans["worker"] = os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    """
+    Starts recording the test's step spans before its fixtures are set up, so page opens in fixtures are included.
+
+    Args:
+        item: Pytest test item about to run.
+
+    Returns:
+        None
+    """
+    step_timing.start_recording(item.nodeid)
+    yield
+
+
+def pytest_runtest_logreport(report):
+    """
+    Collects the step span trees and per-browser outcomes attached to test reports (on the controller when
+    running under pytest-xdist).
+
+    Args:
+        report: Test report of one phase.
+
+    Returns:
+        None
+    """
+    if getattr(report, "step_spans", None):
+        step_span_trees.append(report.step_spans)
+    if report.when == "call" or (report.when == "setup" and not report.passed):
+        outcome = "error" if report.when == "setup" and report.failed else report.outcome
+        counts = browser_results.setdefault(getattr(report, "browser", constant.DEFAULT_BROWSER), {})
+        counts[outcome] = counts.get(outcome, 0) + 1
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Logs framework performance summaries once the test session finishes, deletes the state checkpoints of the run
+    and records the page-object methods each test called, for --changed-since.
+
+    Args:
+        session: Pytest session object.
+        exitstatus: Exit status of the test run.
+
+    Returns:
+        None
+    """
+    wait_engine.log_wait_latency_summary()
+    if hasattr(session.config, "workeroutput"):
+        session.config.workeroutput["http_metrics"] = http_metrics.registry.to_dict()
+    else:
+        http_metrics.registry.export_json(HTTP_METRICS_JSON_PATH)
+    if not hasattr(session.config, "workerinput") and not session.config.getoption("NoUrlCache"):
+        cache = url_cache.UrlResultCache()
+        evicted = cache.evict_least_recently_used()
+        cache.close()
+        log.info(f"URL cache: {evicted} least recently used entries evicted")
+    overlay_suppression.log_overlay_suppression_summary()
+    trace_format = session.config.getoption("StepTrace")
+    if not hasattr(session.config, "workerinput") and trace_format != "off" and step_span_trees:
+        step_timing.export_spans(step_span_trees, STEP_TRACE_PATH, trace_format)
+        log.info(f"Step timings of {len(step_span_trees)} tests written to {STEP_TRACE_PATH} ({trace_format} format)")
+    if not hasattr(session.config, "workerinput"):
+        state_checkpoints.CheckpointStore().clear()
+    if not hasattr(session.config, "workerinput") and step_span_trees:
+        observed = {}
+        for tree in step_span_trees:
+            observed.setdefault(tree["name"].partition("[")[0], set()).update(impact_analysis.members_from_spans(tree))
+        impact_analysis.record_dependencies(observed)
+
+
+def pytest_unconfigure(config):
+    """
+    Adds the outcomes and durations of the finished run to the run history database, once the results file
+    has been completed.
+
+    Args:
+        config: Pytest config object.
+
+    Returns:
+        None
+    """
+    results_plugin = config.pluginmanager.get_plugin("results_sidecar")
+    if results_plugin is None or config.getoption("NoRunHistory") or not os.path.exists(results_plugin.path):
+        return
+    history = RunHistory()
+    history.ingest_results_file(results_plugin.path)
+    history.close()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """
+    Merges the HTTP timing metrics of a finished pytest-xdist worker into the controller's registry.
+
+    Args:
+        node: The worker node that finished.
+        error: Error message if the worker crashed, else None.
+
+    Returns:
+        None
+    """
+    worker_metrics = getattr(node, "workeroutput", {}).get("http_metrics")
+    if worker_metrics:
+        http_metrics.registry.merge_dict(worker_metrics)
@@ -1,4 +1,5 @@
 ########## HOME PAGE #######################
+campaign_modal_xpath = "//div[contains(@class,'campaignModal')]"
 campaign_pop_up_xpath = "//div[contains(@class,'campaignModal')]//div[contains(@class,'closeButton')]//button"
 famous_destinations_title_xpath = "//div[contains(@class,'chipContainer')]//button"
 famous_destinations_link_under_each_title_xpath = "//div[contains(@class,'destinationCardContainer')]//a"
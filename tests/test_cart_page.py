@@ -5,6 +5,24 @@ from Pages.activitypage import ActivityPage
 from Data import constant
 
 
+def add_first_recommended_activity_to_cart(home_page_obj, cart_page_obj, activity_page_obj):
+    """
+    Adds the first recommended activity to the cart, starting from the cart page, and opens the cart
+
+    Returns:
+        str: Price shown on the activity page
+    """
+    cart_page_obj.click_explore_activities_button()
+    home_page_obj.click_first_recommended_activity_for_you()
+    home_page_obj.switch_to_newest_tab()
+    activity_page_obj.click_first_active_date()
+    activity_page_obj.click_select_activity_button()
+    price_on_activity_page = activity_page_obj.get_activity_price()
+    activity_page_obj.click_add_activity_to_cart_button()
+    activity_page_obj.click_view_cart_button()
+    return price_on_activity_page
+
+
 @pytest.mark.AdditeminCart
 @pytest.mark.CartPage
 class TestAddItemInCart:
@@ -12,10 +30,10 @@ class TestAddItemInCart:
     @pytest.fixture(scope="class", autouse=True)
     def initiate_driver(self, request, initiate_browser_webdriver):
         request.cls.driver = initiate_browser_webdriver
-        request.cls.driver.get(constant.CART_PAGE_URL.get(request.cls.server))
         request.cls.home_page_obj = Homepage(request.cls.driver)
         request.cls.cart_page_obj = CartPage(request.cls.driver)
         request.cls.activity_page_obj = ActivityPage(request.cls.driver)
+        request.cls.cart_page_obj.open_page(constant.CART_PAGE_URL.get(request.cls.server))
 
     def test_empty_cart_message_visibility(self):
         """
@@ -24,17 +42,35 @@ class TestAddItemInCart:
         check.equal(self.cart_page_obj.check_empty_cart_message_visibility(), True, msg="Empty cart message is not visible")
 
 
-    def test_add_item_in_cart(self):
+    def test_add_item_in_cart(self, state_checkpoint):
         """
         Test Adds an item in cart flow and compare the price present on cart page and activity page
         """
-        self.cart_page_obj.click_explore_activities_button()
-        self.home_page_obj.click_first_recommended_activity_for_you()
-        self.home_page_obj.switch_to_newest_tab()
-        self.activity_page_obj.click_first_active_date()
-        self.activity_page_obj.click_select_activity_button()
-        price_on_activity_page = self.activity_page_obj.get_activity_price()
-        self.activity_page_obj.click_add_activity_to_cart_button()
-        self.activity_page_obj.click_view_cart_button()
+        price_on_activity_page = add_first_recommended_activity_to_cart(self.home_page_obj, self.cart_page_obj,
+                                                                        self.activity_page_obj)
         price_on_cart_page = self.cart_page_obj.get_price_of_cart_item()
+        state_checkpoint.save("cart_with_one_item", self.cart_page_obj)
         check.equal(price_on_activity_page, price_on_cart_page, msg="Item price on cart page is not matching")
+
+
+@pytest.mark.CartPage
+class TestCartWithItem:
+
+    @pytest.fixture(scope="class", autouse=True)
+    def initiate_driver(self, request, initiate_browser_webdriver):
+        request.cls.driver = initiate_browser_webdriver
+        request.cls.home_page_obj = Homepage(request.cls.driver)
+        request.cls.cart_page_obj = CartPage(request.cls.driver)
+        request.cls.activity_page_obj = ActivityPage(request.cls.driver)
+        request.cls.cart_page_obj.open_page(constant.CART_PAGE_URL.get(request.cls.server))
+
+    def test_cart_item_price_is_shown(self, state_checkpoint):
+        """
+        Checks that a cart with an item shows its price; the cart is restored from the checkpoint saved by
+        TestAddItemInCart when one exists
+        """
+        state_checkpoint.reach("cart_with_one_item", self.cart_page_obj,
+                               build=lambda: add_first_recommended_activity_to_cart(
+                                   self.home_page_obj, self.cart_page_obj, self.activity_page_obj),
+                               verify=self.cart_page_obj.has_cart_items)
+        check.is_true(self.cart_page_obj.get_price_of_cart_item(), msg="Cart item price is not shown")
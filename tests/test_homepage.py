@@ -5,28 +5,30 @@ from Data import constant
 
 
 @pytest.mark.FamousDestinationSection
+@pytest.mark.browser_profile("dom-and-images")
 @pytest.mark.HomePage
 class TestFamousDestinationSection:
 
     @pytest.fixture(scope="class", autouse=True)
     def initiate_driver(self, request, initiate_browser_webdriver):
         request.cls.driver = initiate_browser_webdriver
-        request.cls.driver.get(constant.HOME_PAGE_URL.get(request.cls.server))
         request.cls.home_page_obj = Homepage(request.cls.driver)
+        request.cls.home_page_obj.open_page(constant.HOME_PAGE_URL.get(request.cls.server))
 
     def test_famous_destination_links_status_code(self):
         """
         Checks that all famous destination tile links on the homepage are reachable (status code 200).
         """
-        links = self.home_page_obj.get_famous_destination_tile_links()
-        assertion_methods.check_status_code_of_urls(urls=links)
+        links = self.home_page_obj.stream_famous_destination_tile_links()
+        assertion_methods.check_status_code_of_url_stream(urls=links, section="famous_destination_links")
 
-    def test_famous_destination_images_status_code(self, initiate_browser_webdriver):
+
+    def test_famous_destination_images_status_code(self):
         """
         Checks that all famous destination images on the homepage load successfully (status code 200).
         """
-        images = self.home_page_obj.get_famous_destination_images()
-        assertion_methods.check_status_code_of_urls(urls=images)
+        images = self.home_page_obj.stream_famous_destination_images()
+        assertion_methods.check_status_code_of_loaded_resources(driver=self.driver, urls=images, section="famous_destination_images")
 
 
 @pytest.mark.OngoingDealsSection
@@ -36,8 +38,8 @@ class TestOngoingDealsSection:
     @pytest.fixture(scope="class", autouse=True)
     def initiate_driver(self, request, initiate_browser_webdriver):
         request.cls.driver = initiate_browser_webdriver
-        request.cls.driver.get(constant.HOME_PAGE_URL.get(request.cls.server))
         request.cls.home_page_obj = Homepage(request.cls.driver)
+        request.cls.home_page_obj.open_page(constant.HOME_PAGE_URL.get(request.cls.server))
 
     def test_ongoing_deals_tile_count(self):
         """
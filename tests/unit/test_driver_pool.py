@@ -0,0 +1,99 @@
+from Helpers.driver_pool import DriverPool
+from Helpers.network_capture import CapturedResponse
+
+
+class FakeCapture:
+    """Network capture returning fixed responses."""
+
+    def __init__(self, responses):
+        self.responses = {response.url: response for response in responses}
+        self.cleared = False
+
+    def visited_origins(self):
+        return {url.rsplit("/", 1)[0] for url, response in self.responses.items() if response.mime_type == "text/html"}
+
+    def clear(self):
+        self.cleared = True
+
+
+class FakeDriver:
+    """Records the commands a reset sends; every tab is on https://site.test."""
+
+    def __init__(self, browser_name, websocket_url=None, handles=("tab-1",)):
+        self.capabilities = {"browserName": browser_name, "webSocketUrl": websocket_url}
+        self.window_handles = list(handles)
+        self.commands = []
+        self.network_capture = FakeCapture([CapturedResponse(url="https://site.test/", status=200, mime_type="text/html"),
+                                            CapturedResponse(url="https://other.test/", status=200, mime_type="text/html"),
+                                            CapturedResponse(url="https://cdn.test/a.png", status=200, mime_type="image/png")])
+        self.switch_to = self
+        self.storage = self
+        self.quit_called = False
+
+    def window(self, handle):
+        self.commands.append(("switch", handle))
+
+    def execute_script(self, script, *args):
+        if "localStorage.clear" not in script:
+            return 0  # Overlay suppression counter
+        self.commands.append(("clear_storage",))
+        return "https://site.test"
+
+    def execute_cdp_cmd(self, command, arguments):
+        self.commands.append(("cdp", command, arguments.get("origin")))
+
+    def delete_cookies(self, cookie_filter):
+        self.commands.append(("bidi_delete_cookies",))
+
+    def delete_all_cookies(self):
+        self.commands.append(("delete_all_cookies",))
+
+    def close(self):
+        self.commands.append(("close",))
+
+    def get(self, url):
+        self.commands.append(("get", url))
+
+    def quit(self):
+        self.quit_called = True
+
+
+def _pool(driver):
+    pool = DriverPool(factory=lambda: driver)
+    pool._uses[id(driver)] = 1
+    return pool
+
+
+def test_reset_firefox_clears_cookies_through_bidi_and_storage_of_every_visited_origin():
+    driver = FakeDriver("firefox", websocket_url="ws://localhost/session", handles=("tab-1", "tab-2"))
+    assert _pool(driver).reset(driver)
+    assert not any(command[0] == "cdp" for command in driver.commands)
+    assert ("bidi_delete_cookies",) in driver.commands
+    assert ("delete_all_cookies",) not in driver.commands
+    assert ("get", "https://other.test/robots.txt") in driver.commands
+    assert ("get", "https://site.test/robots.txt") not in driver.commands
+    assert driver.commands.count(("close",)) == 1
+    assert driver.network_capture.cleared
+
+
+def test_reset_chrome_clears_cookies_and_storage_through_cdp():
+    driver = FakeDriver("chrome")
+    assert _pool(driver).reset(driver)
+    assert ("cdp", "Network.clearBrowserCookies", None) in driver.commands
+    assert ("cdp", "Storage.clearDataForOrigin", "https://other.test") in driver.commands
+    assert ("get", "https://other.test/robots.txt") not in driver.commands
+
+
+def test_reset_without_network_capture_recycles_the_driver():
+    driver = FakeDriver("safari")
+    driver.network_capture = None
+    assert not _pool(driver).reset(driver)
+    assert driver.commands == []
+
+
+def test_release_of_unhealthy_driver_quits_it():
+    driver = FakeDriver("chrome")
+    pool = _pool(driver)
+    pool.release(driver, healthy=False)
+    assert driver.quit_called
+    assert pool.stats["recycled"] == 1
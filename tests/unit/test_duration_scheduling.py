@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+from Helpers.duration_scheduling import DurationHistory, DurationScheduling, DurationSchedulingPlugin
+
+
+class FakeConfig:
+    """
+    Config double with the --tx specs xdist derives from -n.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+
+    def getvalue(self, name):
+        return {"tx": [f"{self.workers}*popen"], "dist": "loadscope"}[name]
+
+
+class FakeWorker:
+    """
+    Worker double recording the tests it is sent.
+    """
+
+    def __init__(self, name: str):
+        self.gateway = SimpleNamespace(id=name)
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+COLLECTION = [
+    "tests/test_a.py::TestShort::test_1",
+    "tests/test_a.py::TestLong::test_1",
+    "tests/test_a.py::TestLong::test_2",
+    "tests/test_a.py::TestSafari::test_1[safari]",
+    "tests/test_a.py::TestOtherSafari::test_1[safari]",
+]
+
+
+def _scheduler(tmp_path, workers: int):
+    history = DurationHistory(str(tmp_path / "durations.json"))
+    history.classes = {"tests/test_a.py::TestLong": 60.0, "tests/test_a.py::TestShort": 5.0,
+                       "tests/test_a.py::TestSafari[safari]": 20.0, "tests/test_a.py::TestOtherSafari[safari]": 10.0}
+    scheduler = DurationScheduling(FakeConfig(workers), plugin=DurationSchedulingPlugin(history))
+    nodes = [FakeWorker(f"gw{index}") for index in range(workers)]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, COLLECTION)
+    scheduler.schedule()
+    return scheduler, nodes
+
+
+def test_longest_class_is_handed_out_first(tmp_path):
+    scheduler, (first, second) = _scheduler(tmp_path, 2)
+    assert first.sent == [1, 2]
+    assert second.sent == [3]
+    assert scheduler.plugin.predicted_makespan == 60.0
+
+
+def test_safari_classes_do_not_run_in_parallel(tmp_path):
+    scheduler, (first, second) = _scheduler(tmp_path, 2)
+    scheduler.mark_test_complete(first, 1)
+    # TestLong is on its last test; the other Safari class waits for TestSafari to finish
+    assert first.sent == [1, 2, 0]
+    scheduler.mark_test_complete(second, 3)
+    assert second.sent == [3, 4]
+    assert list(scheduler.workqueue) == []
+
+
+def test_unfinished_tests_of_a_crashed_worker_are_queued_again(tmp_path):
+    scheduler, (first, second) = _scheduler(tmp_path, 2)
+    scheduler.mark_test_complete(first, 1)
+    assert scheduler.remove_node(first) == "tests/test_a.py::TestLong::test_2"
+    # The worker is on its last test, so it takes the requeued test right away
+    assert second.sent == [3, 2]
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+import pytest
+import requests
+from Helpers import grid_sharding
+from Helpers.grid_sharding import GridShardPlugin, fetch_free_slots, get_grid_url, parse_grid_urls
+
+
+def _slot(browser: str, busy: bool = False) -> dict:
+    return {"stereotype": {"browserName": browser}, "session": {"sessionId": "running"} if busy else None}
+
+
+STATUS = {
+    "http://grid-a:4444": {"value": {"ready": True, "nodes": [
+        {"availability": "UP", "maxSessions": 4,
+         "slots": [_slot("chrome", busy=True), _slot("chrome", busy=True), _slot("chrome"), _slot("chrome"),
+                   _slot("firefox")]},
+        {"availability": "DRAINING", "maxSessions": 4, "slots": [_slot("chrome"), _slot("chrome")]}]}},
+    "http://grid-b:4444": {"value": {"ready": True, "nodes": [
+        {"availability": "UP", "maxSessions": 2, "slots": [_slot("chrome"), _slot("chrome"), _slot("chrome")]}]}},
+}
+
+
+class FakeResponse:
+    """
+    requests response double serving a /status body.
+    """
+
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+
+@pytest.fixture(autouse=True)
+def grid_status(monkeypatch):
+    def get(url, timeout):
+        grid_url = url.rsplit("/status", 1)[0]
+        if grid_url not in STATUS:
+            raise requests.ConnectionError(f"{grid_url} is down")
+        return FakeResponse(STATUS[grid_url])
+    monkeypatch.setattr(grid_sharding.requests, "get", get)
+
+
+def test_parse_grid_urls_strips_spaces_and_trailing_slashes():
+    assert parse_grid_urls(" http://grid-a:4444/, http://grid-b:4444 ,") == ["http://grid-a:4444", "http://grid-b:4444"]
+    assert parse_grid_urls(None) == []
+
+
+def test_only_free_slots_of_nodes_that_are_up_are_counted():
+    # grid-a: 2 of 4 chrome slots run a session and the node can start 2 more; the draining node is skipped
+    assert fetch_free_slots("http://grid-a:4444", ["chrome"]) == 2
+    # grid-b: 3 free slots, but the node runs at most 2 sessions
+    assert fetch_free_slots("http://grid-b:4444", ["chrome"]) == 2
+    assert fetch_free_slots("http://grid-a:4444", ["chrome", "firefox"]) == 2
+    assert fetch_free_slots("http://grid-c:4444", ["chrome"]) == 0
+
+
+def test_workers_are_spread_in_proportion_to_free_slots():
+    plugin = GridShardPlugin(["http://grid-a:4444", "http://grid-b:4444", "http://grid-c:4444"], ["chrome"])
+    assert plugin.free_slots == {"http://grid-a:4444": 2, "http://grid-b:4444": 2, "http://grid-c:4444": 0}
+    assigned = [plugin.next_grid() for _ in range(4)]
+    assert sorted(assigned) == ["http://grid-a:4444"] * 2 + ["http://grid-b:4444"] * 2
+
+
+def test_no_free_slot_is_a_usage_error():
+    with pytest.raises(pytest.UsageError):
+        GridShardPlugin(["http://grid-c:4444"], ["chrome"])
+
+
+def test_worker_uses_its_assigned_grid():
+    config = SimpleNamespace(workerinput={"grid_url": "http://grid-b:4444"},
+                             getoption=lambda name: "http://grid-a:4444,http://grid-b:4444")
+    assert get_grid_url(config) == "http://grid-b:4444"
+    del config.workerinput
+    assert get_grid_url(config) == "http://grid-a:4444"
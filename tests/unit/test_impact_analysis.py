@@ -0,0 +1,94 @@
+import textwrap
+import pytest
+from Helpers import impact_analysis
+from Helpers.impact_analysis import ALL_TESTS, DependencyGraph
+
+FILES = {
+    "locators.py": """
+        title_xpath = "//h1"
+        deals_xpath = "//li"
+    """,
+    "Pages/basepage.py": """
+        class BasePage:
+            def __init__(self, driver):
+                self.driver = driver
+                self._prepare()
+
+            def _prepare(self):
+                pass
+
+            def open_page(self, url):
+                self.driver.get(url)
+
+            def read_title(self):
+                return self.driver.find(locators.title_xpath)
+    """,
+    "Pages/homepage.py": """
+        import locators
+
+
+        class Homepage(BasePage):
+            SECTIONS = ("deals",)
+
+            def count_deals(self):
+                return len(self.driver.find(locators.deals_xpath))
+
+            def read_title(self):
+                return super().read_title().strip()
+
+            def unused(self):
+                return None
+    """,
+    "tests/test_home.py": """
+        class TestDeals:
+            def test_deals(self):
+                self.page.open_page("/")
+                assert self.page.count_deals()
+
+
+        class TestTitle:
+            def test_title(self):
+                assert self.page.read_title()
+    """,
+}
+
+
+@pytest.fixture
+def graph(tmp_path, monkeypatch):
+    for path, source in FILES.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(textwrap.dedent(source).lstrip("\n"))
+    for directory in ("Helpers", "Utility"):
+        (tmp_path / directory).mkdir()
+    monkeypatch.setattr(impact_analysis, "RECORDED_DEPENDENCIES_PATH", str(tmp_path / "recorded.json"))
+    return DependencyGraph(root=str(tmp_path))
+
+
+def _line_of(path: str, text: str) -> int:
+    return textwrap.dedent(FILES[path]).lstrip("\n").splitlines().index(text) + 1
+
+
+def test_locator_selects_the_tests_calling_its_page_member(graph):
+    assert graph.tests_using_locators({"deals_xpath"}) == {"tests/test_home.py::TestDeals::test_deals"}
+
+
+def test_base_member_reached_through_super_selects_the_override_callers(graph):
+    line = _line_of("Pages/basepage.py", "        return self.driver.find(locators.title_xpath)")
+    assert graph.affected_tests({"Pages/basepage.py": {line}}) == {"tests/test_home.py::TestTitle::test_title"}
+
+
+def test_dunder_and_members_it_calls_select_all_tests(graph):
+    assert graph.affected_tests({"Pages/basepage.py": {_line_of("Pages/basepage.py", "        self.driver = driver")}}) \
+        == ALL_TESTS
+    assert graph.affected_tests({"Pages/basepage.py": {_line_of("Pages/basepage.py", "        pass")}}) == ALL_TESTS
+
+
+def test_class_level_code_and_unreferenced_members_select_all_tests(graph):
+    assert graph.affected_tests({"Pages/homepage.py": {_line_of("Pages/homepage.py", '    SECTIONS = ("deals",)')}}) \
+        == ALL_TESTS
+    assert graph.affected_tests({"Pages/homepage.py": {_line_of("Pages/homepage.py", "        return None")}}) \
+        == ALL_TESTS
+
+
+def test_blank_lines_between_members_select_no_tests(graph):
+    assert graph.affected_tests({"Pages/homepage.py": {3}}) == set()
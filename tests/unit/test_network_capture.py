@@ -0,0 +1,55 @@
+import json
+from selenium import webdriver
+from selenium.webdriver.remote.command import Command
+from Helpers import network_capture
+from Helpers.driver_pool import DriverPool
+
+
+def _performance_entry(method: str, **params) -> dict:
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+class FakeRemoteChrome(webdriver.Remote):
+    """
+    webdriver.Remote session on a Selenium Grid Chrome node, answering commands without a server.
+
+    The remote driver has no log_types/get_log helpers, so the performance log is only reachable through execute.
+    """
+
+    def __init__(self):
+        self.caps = {"browserName": "chrome"}
+        self.session_id = "grid"
+        self.commands = []
+        self.performance_log = []
+
+    def execute(self, driver_command, params=None):
+        self.commands.append(driver_command)
+        if driver_command == Command.GET_AVAILABLE_LOG_TYPES:
+            return {"value": ["browser", "driver", "performance"]}
+        if driver_command == Command.GET_LOG:
+            entries, self.performance_log = self.performance_log, []
+            return {"value": entries}
+        return {"value": None}
+
+
+def test_remote_chrome_is_launched_by_the_pool_with_performance_log_capture():
+    driver = FakeRemoteChrome()
+    assert not hasattr(driver, "get_log")
+    assert DriverPool(factory=lambda: driver).checkout() is driver
+    capture = network_capture.get_network_capture(driver)
+    assert isinstance(capture.backend, network_capture.PerformanceLogBackend)
+    driver.performance_log = [
+        _performance_entry("Network.requestWillBeSent", requestId="1", timestamp=1.0,
+                           request={"url": "https://site.test/"}),
+        _performance_entry("Network.responseReceived", requestId="1",
+                           response={"status": 200, "mimeType": "text/html", "url": "https://site.test/"}),
+        _performance_entry("Network.loadingFinished", requestId="1", timestamp=1.5, encodedDataLength=2048)]
+    capture.refresh()
+    assert capture.get("https://site.test/").status == 200
+    assert capture.get("https://site.test/").size == 2048
+
+
+def test_start_network_capture_skips_the_performance_log_when_the_node_does_not_record_it():
+    driver = FakeRemoteChrome()
+    driver.execute = lambda driver_command, params=None: {"value": ["browser", "driver"]}
+    assert network_capture.start_network_capture(driver) is None
@@ -0,0 +1,75 @@
+from selenium import webdriver
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.firefox.remote_connection import FirefoxRemoteConnection
+from Helpers import overlay_suppression
+
+
+def _offline_driver(driver_class, browser_name: str, command_executor):
+    """
+    Builds a driver object without starting a browser; execute_script is recorded instead of sent.
+
+    Args:
+        driver_class: WebDriver class, e.g. webdriver.Firefox.
+        browser_name (str): browserName capability of the session.
+        command_executor: Remote connection the driver's commands would be sent through.
+
+    Returns:
+        WebDriver: The driver, with the executed scripts in its `executed_scripts` list.
+    """
+    driver = object.__new__(driver_class)
+    driver.caps = {"browserName": browser_name}
+    driver.session_id = "offline"
+    driver.command_executor = command_executor
+    driver.executed_scripts = []
+    driver.execute_script = lambda script, *args: driver.executed_scripts.append(script)
+    return driver
+
+
+def test_install_overlay_suppression_on_firefox_skips_cdp():
+    """Firefox sessions reject CDP commands with an AssertionError, so only the current document is covered."""
+    driver = _offline_driver(webdriver.Firefox, "firefox",
+                             FirefoxRemoteConnection("http://127.0.0.1:9"))
+    overlay_suppression.install_overlay_suppression(driver)
+    assert len(driver.executed_scripts) == 1
+    assert not getattr(driver, "overlay_suppression_on_new_document", False)
+
+
+def test_install_overlay_suppression_on_safari_skips_cdp():
+    """Safari sessions are not Chromium either."""
+    driver = _offline_driver(webdriver.Safari, "Safari", FirefoxRemoteConnection("http://127.0.0.1:9"))
+    overlay_suppression.install_overlay_suppression(driver)
+    assert len(driver.executed_scripts) == 1
+    assert not getattr(driver, "overlay_suppression_on_new_document", False)
+
+
+def test_install_overlay_suppression_on_chrome_registers_new_document_script():
+    """Chromium sessions (local or remote) register the script for every new document through CDP."""
+    cdp_commands = []
+    driver = _offline_driver(webdriver.Remote, "chrome",
+                             ChromiumRemoteConnection("http://127.0.0.1:9", "goog", "chrome"))
+    driver.execute_cdp_cmd = lambda command, arguments: cdp_commands.append(command)
+    overlay_suppression.install_overlay_suppression(driver)
+    assert cdp_commands == ["Page.addScriptToEvaluateOnNewDocument"]
+    assert driver.overlay_suppression_on_new_document
+
+
+def test_switched_to_chrome_tab_gets_the_new_document_script_once():
+    """The CDP document-start script is bound to the tab it was registered from, so every other tab registers it."""
+    cdp_commands = []
+    driver = _offline_driver(webdriver.Remote, "chrome",
+                             ChromiumRemoteConnection("http://127.0.0.1:9", "goog", "chrome"))
+    driver.execute_cdp_cmd = lambda command, arguments: cdp_commands.append(command)
+    overlay_suppression.install_overlay_suppression(driver)
+    overlay_suppression.apply_overlay_suppression_to_window(driver, "tab-2")
+    overlay_suppression.apply_overlay_suppression_to_window(driver, "tab-2")
+    assert cdp_commands == ["Page.addScriptToEvaluateOnNewDocument"] * 2
+    assert len(driver.executed_scripts) == 3
+
+
+def test_switched_to_firefox_tab_gets_the_script_on_its_current_document():
+    """Without CDP only the document already loaded in the tab can be covered."""
+    driver = _offline_driver(webdriver.Firefox, "firefox",
+                             FirefoxRemoteConnection("http://127.0.0.1:9"))
+    overlay_suppression.install_overlay_suppression(driver)
+    overlay_suppression.apply_overlay_suppression_to_window(driver, "tab-2")
+    assert len(driver.executed_scripts) == 2
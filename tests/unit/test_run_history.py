@@ -0,0 +1,90 @@
+import json
+import pytest
+from Utility.run_history import RunHistory
+
+STABLE = "tests/test_a.py::TestA::test_stable"
+TEARDOWN_ERROR = "tests/test_a.py::TestA::test_teardown_error"
+FLAKY = "tests/test_a.py::TestA::test_flaky"
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = RunHistory(str(tmp_path / "history.sqlite"))
+    yield history
+    history.close()
+
+
+def _ingest(history, tmp_path, index: int, records: list, environment: str = "PROD") -> int:
+    """
+    Writes a test_results.jsonl file for one run and adds it to the history.
+
+    Args:
+        history (RunHistory): History under test.
+        tmp_path: Directory of the results file.
+        index (int): Run number; also its start time.
+        records (list): (nodeid, phase, outcome, duration) of every test line.
+        environment (str, optional): Environment of the run.
+
+    Returns:
+        int: Number of results added.
+    """
+    path = tmp_path / f"run_{index}.jsonl"
+    lines = [{"type": "run", "run_id": f"run-{index}", "started_at": float(index), "environment": environment,
+              "browsers": ["chrome"]}]
+    lines += [{"type": "test", "nodeid": nodeid, "when": phase, "outcome": outcome, "duration": duration,
+               "browser": "chrome"} for nodeid, phase, outcome, duration in records]
+    lines.append({"type": "summary", "total_tests": len(records), "failed_tests": 0, "duration": 1.0})
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+    return history.ingest_results_file(str(path))
+
+
+def test_run_is_ingested_once(history, tmp_path):
+    assert _ingest(history, tmp_path, 1, [(STABLE, "call", "passed", 1.0)]) == 1
+    assert _ingest(history, tmp_path, 1, [(STABLE, "call", "passed", 1.0)]) == 0
+
+
+def test_phases_of_one_run_count_as_one_outcome(history, tmp_path):
+    for index in range(6):
+        _ingest(history, tmp_path, index, [(TEARDOWN_ERROR, "call", "passed", 1.0),
+                                           (TEARDOWN_ERROR, "teardown", "error", 0.1)])
+    assert history.flakiness() == [{"nodeid": TEARDOWN_ERROR, "runs": 6, "failures": 6, "reruns": 0,
+                                    "failure_rate": 1.0, "flip_rate": 0.0}]
+
+
+def test_flaky_test_ranks_before_broken_test(history, tmp_path):
+    for index, outcome in enumerate(["passed", "failed", "passed", "failed"]):
+        _ingest(history, tmp_path, index, [(FLAKY, "call", outcome, 1.0), (TEARDOWN_ERROR, "call", "failed", 1.0),
+                                           (STABLE, "call", "passed", 1.0)])
+    flakiness = history.flakiness()
+    assert [row["nodeid"] for row in flakiness] == [FLAKY, TEARDOWN_ERROR]
+    assert flakiness[0]["flip_rate"] == 1.0
+    assert flakiness[0]["failure_rate"] == 0.5
+
+
+def test_reruns_are_counted_per_test(history, tmp_path):
+    _ingest(history, tmp_path, 1, [(FLAKY, "call", "rerun", 1.0), (FLAKY, "call", "passed", 1.0)])
+    assert history.flakiness() == [{"nodeid": FLAKY, "runs": 1, "failures": 0, "reruns": 1, "failure_rate": 0.0,
+                                    "flip_rate": 0.0}]
+
+
+def test_duration_trends_compare_the_older_and_recent_half(history, tmp_path):
+    for index, duration in enumerate([1.0, 1.0, 3.0, 3.0]):
+        _ingest(history, tmp_path, index, [(STABLE, "call", "passed", duration)])
+    assert history.duration_trends() == [{"nodeid": STABLE, "runs": 4, "earlier_avg": 1.0, "recent_avg": 3.0,
+                                          "change": 3.0}]
+
+
+def test_duration_percentile_uses_the_nearest_rank(history, tmp_path):
+    for index in range(1, 11):
+        _ingest(history, tmp_path, index, [(STABLE, "call", "passed", float(index))])
+    assert history.duration_percentiles(percentile=95) == [{"nodeid": STABLE, "runs": 10, "duration": 10.0}]
+    assert history.duration_percentiles(percentile=50) == [{"nodeid": STABLE, "runs": 10, "duration": 5.0}]
+
+
+def test_history_of_one_test_filters_the_environment(history, tmp_path):
+    _ingest(history, tmp_path, 1, [(STABLE, "call", "passed", 1.0)], environment="QA")
+    _ingest(history, tmp_path, 2, [(STABLE, "call", "failed", 2.0)], environment="PROD")
+    assert [row["run_id"] for row in history.test_history(STABLE)] == ["run-1", "run-2"]
+    assert history.test_history(STABLE, environment="PROD") == [{"run_id": "run-2", "started_at": 2.0,
+                                                                  "browser": "chrome", "phase": "call",
+                                                                  "outcome": "failed", "duration": 2.0}]
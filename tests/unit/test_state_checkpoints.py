@@ -0,0 +1,38 @@
+import os
+import stat
+import time
+from Helpers.state_checkpoints import CheckpointStore
+
+
+def _checkpoint() -> dict:
+    """
+    Returns a fresh checkpoint holding a session cookie.
+
+    Returns:
+        dict: Checkpoint in the format written by capture_checkpoint.
+    """
+    return {"url": "https://example.com/cart", "captured_at": time.time(),
+            "cookies": [{"name": "session", "value": "secret", "expiry": int(time.time()) + 3600}],
+            "local_storage": {}, "session_storage": {}}
+
+
+def test_checkpoint_saved_by_one_store_is_read_by_another(tmp_path):
+    path = str(tmp_path / "state_checkpoints.json")
+    CheckpointStore(path).put("PROD/chrome/cart_with_one_item", _checkpoint())
+    assert CheckpointStore(path).get("PROD/chrome/cart_with_one_item")["url"] == "https://example.com/cart"
+
+
+def test_checkpoint_file_is_owner_only(tmp_path):
+    path = str(tmp_path / "state_checkpoints.json")
+    CheckpointStore(path).put("PROD/chrome/cart_with_one_item", _checkpoint())
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_clear_deletes_checkpoints_and_file(tmp_path):
+    path = str(tmp_path / "state_checkpoints.json")
+    store = CheckpointStore(path)
+    store.put("PROD/chrome/cart_with_one_item", _checkpoint())
+    store.clear()
+    assert not os.path.exists(path)
+    assert store.get("PROD/chrome/cart_with_one_item") is None
+    store.clear()
@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+from Helpers import step_timing
+from Pages.basepage import BasePage
+
+
+class FakePage(BasePage):
+    """
+    Page without a browser: its steps only record spans.
+    """
+
+    def read_title(self):
+        return "title"
+
+    def iter_cards(self):
+        for card in ("a", "b"):
+            yield self.read_title() + card
+
+
+def _steps(action):
+    step_timing.start_recording("test")
+    try:
+        action()
+    finally:
+        root = step_timing.stop_recording()
+    return root["children"]
+
+
+class FakeDriver:
+    """
+    Driver double with two tabs; scripts are recorded instead of run.
+    """
+
+    def __init__(self):
+        self.window_handles = ["first", "newest"]
+        self.switch_to = SimpleNamespace(window=lambda handle: setattr(self, "current_window", handle))
+        self.executed_scripts = []
+
+    def execute_script(self, script, *args):
+        self.executed_scripts.append(script)
+
+
+def test_base_page_methods_are_timed():
+    page = FakePage(FakeDriver())
+    steps = _steps(page.switch_to_newest_tab)
+    assert page.driver.current_window == "newest"
+    assert [step["name"] for step in steps] == ["BasePage.switch_to_newest_tab"]
+
+
+def test_generator_is_timed_over_its_iteration():
+    page = FakePage(driver=object())
+    cards = []
+
+    def consume():
+        for card in page.iter_cards():
+            cards.append(card)
+            page.read_title()
+
+    steps = _steps(consume)
+    assert cards == ["titlea", "titleb"]
+    assert [step["name"] for step in steps] == ["FakePage.iter_cards", "FakePage.read_title", "FakePage.read_title"]
+    assert [child["name"] for child in steps[0]["children"]] == ["FakePage.read_title", "FakePage.read_title"]
+
+
+def test_generator_closed_early_keeps_passed_outcome():
+    page = FakePage(driver=object())
+    steps = _steps(lambda: next(page.iter_cards()))
+    assert steps[0]["outcome"] == "passed"
+    assert len(steps[0]["children"]) == 1